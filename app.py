@@ -30,6 +30,10 @@ from ui_components import (
 
 apply_christmas_theme()
 
+# Outbox-Worker (Thread) starten, damit liegengebliebene Mails nach einem Neustart weiterlaufen
+from outbox import ensure_background_worker
+ensure_background_worker()
+
 
 def init_session_state():
     """Initialisiert den Session State"""
@@ -79,8 +83,7 @@ def handle_link_auth(_):
         return
 
     event, link = resolved
-    users = DataManager.load_users()
-    user = users.get(link.user_id)
+    user = DataManager.get_users_by_ids([link.user_id]).get(link.user_id)
 
     if not user:
         st.error(_("no_user_for_link"))
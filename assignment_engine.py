@@ -0,0 +1,751 @@
+"""
+Zuweisungs-Engine für die Wichtel-App
+Erzeugt Derangements (niemand beschenkt sich selbst) in linearer Zeit
+"""
+import random
+from typing import FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+try:
+    import numpy as np  # optional: vektorisierter Pfad für sehr große Events
+except ImportError:  # pragma: no cover
+    np = None
+from config import NUMPY_ASSIGNMENT_THRESHOLD
+
+# Ein einziger Kreis über alle Teilnehmer (Sattolo): A -> B -> C -> ... -> A
+MODE_CYCLE = "cycle"
+# Gleichverteilt über alle Derangements (Fisher-Yates mit Rejection-Sampling)
+MODE_UNIFORM = "uniform"
+MODES = (MODE_CYCLE, MODE_UNIFORM)
+
+# Zufällige Tauschversuche pro Konflikt, bevor über Augmentierungspfade repariert wird
+REPAIR_SWAP_ATTEMPTS = 32
+# Mehrere Geschenke: so oft wird rundenweise neu gewürfelt, bevor exakt (Fluss) gelöst wird
+MULTI_ROUND_RESTARTS = 8
+# Bis zu dieser Teilnehmerzahl wird der (dichte) Fluss-Graph der erlaubten Paare aufgebaut
+MULTI_EXACT_MAX_PARTICIPANTS = 1000
+
+
+class InfeasibleAssignmentError(ValueError):
+    """Die Ausschlussregeln lassen keine gültige Zuweisung zu"""
+
+
+class AssignmentEngine:
+    """
+    Erzeugt Wichtel-Zuweisungen als Permutation der Teilnehmer-Positionen
+
+    Mit seed (oder einem eigenen random.Random) sind die Ergebnisse reproduzierbar.
+    """
+
+    def __init__(self, seed: Optional[int] = None, rng: Optional[random.Random] = None):
+        self.rng = rng if rng is not None else random.Random(seed)
+
+    def sattolo_cycle(self, n: int) -> List[int]:
+        """Gleichverteilte zyklische Permutation (ein Kreis der Länge n), O(n)"""
+        _require_participants(n)
+        perm = list(range(n))
+        randrange = self.rng.randrange
+        for i in range(n - 1, 0, -1):
+            j = randrange(i)  # j < i: kein Element bleibt an seinem Platz
+            perm[i], perm[j] = perm[j], perm[i]
+        return perm
+
+    def uniform_derangement(self, n: int) -> List[int]:
+        """
+        Gleichverteiltes Derangement per Rejection-Sampling: Fisher-Yates von hinten,
+        Abbruch beim ersten Fixpunkt. Erwartet ~e Versuche, jeder meist nach wenigen Schritten
+        abgebrochen, also insgesamt O(n)
+        """
+        _require_participants(n)
+        randrange = self.rng.randrange
+        while True:
+            perm = list(range(n))
+            for i in range(n - 1, 0, -1):
+                j = randrange(i + 1)
+                perm[i], perm[j] = perm[j], perm[i]
+                if perm[i] == i:  # Position i ist endgültig belegt
+                    break
+            else:
+                if perm[0] != 0:
+                    return perm
+
+    def derangement(self, n: int, mode: str = MODE_UNIFORM) -> List[int]:
+        if mode == MODE_CYCLE:
+            return self.sattolo_cycle(n)
+        if mode == MODE_UNIFORM:
+            return self.uniform_derangement(n)
+        raise ValueError(f"Unbekannter Zuweisungsmodus: {mode!r} (erlaubt: {', '.join(MODES)})")
+
+    def pairings(self, participant_ids: Sequence[str], mode: str = MODE_UNIFORM) -> List[Tuple[str, str]]:
+        """Paare (Schenkender, Beschenkter) in der Reihenfolge der Teilnehmerliste, bereits geprüft"""
+        if len(set(participant_ids)) != len(participant_ids):
+            raise ValueError("Teilnehmerliste enthält doppelte IDs")
+        perm = self.derangement(len(participant_ids), mode)
+        pairs = [(giver, participant_ids[target]) for giver, target in zip(participant_ids, perm)]
+        verify_pairings(participant_ids, pairs)
+        return pairs
+
+    def constrained_derangement(
+        self,
+        participant_ids: Sequence[str],
+        exclusion_groups: Iterable[Iterable[str]] = (),
+        excluded_pairs: Iterable[Tuple[str, str]] = (),
+    ) -> List[int]:
+        """
+        Derangement unter Ausschlussregeln (perfektes Matching Schenkende -> Beschenkte)
+
+        - exclusion_groups: Gruppen (Paare, Haushalte), innerhalb derer niemand beschenkt wird
+        - excluded_pairs: gerichtete Paare (Schenkender, Beschenkter), z. B. aus dem Vorjahr
+
+        Start mit einer Zufallspermutation; Konflikte werden zuerst durch zufällige
+        Tauschpartner behoben, der Rest über Augmentierungspfade im Komplement-Graphen
+        (BFS über die Menge noch nicht besuchter Beschenkter, also O(n + Ausschlüsse)
+        pro Pfad statt O(n²)). Gibt es keinen Pfad mehr, ist die Aufgabe unlösbar
+        und InfeasibleAssignmentError wird ausgelöst
+        """
+        _require_participants(len(participant_ids))
+        return self._solve(_ExclusionRules(participant_ids, exclusion_groups, excluded_pairs))
+
+    def _solve(
+        self,
+        forbidden: "_ExclusionRules",
+        perm: Optional[List[int]] = None,
+        conflicts: Optional[Iterable[int]] = None,
+    ) -> List[int]:
+        """
+        Löst die Zuweisung; perm/conflicts erlauben eine anderswo (z. B. vektorisiert)
+        erzeugte Startpermutation samt bereits bekannten Konflikt-Positionen
+        """
+        n = forbidden.n
+        forbidden.check_obvious_infeasibility()
+
+        if perm is None:
+            perm = list(range(n))
+            self.rng.shuffle(perm)
+
+        # 1. Konflikte durch Tauschen mit zufälligen Partnern beheben (erzeugt nie neue Konflikte)
+        randrange = self.rng.randrange
+        unresolved = []
+        for giver in (range(n) if conflicts is None else conflicts):
+            if not forbidden(giver, perm[giver]):
+                continue
+            for _ in range(REPAIR_SWAP_ATTEMPTS):
+                other = randrange(n)
+                if not forbidden(giver, perm[other]) and not forbidden(other, perm[giver]):
+                    perm[giver], perm[other] = perm[other], perm[giver]
+                    break
+            else:
+                unresolved.append(giver)
+
+        # 2. Verbleibende Konflikte lösen und über Augmentierungspfade neu zuordnen
+        owner = [0] * n
+        for giver, receiver in enumerate(perm):
+            owner[receiver] = giver
+        for giver in unresolved:
+            owner[perm[giver]] = -1
+            perm[giver] = -1
+        unmatched = _augment_all(unresolved, perm, owner, forbidden)
+        if unmatched:
+            raise InfeasibleAssignmentError(
+                f"Keine gültige Zuweisung möglich: für {len(unmatched)} Teilnehmer "
+                f"(z. B. {forbidden.participant_ids[unmatched[0]]}) lässt sich kein Beschenkter finden"
+            )
+        return perm
+
+    def constrained_pairings(
+        self,
+        participant_ids: Sequence[str],
+        exclusion_groups: Iterable[Iterable[str]] = (),
+        excluded_pairs: Iterable[Tuple[str, str]] = (),
+    ) -> List[Tuple[str, str]]:
+        """Wie pairings, aber unter Ausschlussregeln (siehe constrained_derangement)"""
+        if len(set(participant_ids)) != len(participant_ids):
+            raise ValueError("Teilnehmerliste enthält doppelte IDs")
+        _require_participants(len(participant_ids))
+        forbidden = _ExclusionRules(participant_ids, exclusion_groups, excluded_pairs)
+        perm = self._solve(forbidden)
+        pairs = [(giver, participant_ids[target]) for giver, target in zip(participant_ids, perm)]
+        verify_pairings(participant_ids, pairs)
+        for giver, target in enumerate(perm):
+            if forbidden(giver, target):
+                raise ValueError(f"Zuweisung {pairs[giver]} verletzt eine Ausschlussregel")
+        return pairs
+
+    def circulant_derangements(self, n: int, gifts: int) -> List[List[int]]:
+        """
+        gifts paarweise disjunkte Derangements in O(n * gifts): Teilnehmer in zufälliger
+        Reihenfolge im Kreis, Runde j beschenkt den Nachfolger im Abstand s_j
+        (verschiedene s_j aus 1..n-1, daher keine Selbst- und keine Doppel-Paare)
+        """
+        _require_gift_count(n, gifts)
+        order = list(range(n))
+        self.rng.shuffle(order)
+        perms = []
+        for shift in self.rng.sample(range(1, n), gifts):
+            perm = [0] * n
+            for giver, target in zip(order, order[shift:] + order[:shift]):
+                perm[giver] = target
+            perms.append(perm)
+        return perms
+
+    def multi_pairings(
+        self,
+        participant_ids: Sequence[str],
+        gifts: int,
+        exclusion_groups: Iterable[Iterable[str]] = (),
+        excluded_pairs: Iterable[Tuple[str, str]] = (),
+    ) -> List[Tuple[str, str]]:
+        """
+        Jeder schenkt gifts Teilnehmern und wird von gifts Teilnehmern beschenkt
+        (Runde für Runde, jeweils in der Reihenfolge der Teilnehmerliste)
+        Ohne Ausschlussregeln zirkulant, sonst Runde für Runde über den Solver
+        """
+        if len(set(participant_ids)) != len(participant_ids):
+            raise ValueError("Teilnehmerliste enthält doppelte IDs")
+        exclusion_groups = [list(group) for group in exclusion_groups]
+        excluded_pairs = list(excluded_pairs)
+        if exclusion_groups or excluded_pairs:
+            pairs = _constrained_rounds(self, participant_ids, gifts, exclusion_groups, excluded_pairs)
+        else:
+            pairs = [
+                (giver, participant_ids[target])
+                for perm in self.circulant_derangements(len(participant_ids), gifts)
+                for giver, target in zip(participant_ids, perm)
+            ]
+        verify_multi_pairings(participant_ids, pairs, gifts)
+        return pairs
+
+
+class _ExclusionRules:
+    """O(1)-Prüfung, ob Schenkender g (Position) Beschenkten r (Position) nicht beschenken darf"""
+
+    def __init__(
+        self,
+        participant_ids: Sequence[str],
+        exclusion_groups: Iterable[Iterable[str]],
+        excluded_pairs: Iterable[Tuple[str, str]],
+    ):
+        self.participant_ids = participant_ids
+        self.n = len(participant_ids)
+        position = {pid: i for i, pid in enumerate(participant_ids)}
+        memberships: List[Set[int]] = [set() for _ in range(self.n)]
+        self.group_sizes: List[int] = []
+        for group in exclusion_groups:
+            members = {position[pid] for pid in group if pid in position}
+            if len(members) < 2:
+                continue
+            group_id = len(self.group_sizes)
+            self.group_sizes.append(len(members))
+            for member in members:
+                memberships[member].add(group_id)
+        self.groups: List[Optional[FrozenSet[int]]] = [frozenset(m) if m else None for m in memberships]
+        self.blocked: List[Optional[Set[int]]] = [None] * self.n
+        for giver_id, receiver_id in excluded_pairs:
+            giver, receiver = position.get(giver_id), position.get(receiver_id)
+            if giver is None or receiver is None or giver == receiver:
+                continue
+            if self.blocked[giver] is None:
+                self.blocked[giver] = set()
+            self.blocked[giver].add(receiver)
+
+    def __call__(self, giver: int, receiver: int) -> bool:
+        if giver == receiver:
+            return True
+        blocked = self.blocked[giver]
+        if blocked is not None and receiver in blocked:
+            return True
+        return self._shares_group(giver, receiver)
+
+    def signature(self, giver: int) -> Optional[FrozenSet[int]]:
+        """Gruppen des Schenkenden, wenn sie allein seine Ausschlüsse bestimmen (sonst None)"""
+        return self.groups[giver] if self.blocked[giver] is None else None
+
+    def check_obvious_infeasibility(self):
+        """Schnelle notwendige Bedingungen (Hall) vor dem eigentlichen Matching"""
+        for size in self.group_sizes:
+            # Mitglieder einer Gruppe können nur außerhalb der Gruppe schenken
+            if size > self.n - size:
+                raise InfeasibleAssignmentError(
+                    f"Keine gültige Zuweisung möglich: eine Ausschlussgruppe umfasst {size} "
+                    f"von {self.n} Teilnehmern (höchstens die Hälfte erlaubt)"
+                )
+        # Ausschlüsse pro Schenkendem/Beschenktem zählen (exakt für höchstens eine Gruppe)
+        given_blocks = [0] * self.n
+        received_blocks = [0] * self.n
+        for giver, blocked in enumerate(self.blocked):
+            for receiver in blocked or ():
+                if self._shares_group(giver, receiver):
+                    continue
+                given_blocks[giver] += 1
+                received_blocks[receiver] += 1
+        for i in range(self.n):
+            base = self._own_group_size(i)
+            if base is None:
+                continue
+            if base + given_blocks[i] >= self.n:
+                raise InfeasibleAssignmentError(
+                    f"Keine gültige Zuweisung möglich: {self.participant_ids[i]} darf niemanden beschenken"
+                )
+            if base + received_blocks[i] >= self.n:
+                raise InfeasibleAssignmentError(
+                    f"Keine gültige Zuweisung möglich: {self.participant_ids[i]} kann von niemandem beschenkt werden"
+                )
+
+    def _shares_group(self, a: int, b: int) -> bool:
+        groups_a, groups_b = self.groups[a], self.groups[b]
+        return groups_a is not None and groups_b is not None and not groups_a.isdisjoint(groups_b)
+
+    def _own_group_size(self, i: int) -> Optional[int]:
+        """Anzahl der über Gruppen (inkl. sich selbst) ausgeschlossenen Teilnehmer, None wenn nicht exakt bekannt"""
+        groups = self.groups[i]
+        if groups is None:
+            return 1
+        if len(groups) == 1:
+            return self.group_sizes[next(iter(groups))]
+        return None
+
+
+def _augment_all(free_givers: List[int], perm: List[int], owner: List[int], forbidden: _ExclusionRules) -> List[int]:
+    """
+    Ordnet freie Schenkende über Augmentierungspfade zu (Hopcroft-Karp im Komplement-Graphen)
+
+    Pro Phase bestimmt eine BFS von allen freien Schenkenden aus die Schichten bis zur
+    ersten Schicht mit freien Beschenkten; danach sucht eine DFS entlang der Schichten
+    knotendisjunkte kürzeste Pfade. Kanten werden nie aufgezählt: gescannt wird nur die
+    Menge noch nicht besuchter Beschenkter, übersprungen werden nur verbotene Kanten.
+    Gibt die Schenkenden zurück, für die es keinen Pfad gibt (leer = vollständige Zuweisung)
+    """
+    while free_givers:
+        layers = _build_layers(free_givers, owner, forbidden)
+        if not layers:
+            # Kein freier Beschenkter erreichbar: das Matching ist maximal, aber nicht perfekt
+            return free_givers
+        for root in free_givers:
+            _augment_along_layers(root, layers, perm, owner, forbidden)
+        free_givers = [giver for giver in free_givers if perm[giver] == -1]
+    return []
+
+
+def _build_layers(free_givers: List[int], owner: List[int], forbidden: _ExclusionRules) -> List[Set[int]]:
+    """BFS-Schichten der Beschenkten; die letzte Schicht enthält nur freie Beschenkte"""
+    unvisited = set(range(len(owner)))
+    layers: List[Set[int]] = []
+    frontier = free_givers
+    while frontier and unvisited:
+        layer: List[int] = []
+        exhausted = set()
+        for giver in frontier:
+            # Schenkende mit derselben Signatur sehen dieselben Beschenkten: hat einer
+            # nichts mehr gefunden, findet auch der nächste nichts
+            signature = forbidden.signature(giver)
+            if signature is not None and signature in exhausted:
+                continue
+            reachable = [receiver for receiver in unvisited if not forbidden(giver, receiver)]
+            if not reachable and signature is not None:
+                exhausted.add(signature)
+            unvisited.difference_update(reachable)
+            layer.extend(reachable)
+        free = {receiver for receiver in layer if owner[receiver] == -1}
+        if free:
+            layers.append(free)
+            return layers
+        layers.append(set(layer))
+        frontier = [owner[receiver] for receiver in layer]
+    return []
+
+
+def _augment_along_layers(
+    root: int, layers: List[Set[int]], perm: List[int], owner: List[int], forbidden: _ExclusionRules
+) -> bool:
+    """Iterative DFS entlang der Schichten; benutzte oder tote Beschenkte werden aus den Schichten entfernt"""
+    givers = [root]
+    path: List[int] = []  # gewählter Beschenkter je Tiefe
+    while givers:
+        depth = len(givers) - 1
+        giver = givers[-1]
+        candidates = layers[depth]
+        chosen = next((receiver for receiver in candidates if not forbidden(giver, receiver)), None)
+        if chosen is None:
+            # Sackgasse: einen Schritt zurück
+            givers.pop()
+            if path:
+                path.pop()
+            continue
+        candidates.discard(chosen)
+        path.append(chosen)
+        if depth == len(layers) - 1:
+            # Freien Beschenkten erreicht: Zuordnungen entlang des Pfads umhängen
+            for giver, receiver in zip(givers, path):
+                perm[giver] = receiver
+                owner[receiver] = giver
+            return True
+        givers.append(owner[chosen])
+    return False
+
+
+def verify_pairings(participant_ids: Sequence[str], pairs: Sequence[Tuple[str, str]]):
+    """
+    Prüft eine Zuweisung: jeder Teilnehmer schenkt und wird beschenkt genau einmal,
+    niemand beschenkt sich selbst. Löst ValueError aus, wenn etwas nicht stimmt
+    """
+    expected = set(participant_ids)
+    givers = [giver for giver, _ in pairs]
+    receivers = [receiver for _, receiver in pairs]
+    if len(givers) != len(expected) or set(givers) != expected:
+        raise ValueError("Nicht jeder Teilnehmer schenkt genau einmal")
+    if len(set(receivers)) != len(receivers) or set(receivers) != expected:
+        raise ValueError("Nicht jeder Teilnehmer wird genau einmal beschenkt")
+    for giver, receiver in pairs:
+        if giver == receiver:
+            raise ValueError(f"Teilnehmer {giver} würde sich selbst beschenken")
+
+
+def verify_multi_pairings(participant_ids: Sequence[str], pairs: Sequence[Tuple[str, str]], gifts: int):
+    """
+    Wie verify_pairings für gifts Geschenke pro Person: jeder schenkt und wird genau
+    gifts-mal beschenkt, kein Paar doppelt, niemand beschenkt sich selbst
+    """
+    expected = set(participant_ids)
+    if len(pairs) != gifts * len(expected):
+        raise ValueError(f"Erwartet {gifts} Zuweisungen pro Teilnehmer")
+    if len(set(pairs)) != len(pairs):
+        raise ValueError("Zuweisung enthält doppelte Paare")
+    given = dict.fromkeys(expected, 0)
+    received = dict.fromkeys(expected, 0)
+    for giver, receiver in pairs:
+        if giver == receiver:
+            raise ValueError(f"Teilnehmer {giver} würde sich selbst beschenken")
+        if giver not in given or receiver not in received:
+            raise ValueError(f"Zuweisung {giver} -> {receiver} enthält Nicht-Teilnehmer")
+        given[giver] += 1
+        received[receiver] += 1
+    if any(count != gifts for count in given.values()) or any(count != gifts for count in received.values()):
+        raise ValueError(f"Nicht jeder Teilnehmer schenkt und bekommt genau {gifts} Geschenke")
+
+
+def _constrained_rounds(
+    engine,
+    participant_ids: Sequence[str],
+    gifts: int,
+    exclusion_groups: List[List[str]],
+    excluded_pairs: List[Tuple[str, str]],
+) -> List[Tuple[str, str]]:
+    """
+    gifts Runden unter Ausschlussregeln. Zuerst rundenweise über den Solver (die
+    Paare früherer Runden sind in späteren ausgeschlossen); bleibt das auch nach
+    MULTI_ROUND_RESTARTS neuen Versuchen hängen, werden alle Runden gemeinsam als
+    Fluss gelöst (exakt: InfeasibleAssignmentError nur, wenn es keine Lösung gibt)
+    """
+    _require_gift_count(len(participant_ids), gifts)
+    error = None
+    for _ in range(MULTI_ROUND_RESTARTS):
+        excluded = set(excluded_pairs)
+        pairs = []
+        try:
+            for _ in range(gifts):
+                round_pairs = engine.constrained_pairings(participant_ids, exclusion_groups, excluded)
+                excluded.update(round_pairs)
+                pairs.extend(round_pairs)
+            return pairs
+        except InfeasibleAssignmentError as e:
+            error = e
+    if len(participant_ids) > MULTI_EXACT_MAX_PARTICIPANTS:
+        raise error
+    rng = engine.rng if isinstance(engine.rng, random.Random) else random.Random(engine.seed)
+    forbidden = _ExclusionRules(participant_ids, exclusion_groups, excluded_pairs)
+    return [
+        (participant_ids[giver], participant_ids[receiver])
+        for perm in _flow_rounds(forbidden, gifts, rng)
+        for giver, receiver in enumerate(perm)
+    ]
+
+
+def _flow_rounds(forbidden: _ExclusionRules, gifts: int, rng: random.Random) -> List[List[int]]:
+    """
+    Alle Runden zugleich: Quelle -> Schenkender (Kapazität gifts) -> erlaubter
+    Beschenkter (1) -> Senke (gifts). Ein Fluss von n * gifts ist ein gifts-regulärer
+    bipartiter Graph, der sich (König) in gifts perfekte Matchings = Runden zerlegt
+    """
+    n = forbidden.n
+    source, sink = 2 * n, 2 * n + 1
+    head: List[List[int]] = [[] for _ in range(2 * n + 2)]
+    to: List[int] = []
+    cap: List[int] = []
+
+    def add_edge(u: int, v: int, capacity: int):
+        head[u].append(len(to))
+        to.append(v)
+        cap.append(capacity)
+        head[v].append(len(to))
+        to.append(u)
+        cap.append(0)
+
+    receivers = list(range(n))
+    for giver in range(n):
+        add_edge(source, giver, gifts)
+        rng.shuffle(receivers)  # zufällige Kantenreihenfolge -> zufällige Lösung
+        for receiver in receivers:
+            if not forbidden(giver, receiver):
+                add_edge(giver, n + receiver, 1)
+    for receiver in range(n):
+        add_edge(n + receiver, sink, gifts)
+
+    if _max_flow(head, to, cap, source, sink) < n * gifts:
+        raise InfeasibleAssignmentError(
+            f"Keine gültige Zuweisung möglich: die Ausschlussregeln erlauben keine "
+            f"{gifts} Beschenkten pro Person"
+        )
+    # Benutzte Vorwärtskanten (gerade IDs, Kapazität aufgebraucht) = gewählte Paare
+    chosen = [
+        [to[edge] - n for edge in head[giver] if not edge & 1 and n <= to[edge] < 2 * n and not cap[edge]]
+        for giver in range(n)
+    ]
+    rounds = []
+    for _ in range(gifts):
+        perm = _perfect_matching(chosen, n)
+        for giver, receiver in enumerate(perm):
+            chosen[giver].remove(receiver)
+        rounds.append(perm)
+    return rounds
+
+
+def _max_flow(head: List[List[int]], to: List[int], cap: List[int], source: int, sink: int) -> int:
+    """Dinic mit iterativer DFS; jeder Pfad trägt eine Einheit (mittlere Kanten haben Kapazität 1)"""
+    total = 0
+    while True:
+        level = [-1] * len(head)
+        level[source] = 0
+        queue = [source]
+        for u in queue:
+            for edge in head[u]:
+                if cap[edge] and level[to[edge]] < 0:
+                    level[to[edge]] = level[u] + 1
+                    queue.append(to[edge])
+        if level[sink] < 0:
+            return total
+        current = [0] * len(head)
+        while True:
+            path: List[int] = []
+            u = source
+            while u != sink:
+                edges = head[u]
+                while current[u] < len(edges):
+                    edge = edges[current[u]]
+                    if cap[edge] and level[to[edge]] == level[u] + 1:
+                        break
+                    current[u] += 1
+                else:
+                    # Sackgasse: Knoten sperren und einen Schritt zurück
+                    if u == source:
+                        break
+                    level[u] = -1
+                    edge = path.pop()
+                    u = to[edge ^ 1]
+                    current[u] += 1
+                    continue
+                path.append(edge)
+                u = to[edge]
+            if u != sink:
+                break
+            for edge in path:
+                cap[edge] -= 1
+                cap[edge ^ 1] += 1
+            total += 1
+
+
+def _perfect_matching(adjacency: List[List[int]], n: int) -> List[int]:
+    """Perfektes Matching in einem regulären bipartiten Graphen (BFS-Augmentierungspfade)"""
+    perm = [-1] * n
+    owner = [-1] * n
+    for root in range(n):
+        reached_from = {}
+        queue = [root]
+        free = -1
+        for giver in queue:
+            for receiver in adjacency[giver]:
+                if receiver in reached_from:
+                    continue
+                reached_from[receiver] = giver
+                if owner[receiver] == -1:
+                    free = receiver
+                    break
+                queue.append(owner[receiver])
+            if free != -1:
+                break
+        if free == -1:
+            raise ValueError("Graph ist nicht regulär: kein perfektes Matching")
+        receiver = free
+        while receiver != -1:
+            giver = reached_from[receiver]
+            previous = perm[giver]
+            perm[giver] = receiver
+            owner[receiver] = giver
+            receiver = previous
+    return perm
+
+
+def engine_for(participant_count: int, seed: Optional[int] = None):
+    """Vektorisierte Engine für sehr große Events (wenn NumPy installiert ist), sonst reines Python"""
+    if participant_count >= NUMPY_ASSIGNMENT_THRESHOLD:
+        try:
+            return NumpyAssignmentEngine(seed)
+        except ImportError:
+            pass
+    return AssignmentEngine(seed)
+
+
+def _require_participants(n: int):
+    if n < 2:
+        raise ValueError("Für eine Zuweisung werden mindestens 2 Teilnehmer benötigt")
+
+
+def _require_gift_count(n: int, gifts: int):
+    _require_participants(n)
+    if not 1 <= gifts <= n - 1:
+        raise ValueError(f"Geschenke pro Person müssen zwischen 1 und {n - 1} liegen (war {gifts})")
+
+
+# Vektorisierter Pfad (NumPy): Permutationen als Index-Arrays, Assignment-Objekte erst am Ende
+
+class NumpyAssignmentEngine:
+    """
+    Gleiche Modi wie AssignmentEngine, aber Erzeugung und Prüfung auf int-Arrays
+    Nur verfügbar, wenn NumPy installiert ist (sonst ImportError beim Erzeugen)
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        if np is None:
+            raise ImportError("NumPy ist nicht installiert (pip install numpy)")
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
+    def derangement(self, n: int, mode: str = MODE_UNIFORM) -> "np.ndarray":
+        _require_participants(n)
+        if mode == MODE_CYCLE:
+            # Zufällige Reihenfolge als Kreis schließen: gleichverteilt über alle n-Zyklen
+            order = self.rng.permutation(n)
+            perm = np.empty(n, dtype=np.int64)
+            perm[order] = np.roll(order, -1)
+            return perm
+        if mode == MODE_UNIFORM:
+            identity = np.arange(n)
+            while True:
+                perm = self.rng.permutation(n)
+                if not np.any(perm == identity):  # ~1/e der Versuche werden angenommen
+                    return perm
+        raise ValueError(f"Unbekannter Zuweisungsmodus: {mode!r} (erlaubt: {', '.join(MODES)})")
+
+    def pairings(self, participant_ids: Sequence[str], mode: str = MODE_UNIFORM) -> List[Tuple[str, str]]:
+        """Wie AssignmentEngine.pairings; geprüft wird vektorisiert vor dem Materialisieren"""
+        if len(set(participant_ids)) != len(participant_ids):
+            raise ValueError("Teilnehmerliste enthält doppelte IDs")
+        perm = self.derangement(len(participant_ids), mode)
+        verify_permutation_array(perm)
+        return _materialize(participant_ids, perm)
+
+    def constrained_pairings(
+        self,
+        participant_ids: Sequence[str],
+        exclusion_groups: Iterable[Iterable[str]] = (),
+        excluded_pairs: Iterable[Tuple[str, str]] = (),
+    ) -> List[Tuple[str, str]]:
+        """
+        Startpermutation und Konflikterkennung vektorisiert; nur die (wenigen)
+        Konflikte gehen an den Reparatur-/Matching-Schritt von AssignmentEngine
+        """
+        if len(set(participant_ids)) != len(participant_ids):
+            raise ValueError("Teilnehmerliste enthält doppelte IDs")
+        n = len(participant_ids)
+        _require_participants(n)
+        forbidden = _ExclusionRules(participant_ids, exclusion_groups, excluded_pairs)
+        arrays = _RuleArrays(forbidden)
+
+        perm = self.rng.permutation(n)
+        conflicts = np.flatnonzero(arrays.conflicts(perm)).tolist()
+        solver = AssignmentEngine(rng=random.Random(self.seed))
+        perm = np.asarray(solver._solve(forbidden, perm.tolist(), conflicts), dtype=np.int64)
+
+        verify_permutation_array(perm, arrays)
+        return _materialize(participant_ids, perm)
+
+    def multi_pairings(
+        self,
+        participant_ids: Sequence[str],
+        gifts: int,
+        exclusion_groups: Iterable[Iterable[str]] = (),
+        excluded_pairs: Iterable[Tuple[str, str]] = (),
+    ) -> List[Tuple[str, str]]:
+        """Wie AssignmentEngine.multi_pairings; die zirkulanten Runden als np.roll"""
+        if len(set(participant_ids)) != len(participant_ids):
+            raise ValueError("Teilnehmerliste enthält doppelte IDs")
+        exclusion_groups = [list(group) for group in exclusion_groups]
+        excluded_pairs = list(excluded_pairs)
+        if exclusion_groups or excluded_pairs:
+            pairs = _constrained_rounds(self, participant_ids, gifts, exclusion_groups, excluded_pairs)
+        else:
+            n = len(participant_ids)
+            _require_gift_count(n, gifts)
+            order = self.rng.permutation(n)
+            pairs = []
+            for shift in self.rng.choice(np.arange(1, n), size=gifts, replace=False):
+                perm = np.empty(n, dtype=np.int64)
+                perm[order] = np.roll(order, -int(shift))
+                verify_permutation_array(perm)
+                pairs.extend(_materialize(participant_ids, perm))
+        verify_multi_pairings(participant_ids, pairs, gifts)
+        return pairs
+
+
+class _RuleArrays:
+    """Ausschlussregeln als Arrays für die vektorisierte Prüfung"""
+
+    MULTIPLE_GROUPS = -2
+
+    def __init__(self, forbidden: _ExclusionRules):
+        self.forbidden = forbidden
+        # Gruppen-ID pro Teilnehmer: -1 keine, -2 mehrere (werden einzeln geprüft)
+        self.group_of = np.fromiter(
+            (
+                -1 if groups is None else next(iter(groups)) if len(groups) == 1 else self.MULTIPLE_GROUPS
+                for groups in forbidden.groups
+            ),
+            dtype=np.int64,
+            count=forbidden.n,
+        )
+        givers, receivers = [], []
+        for giver, blocked in enumerate(forbidden.blocked):
+            for receiver in blocked or ():
+                givers.append(giver)
+                receivers.append(receiver)
+        self.pair_givers = np.asarray(givers, dtype=np.int64)
+        self.pair_receivers = np.asarray(receivers, dtype=np.int64)
+
+    def conflicts(self, perm: "np.ndarray") -> "np.ndarray":
+        """Bool-Maske der Schenkenden, deren Zuordnung eine Regel verletzt"""
+        conflict = perm == np.arange(len(perm))
+        giver_group, receiver_group = self.group_of, self.group_of[perm]
+        conflict |= (giver_group >= 0) & (giver_group == receiver_group)
+        if len(self.pair_givers):
+            hits = perm[self.pair_givers] == self.pair_receivers
+            conflict[self.pair_givers[hits]] = True
+        multiple = np.flatnonzero((giver_group == self.MULTIPLE_GROUPS) | (receiver_group == self.MULTIPLE_GROUPS))
+        for giver in multiple.tolist():
+            if self.forbidden(giver, int(perm[giver])):
+                conflict[giver] = True
+        return conflict
+
+
+def verify_permutation_array(perm: "np.ndarray", rules: Optional[_RuleArrays] = None):
+    """Vektorisierte Prüfung: Permutation, keine Fixpunkte, optional keine Regelverletzung"""
+    n = len(perm)
+    if perm.min(initial=0) < 0 or perm.max(initial=0) >= n or np.any(np.bincount(perm, minlength=n) != 1):
+        raise ValueError("Nicht jeder Teilnehmer wird genau einmal beschenkt")
+    if np.any(perm == np.arange(n)):
+        raise ValueError("Mindestens ein Teilnehmer würde sich selbst beschenken")
+    if rules is not None:
+        violations = np.flatnonzero(rules.conflicts(perm))
+        if len(violations):
+            raise ValueError(f"{len(violations)} Zuweisungen verletzen eine Ausschlussregel")
+
+
+def _materialize(participant_ids: Sequence[str], perm: "np.ndarray") -> List[Tuple[str, str]]:
+    receivers = np.asarray(participant_ids, dtype=object)[perm].tolist()
+    return list(zip(participant_ids, receivers))
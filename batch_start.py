@@ -0,0 +1,239 @@
+"""
+Sammel-Start für viele Events
+Berechnet die Zuweisungen parallel in einem Prozess-Pool (ohne die Paare der
+letzten Events derselben Gruppe, siehe pairing_history), speichert alle
+gestarteten Events mit einem einzigen Sammel-Schreibvorgang (update_events)
+und legt die Benachrichtigungs-Mails in der Outbox ab (siehe outbox.py)
+
+Aufruf: python batch_start.py EVENT_ID [EVENT_ID ...] [--workers 4] [--no-mails]
+        python batch_start.py --all-pending
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from assignment_engine import engine_for
+from config import ASSIGNMENT_MODE, PAIRING_HISTORY_WINDOW
+from models import Assignment, DataManager, Event
+from link_service import LinkAuthService
+from pairing_history import group_key, load_history, pairings_avoiding_history
+from wichtel_logic import WichtelLogic
+
+STATUS_STARTED = "started"
+STATUS_SKIPPED = "skipped"  # bereits gestartet
+STATUS_MISSING = "missing"  # Event-ID unbekannt
+STATUS_FAILED = "failed"    # z. B. keine gültige Zuweisung möglich
+
+
+@dataclass
+class EventStartResult:
+    """Ergebnis und Zeiten für ein Event des Sammel-Starts"""
+    event_id: str
+    title: str = ""
+    participants: int = 0
+    status: str = STATUS_STARTED
+    error: str = ""
+    compute_seconds: float = 0.0
+    mails_sent: int = 0
+    mails_failed: int = 0
+    mail_seconds: float = 0.0
+
+
+@dataclass
+class BatchStartReport:
+    """Gesamtergebnis eines Sammel-Starts"""
+    results: List[EventStartResult] = field(default_factory=list)
+    compute_seconds: float = 0.0  # Wanduhrzeit des Prozess-Pools
+    write_seconds: float = 0.0    # Sammel-Schreibvorgang
+    mail_seconds: float = 0.0     # bis alle Mails versendet sind
+    total_seconds: float = 0.0
+
+    @property
+    def started(self) -> List[EventStartResult]:
+        return [result for result in self.results if result.status == STATUS_STARTED]
+
+
+def _compute_pairs(
+    job: Tuple[str, List[str], List[List[str]], List[List[Tuple[str, str]]], int, Optional[int], str]
+) -> Tuple[str, Optional[List[Tuple[str, str]]], str, float]:
+    """
+    Läuft im Worker-Prozess: bekommt nur IDs (keine Event-Objekte) und gibt
+    (event_id, Paare, Fehlertext, Rechenzeit) zurück
+    """
+    event_id, participant_ids, exclusion_groups, recent_pairs, gifts, seed, mode = job
+    started = time.perf_counter()
+    try:
+        engine = engine_for(len(participant_ids), seed)
+        if exclusion_groups or any(recent_pairs):
+            pairs, _ = pairings_avoiding_history(engine, participant_ids, exclusion_groups, recent_pairs, gifts)
+        elif gifts > 1:
+            pairs = engine.multi_pairings(participant_ids, gifts)
+        else:
+            pairs = engine.pairings(participant_ids, mode)
+        return event_id, pairs, "", time.perf_counter() - started
+    except ValueError as e:  # inkl. InfeasibleAssignmentError
+        return event_id, None, str(e), time.perf_counter() - started
+
+
+def pending_event_ids() -> List[str]:
+    """IDs aller Events, die noch nicht gestartet sind"""
+    return [event.id for event in DataManager.load_events().values() if not event.is_started]
+
+
+def start_events(
+    event_ids: Iterable[str],
+    workers: Optional[int] = None,
+    send_mails: bool = True,
+    seed: Optional[int] = None,
+    mode: str = ASSIGNMENT_MODE,
+    history_window: int = PAIRING_HISTORY_WINDOW,
+    wait_for_mails: bool = True,
+) -> BatchStartReport:
+    """
+    Startet mehrere Events auf einmal
+
+    Args:
+        event_ids: IDs der zu startenden Events (bereits gestartete werden übersprungen)
+        workers: Anzahl Worker-Prozesse (Standard: CPU-Anzahl; 1 = ohne Pool im eigenen Prozess)
+        send_mails: Benachrichtigungen nach dem Speichern in die Outbox legen
+        wait_for_mails: auf den Versand warten (Mailzeiten im Report), sonst nur einreihen
+        seed: Basis-Seed; Event Nr. i bekommt seed + i (reproduzierbar)
+        mode: Zuweisungsmodus ohne Ausschlussgruppen (siehe assignment_engine)
+        history_window: Paare der letzten N Events derselben Gruppe vermeiden (0 = aus)
+
+    Returns:
+        BatchStartReport mit Status und Zeiten pro Event
+    """
+    total_started = time.perf_counter()
+    report = BatchStartReport()
+    results: Dict[str, EventStartResult] = {}
+    events: Dict[str, Event] = {}
+    jobs = []
+
+    for event_id in dict.fromkeys(event_ids):
+        event = DataManager.get_event_by_id(event_id)
+        result = EventStartResult(event_id=event_id)
+        report.results.append(result)
+        if event is None:
+            result.status = STATUS_MISSING
+            continue
+        result.title = event.title
+        result.participants = len(event.participant_ids)
+        if event.is_started:
+            result.status = STATUS_SKIPPED
+            continue
+        results[event_id] = result
+        events[event_id] = event
+
+    # Historie nur für die Gruppen der zu startenden Events laden
+    history = load_history((group_key(event) for event in events.values()), history_window)
+    for event_id, event in events.items():
+        event_seed = None if seed is None else seed + len(jobs)
+        jobs.append((
+            event_id, list(event.participant_ids), event.exclusion_groups,
+            history.recent_pairs(event), event.gifts_per_person, event_seed, mode,
+        ))
+
+    # 1) Zuweisungen berechnen (CPU-lastig, daher Prozesse statt Threads)
+    phase_started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            computed = list(pool.map(_compute_pairs, jobs))
+    else:
+        computed = [_compute_pairs(job) for job in jobs]
+    report.compute_seconds = time.perf_counter() - phase_started
+
+    started_events = []
+    for event_id, pairs, error, seconds in computed:
+        result = results[event_id]
+        result.compute_seconds = seconds
+        if pairs is None:
+            result.status = STATUS_FAILED
+            result.error = error
+            continue
+        event = events[event_id]
+        event.assignments = [Assignment(giver_id=giver, receiver_id=receiver) for giver, receiver in pairs]
+        event.is_started = True
+        # Links gleich mitschreiben, damit der Mailversand nichts mehr speichern muss
+        LinkAuthService.add_missing_links(event)
+        started_events.append(event)
+
+    # 2) Ein Sammel-Schreibvorgang für alle gestarteten Events
+    phase_started = time.perf_counter()
+    if started_events:
+        try:
+            DataManager.update_events(started_events)
+        except AttributeError:
+            for event in started_events:
+                WichtelLogic._persist_event(event)
+    report.write_seconds = time.perf_counter() - phase_started
+
+    # 3) Benachrichtigungen in die Outbox (der Worker versendet sie mit Rate-Limit)
+    if send_mails and started_events:
+        from email_service import MAIL_EVENT_STARTED
+        from outbox import enqueue_event_emails, event_progress, wait_for_events
+
+        phase_started = time.perf_counter()
+        for event in started_events:
+            enqueue_event_emails(event, MAIL_EVENT_STARTED)
+        if wait_for_mails:
+            # Mailzeit pro Event: vom Einreihen bis die letzte Mail des Events raus ist
+            for event_id, seconds in wait_for_events(event.id for event in started_events).items():
+                results[event_id].mail_seconds = seconds
+            for event in started_events:
+                progress = event_progress(event.id)
+                results[event.id].mails_sent = progress.sent
+                results[event.id].mails_failed = progress.failed
+        report.mail_seconds = time.perf_counter() - phase_started
+
+    report.total_seconds = time.perf_counter() - total_started
+    return report
+
+
+def print_report(report: BatchStartReport):
+    """Gibt die Zeiten pro Event als Tabelle aus"""
+    print(f"{'Event':<38} {'Titel':<24} {'Teiln.':>7} {'Status':<8} {'Rechnen':>9} {'Mails':>6} {'Fehler':>6} {'Mailzeit':>9}")
+    for result in report.results:
+        print(
+            f"{result.event_id:<38} {result.title[:24]:<24} {result.participants:>7} {result.status:<8} "
+            f"{result.compute_seconds:>8.3f}s {result.mails_sent:>6} {result.mails_failed:>6} {result.mail_seconds:>8.3f}s"
+        )
+        if result.error:
+            print(f"    -> {result.error}")
+    print(
+        f"\n{len(report.started)}/{len(report.results)} gestartet | Rechnen {report.compute_seconds:.3f}s | "
+        f"Speichern {report.write_seconds:.3f}s | Mails {report.mail_seconds:.3f}s | Gesamt {report.total_seconds:.3f}s"
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Startet mehrere Wichtel-Events auf einmal")
+    parser.add_argument("event_ids", nargs="*", help="IDs der zu startenden Events")
+    parser.add_argument("--all-pending", action="store_true", help="alle noch nicht gestarteten Events starten")
+    parser.add_argument("--workers", type=int, default=None, help="Worker-Prozesse (Standard: CPU-Anzahl)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--mode", default=ASSIGNMENT_MODE)
+    parser.add_argument("--history-window", type=int, default=PAIRING_HISTORY_WINDOW,
+                        help="Paare der letzten N Events derselben Gruppe vermeiden (0 = aus)")
+    parser.add_argument("--no-mails", action="store_true", help="keine Benachrichtigungen versenden")
+    parser.add_argument("--no-wait", action="store_true", help="Mails nur in die Outbox legen, nicht auf den Versand warten")
+    args = parser.parse_args(argv)
+
+    event_ids = list(args.event_ids)
+    if args.all_pending:
+        event_ids += pending_event_ids()
+    if not event_ids:
+        parser.error("keine Event-IDs angegeben (oder --all-pending)")
+
+    report = start_events(event_ids, workers=args.workers, send_mails=not args.no_mails, seed=args.seed, mode=args.mode,
+                          history_window=args.history_window, wait_for_mails=not args.no_wait)
+    print_report(report)
+    return 0 if all(result.status != STATUS_FAILED for result in report.results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,62 @@
+"""
+Benchmark: Zuweisungs-Engine
+Misst beide Modi (Sattolo-Kreis, gleichverteiltes Derangement) inkl. Prüfung für
+wachsende Teilnehmerzahlen; konstante ns/Teilnehmer zeigen lineare Skalierung.
+Danach den Solver mit Ausschlussregeln: Haushalte mit 1-4 Personen plus zwei
+ausgeschlossene Paare pro Teilnehmer (z. B. die letzten Jahre)
+
+Aufruf: python benchmarks/bench_assignment.py [--sizes 1000 10000 100000 1000000]
+        [--constrained-sizes 10000 50000] [--seed 42]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from assignment_engine import AssignmentEngine, MODES, verify_pairings  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--constrained-sizes", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'Teilnehmer':>12}{'Modus':>10}{'Permutation ms':>16}{'Prüfung ms':>12}{'ns/Teilnehmer':>15}")
+    for n in args.sizes:
+        participant_ids = [f"user-{i}" for i in range(n)]
+        for mode in MODES:
+            engine = AssignmentEngine(seed=args.seed)
+            start = time.perf_counter()
+            perm = engine.derangement(n, mode)
+            generated = time.perf_counter()
+            verify_pairings(participant_ids, [(giver, participant_ids[t]) for giver, t in zip(participant_ids, perm)])
+            verified = time.perf_counter()
+            total = verified - start
+            print(f"{n:>12}{mode:>10}{(generated - start) * 1000:>16.1f}"
+                  f"{(verified - generated) * 1000:>12.1f}{total / n * 1e9:>15.0f}")
+
+    print(f"\n{'Teilnehmer':>12}{'Gruppen':>10}{'Paare':>10}{'Solver ms':>12}{'ns/Teilnehmer':>15}")
+    rng = random.Random(args.seed)
+    for n in args.constrained_sizes:
+        participant_ids = [f"user-{i}" for i in range(n)]
+        groups, start = [], 0
+        while start < n:
+            size = rng.choice([1, 2, 2, 3, 4])
+            groups.append(participant_ids[start:start + size])
+            start += size
+        excluded_pairs = [
+            (participant_ids[i], participant_ids[(i + offset) % n]) for i in range(n) for offset in (7, 13)
+        ]
+        start = time.perf_counter()
+        AssignmentEngine(seed=args.seed).constrained_pairings(participant_ids, groups, excluded_pairs)
+        total = time.perf_counter() - start
+        print(f"{n:>12}{len(groups):>10}{len(excluded_pairs):>10}{total * 1000:>12.1f}{total / n * 1e9:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Benchmark: Serialisierung von Events/Benutzern
+Vergleicht den bisherigen Pfad (dataclasses.asdict + json mit indent=2) mit der
+Codec-Schicht aus models.py (handgeschriebene to_dict/from_dict + kompakter Codec)
+
+Aufruf: python benchmarks/bench_codec.py [--participants 10000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from dataclasses import asdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+os.environ.setdefault("USE_DATA_CACHE", "false")
+
+from models import (  # noqa: E402
+    JSON_CODEC, StdlibJSONCodec, OrjsonCodec, MsgspecCodec,
+    User, Event, Assignment, AccessLink,
+)
+
+
+def build_fixture(participants: int):
+    users = {
+        uid: User(id=uid, name=f"User {i}", email=f"user{i}@example.com", password="secret")
+        for i, uid in enumerate(str(uuid.uuid4()) for _ in range(participants))
+    }
+    ids = list(users)
+    event = Event(
+        id=str(uuid.uuid4()),
+        title="Benchmark-Event",
+        created_by=ids[0],
+        created_at="2024-12-01T12:00:00",
+        participant_ids=ids,
+        assignments=[
+            Assignment(giver_id=giver, receiver_id=ids[(i + 1) % len(ids)], revealed=i % 3 == 0)
+            for i, giver in enumerate(ids)
+        ],
+        access_links=[
+            AccessLink(token=f"wtl_{uuid.uuid4().hex}", user_id=uid, created_at="2024-12-01T12:00:00")
+            for uid in ids
+        ],
+        is_started=True,
+        gift_value="20 EUR",
+    )
+    return users, {event.id: event}
+
+
+# Bisheriger Pfad (Stand vor der Codec-Schicht), hier zum Vergleich nachgebaut
+def legacy_event_to_dict(event: Event) -> dict:
+    result = asdict(event)
+    result['assignments'] = [asdict(a) for a in event.assignments]
+    result['access_links'] = [asdict(link) for link in event.access_links]
+    return result
+
+
+def legacy_event_from_dict(data: dict) -> Event:
+    data = data.copy()
+    data.pop('is_revealed', None)
+    data['assignments'] = [Assignment(**a) for a in data.get('assignments', [])]
+    data['access_links'] = [AccessLink(**link) for link in data.get('access_links', [])]
+    return Event(**data)
+
+
+def legacy_encode(users, events):
+    users_raw = json.dumps({uid: asdict(u) for uid, u in users.items()}, indent=2, ensure_ascii=False)
+    events_raw = json.dumps({eid: legacy_event_to_dict(e) for eid, e in events.items()}, indent=2, ensure_ascii=False)
+    return (users_raw + events_raw).encode('utf-8'), users_raw.encode('utf-8'), events_raw.encode('utf-8')
+
+
+def legacy_decode(users_raw: bytes, events_raw: bytes):
+    users = {uid: User(**data) for uid, data in json.loads(users_raw).items()}
+    events = {eid: legacy_event_from_dict(data) for eid, data in json.loads(events_raw).items()}
+    return users, events
+
+
+def codec_encode(codec, users, events):
+    users_raw = codec.dumps({uid: u.to_dict() for uid, u in users.items()})
+    events_raw = codec.dumps({eid: e.to_dict() for eid, e in events.items()})
+    return users_raw + events_raw, users_raw, events_raw
+
+
+def codec_decode(codec, users_raw: bytes, events_raw: bytes):
+    users = {uid: User.from_dict(data) for uid, data in codec.loads(users_raw).items()}
+    events = {eid: Event.from_dict(data) for eid, data in codec.loads(events_raw).items()}
+    return users, events
+
+
+def best_of(repeat: int, func, *args):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def available_codecs():
+    codecs = [StdlibJSONCodec()]
+    for codec_class in (OrjsonCodec, MsgspecCodec):
+        try:
+            codecs.append(codec_class())
+        except ImportError:
+            pass
+    return codecs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--participants", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    users, events = build_fixture(args.participants)
+    print(f"{args.participants} Teilnehmer, bester von {args.repeat} Läufen (aktiver Codec: {JSON_CODEC.name})\n")
+    print(f"{'Pfad':<22}{'encode ms':>12}{'decode ms':>12}{'Größe KB':>12}")
+
+    encode_time, (raw, users_raw, events_raw) = best_of(args.repeat, legacy_encode, users, events)
+    decode_time, decoded = best_of(args.repeat, legacy_decode, users_raw, events_raw)
+    assert decoded[1] == events
+    print(f"{'asdict + json indent=2':<22}{encode_time * 1000:>12.1f}{decode_time * 1000:>12.1f}{len(raw) / 1024:>12.0f}")
+
+    for codec in available_codecs():
+        encode_time, (raw, users_raw, events_raw) = best_of(args.repeat, codec_encode, codec, users, events)
+        decode_time, decoded = best_of(args.repeat, codec_decode, codec, users_raw, events_raw)
+        assert decoded == (users, events)
+        print(f"{'to_dict + ' + codec.name:<22}{encode_time * 1000:>12.1f}{decode_time * 1000:>12.1f}{len(raw) / 1024:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
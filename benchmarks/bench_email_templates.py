@@ -0,0 +1,86 @@
+"""
+Benchmark: Rendern der Benachrichtigungs-E-Mails
+Vergleicht den bisherigen Pfad (ganzes HTML pro Empfänger per Format-String
+neu aufbauen) mit den vorkompilierten, minifizierten Vorlagen aus
+email_service.get_email_template (pro Empfänger nur Titel und URL einsetzen)
+
+Aufruf: python benchmarks/bench_email_templates.py [--recipients 10000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+os.environ.setdefault("USE_DATA_CACHE", "false")
+
+from email_service import (  # noqa: E402
+    _EMAIL_PAGE, _EMAIL_THEMES, MAIL_EVENT_CREATED, MAIL_EVENT_STARTED, get_email_template,
+)
+from language import LANGUAGES, TRANSLATIONS  # noqa: E402
+
+
+# Bisheriger Pfad (Stand vor den vorkompilierten Vorlagen), hier zum Vergleich nachgebaut
+def legacy_render(lang: str, kind: str, event_title: str, event_url: str):
+    texts = TRANSLATIONS[lang]
+    theme = _EMAIL_THEMES[kind]
+    prefix = theme['prefix']
+    subject = texts[f"{prefix}_subject"].format(event_title=event_title)
+    body = _EMAIL_PAGE.format(
+        lang=lang,
+        title=texts[f"{prefix}_title"],
+        heading=texts[f"{prefix}_heading"],
+        subheading=texts[f"{prefix}_subheading"],
+        hello=texts[f"{prefix}_body_hello"],
+        body_event=texts[f"{prefix}_body_event"].format(event_title=event_title),
+        body_text=texts[theme['text_key']],
+        button_label=texts[f"{prefix}_button"],
+        footer=texts[f"{prefix}_footer"],
+        event_url=event_url,
+        **theme,
+    )
+    return subject, body
+
+
+def best_of(repeat: int, func):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recipients", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    title = "Weihnachtsfeier Büro & Co"
+    urls = [f"http://localhost:8501/?token=wtl_{uuid.uuid4().hex}" for _ in range(args.recipients)]
+
+    start = time.perf_counter()
+    for lang in LANGUAGES:
+        for kind in (MAIL_EVENT_CREATED, MAIL_EVENT_STARTED):
+            get_email_template(lang, kind)
+    compile_ms = (time.perf_counter() - start) * 1000
+    print(f"Vorlagen kompiliert: {len(LANGUAGES) * 2} in {compile_ms:.2f} ms\n")
+
+    print(f"{'Sprache':<8}{'Art':<15}{'bisher ms':>11}{'Vorlage ms':>12}{'Faktor':>9}"
+          f"{'Mails/s':>12}{'bisher B':>10}{'Vorlage B':>11}")
+    for lang in LANGUAGES:
+        for kind in (MAIL_EVENT_CREATED, MAIL_EVENT_STARTED):
+            template = get_email_template(lang, kind)
+            legacy_time, legacy = best_of(args.repeat, lambda: [legacy_render(lang, kind, title, url) for url in urls])
+            cached_time, cached = best_of(args.repeat, lambda: [template.render(title, url) for url in urls])
+            print(
+                f"{lang:<8}{kind:<15}{legacy_time * 1000:>11.1f}{cached_time * 1000:>12.1f}"
+                f"{legacy_time / cached_time:>8.1f}x{args.recipients / cached_time:>12,.0f}"
+                f"{len(legacy[0][1].encode()):>10}{len(cached[0][1].encode()):>11}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Benchmark: Durchsatz des Mailversands gegen den lokalen SMTP-Sink
+Ruft send_event_created_emails / send_event_started_emails für Events mit
+100, 1.000 und 10.000 Teilnehmern auf, einmal über eine SMTPSession
+(nacheinander) und einmal über den MailDispatcher (parallel). Gemessen werden
+Mails pro Sekunde, SMTP-Verbindungen und die Latenz pro Mail (p50/p95/p99).
+Die Daten liegen in einem temporären Verzeichnis (JSON-Backend), Rate-Limits
+sind abgeschaltet
+
+Aufruf: python benchmarks/bench_mail_throughput.py [--participants 100 1000 10000]
+        [--latency-ms 1] [--connect-latency-ms 50] [--temp-fail-rate 0.01] [--subprocess]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from typing import Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+# Nie gegen echte Daten oder Provider: eigenes Datenverzeichnis, JSON-Backend, kein Limit
+os.chdir(tempfile.mkdtemp(prefix="wichtel-mailbench-"))
+os.environ["USE_MONGODB"] = "false"
+os.environ["USE_SQLITE"] = "false"
+os.environ["SMTP_STARTTLS"] = "false"
+os.environ["MAIL_RATE_PER_MINUTE"] = "0"
+os.environ["MAIL_RATE_PER_DAY"] = "0"
+os.environ.setdefault("MAIL_BACKOFF_BASE_SECONDS", "0.05")
+
+import mail_dispatch  # noqa: E402
+from email_service import (  # noqa: E402
+    EmailConfig, MAIL_EVENT_CREATED, MAIL_EVENT_STARTED, SMTPSession,
+    get_email_template, send_event_created_emails, send_event_started_emails,
+)
+from link_service import LinkAuthService  # noqa: E402
+from mail_dispatch import MailDispatcher  # noqa: E402
+from models import DataManager, User  # noqa: E402
+from smtp_sink import SMTPSink, remote_command, remote_stats, start_subprocess  # noqa: E402
+from wichtel_logic import WichtelLogic  # noqa: E402
+
+MODES = ("session", "dispatcher")
+
+
+class TimedSession(SMTPSession):
+    """SMTPSession, die die Dauer jeder send()-Ausführung mitschreibt"""
+
+    def __init__(self, latencies: list):
+        super().__init__()
+        self._latencies = latencies
+
+    def send(self, to_email: str, subject: str, body_html: str):
+        start = time.perf_counter()
+        result = super().send(to_email, subject, body_html)
+        self._latencies.append(time.perf_counter() - start)
+        return result
+
+
+def build_event(participants: int, started: bool):
+    users = {
+        uid: User(id=uid, name=f"User {i}", email=f"user{i}@example.com", password="secret")
+        for i, uid in enumerate(str(uuid.uuid4()) for _ in range(participants))
+    }
+    DataManager.save_users({**DataManager.load_users(), **users})
+    ids = list(users)
+    event = DataManager.create_event(f"Benchmark {participants}", ids[0], ids)
+    if started:
+        WichtelLogic.assign_wichtel_random(event)
+        event = DataManager.get_event_by_id(event.id)
+    # Links vorab anlegen, damit nur der Versand gemessen wird
+    return LinkAuthService.ensure_links_for_event(event)
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def run(event, send, mode: str, concurrency: int, latencies: list) -> Tuple[float, int]:
+    start = time.perf_counter()
+    if mode == "session":
+        with TimedSession(latencies) as session:
+            sent = send(event, session=session)
+    else:
+        # send_event_*_emails nutzen den Prozess-Dispatcher; hier einer ohne Limits mit Messung
+        mail_dispatch._dispatcher = MailDispatcher(
+            concurrency=concurrency, per_minute=0, per_day=0,
+            session_factory=lambda: TimedSession(latencies),
+        )
+        try:
+            sent = send(event)
+        finally:
+            mail_dispatch._dispatcher.shutdown()
+            mail_dispatch._dispatcher = None
+    return time.perf_counter() - start, len(sent)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--participants", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--concurrency", type=int, default=mail_dispatch.MailDispatchConfig.CONCURRENCY)
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="Sink: Verzögerung pro Nachricht")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--connect-latency-ms", type=float, default=50.0, help="Sink: Verzögerung pro Verbindung")
+    parser.add_argument("--temp-fail-rate", type=float, default=0.0)
+    parser.add_argument("--reject-rate", type=float, default=0.0)
+    parser.add_argument("--drop-every", type=int, default=0)
+    parser.add_argument("--subprocess", action="store_true", help="Sink als eigenen Prozess starten")
+    args = parser.parse_args()
+
+    if args.subprocess:
+        process, host, port = start_subprocess(
+            f"--latency-ms={args.latency_ms}", f"--jitter-ms={args.jitter_ms}",
+            f"--connect-latency-ms={args.connect_latency_ms}", f"--temp-fail-rate={args.temp_fail_rate}",
+            f"--reject-rate={args.reject_rate}", f"--drop-every={args.drop_every}",
+        )
+        stats = lambda: remote_stats(host, port)  # noqa: E731
+        reset = lambda: remote_command(host, port, "XRESET")  # noqa: E731
+    else:
+        sink = SMTPSink(
+            latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+            connect_latency=args.connect_latency_ms / 1000,
+            temp_fail_rate=args.temp_fail_rate, reject_rate=args.reject_rate, drop_every=args.drop_every,
+        ).start()
+        host, port, stats, reset = sink.host, sink.port, sink.stats, sink.reset
+    EmailConfig.SMTP_SERVER, EmailConfig.SMTP_PORT, EmailConfig.SMTP_STARTTLS = host, port, False
+    for kind in (MAIL_EVENT_CREATED, MAIL_EVENT_STARTED):
+        get_email_template(EmailConfig.LANGUAGE, kind)  # einmaliges Kompilieren nicht mitmessen
+
+    print(f"SMTP-Sink {host}:{port} ({'Prozess' if args.subprocess else 'Thread'}), "
+          f"{args.latency_ms} ms/Mail, {args.connect_latency_ms} ms/Verbindung, "
+          f"{EmailConfig.SMTP_MAX_MESSAGES_PER_CONNECTION} Mails/Verbindung\n")
+    print(f"{'Teiln.':>7} {'Art':<8} {'Modus':<11}{'Mails':>7}{'Fehler':>7}{'Mails/s':>9}{'Verb.':>7}"
+          f"{'p50 ms':>8}{'p95 ms':>8}{'p99 ms':>8}{'max ms':>8}")
+    try:
+        for participants in args.participants:
+            for kind, send, started in (
+                ("created", send_event_created_emails, False),
+                ("started", send_event_started_emails, True),
+            ):
+                event = build_event(participants, started)
+                for mode in args.modes:
+                    latencies = []
+                    reset()
+                    seconds, sent = run(event, send, mode, args.concurrency, latencies)
+                    latencies.sort()
+                    counts = stats()
+                    print(
+                        f"{participants:>7} {kind:<8} {mode:<11}{sent:>7}{participants - sent:>7}"
+                        f"{sent / seconds:>9.0f}{counts.connections:>7}"
+                        + "".join(f"{percentile(latencies, q) * 1000:>8.2f}" for q in (0.5, 0.95, 0.99, 1.0))
+                    )
+    finally:
+        if args.subprocess:
+            process.terminate()
+            process.wait()
+        else:
+            sink.stop()
+
+
+if __name__ == "__main__":
+    main()
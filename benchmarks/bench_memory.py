@@ -0,0 +1,112 @@
+"""
+Benchmark: Speicherbedarf geladener Events
+Vergleicht die geslotteten Modelle aus models.py mit den bisherigen Dataclasses
+(je ein __dict__ pro Assignment/AccessLink). Simuliert mehrere Streamlit-Sessions,
+die jeweils eine eigene Kopie der Events halten.
+
+Aufruf: python benchmarks/bench_memory.py [--participants 10000] [--sessions 10]
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+import uuid
+from dataclasses import dataclass, field
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+os.environ.setdefault("USE_DATA_CACHE", "false")
+
+from models import Event  # noqa: E402
+
+
+# Bisherige, ungeslottete Modelle zum Vergleich
+@dataclass
+class LegacyAssignment:
+    giver_id: str
+    receiver_id: str
+    revealed: bool = False
+
+
+@dataclass
+class LegacyAccessLink:
+    token: str
+    user_id: str
+    created_at: str
+    disabled: bool = False
+
+
+@dataclass
+class LegacyEvent:
+    id: str
+    title: str
+    created_by: str
+    created_at: str
+    participant_ids: List[str]
+    assignments: List[LegacyAssignment]
+    access_links: List[LegacyAccessLink] = field(default_factory=list)
+    is_started: bool = False
+    gift_value: str = ""
+
+
+def legacy_from_dict(data: dict) -> LegacyEvent:
+    data = data.copy()
+    data['participant_ids'] = list(data['participant_ids'])
+    data['assignments'] = [LegacyAssignment(**a) for a in data['assignments']]
+    data['access_links'] = [LegacyAccessLink(**link) for link in data['access_links']]
+    return LegacyEvent(**data)
+
+
+def build_document(participants: int) -> dict:
+    ids = [str(uuid.uuid4()) for _ in range(participants)]
+    return {
+        'id': str(uuid.uuid4()),
+        'title': "Benchmark-Event",
+        'created_by': ids[0],
+        'created_at': "2024-12-01T12:00:00",
+        'participant_ids': ids,
+        'assignments': [
+            {'giver_id': giver, 'receiver_id': ids[(i + 1) % len(ids)], 'revealed': False}
+            for i, giver in enumerate(ids)
+        ],
+        'access_links': [
+            {'token': f"wtl_{uuid.uuid4().hex}", 'user_id': uid, 'created_at': "2024-12-01T12:00:00", 'disabled': False}
+            for uid in ids
+        ],
+        'is_started': True,
+        'gift_value': "20 EUR",
+    }
+
+
+def measure(load, document: dict, sessions: int) -> int:
+    """Zusätzlich belegte Bytes, wenn jede Session das Event einmal lädt"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    loaded = [load(document) for _ in range(sessions)]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del loaded
+    return used
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--participants", type=int, default=10_000)
+    parser.add_argument("--sessions", type=int, default=10)
+    args = parser.parse_args()
+
+    document = build_document(args.participants)
+    per_participant = args.participants * args.sessions
+    legacy = measure(legacy_from_dict, document, args.sessions)
+    slotted = measure(Event.from_dict, document, args.sessions)
+
+    print(f"{args.participants} Teilnehmer x {args.sessions} Sessions (Strings werden zwischen Sessions geteilt)\n")
+    print(f"{'Modell':<12}{'gesamt MB':>12}{'Bytes/Teilnehmer':>20}")
+    print(f"{'dataclass':<12}{legacy / 2**20:>12.1f}{legacy / per_participant:>20.0f}")
+    print(f"{'slots':<12}{slotted / 2**20:>12.1f}{slotted / per_participant:>20.0f}")
+    print(f"\nErsparnis: {(legacy - slotted) / per_participant:.0f} Bytes pro Teilnehmer und Session "
+          f"({(1 - slotted / legacy) * 100:.0f} %)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: NumPy-Pfad gegen reines Python
+Misst Erzeugung, Prüfung und Materialisierung der Assignment-Objekte (so wie
+WichtelLogic sie anlegt) für beide Engines, ohne und mit Ausschlussregeln
+
+Aufruf: python benchmarks/bench_numpy_assignment.py [--sizes 10000 100000 1000000] [--seed 42]
+Benötigt NumPy (pip install numpy)
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+os.environ.setdefault("USE_DATA_CACHE", "false")
+
+from assignment_engine import AssignmentEngine, NumpyAssignmentEngine, MODES  # noqa: E402
+from models import Assignment  # noqa: E402
+
+
+def households(participant_ids, rng):
+    groups, start = [], 0
+    while start < len(participant_ids):
+        size = rng.choice([1, 2, 2, 3, 4])
+        groups.append(participant_ids[start:start + size])
+        start += size
+    return groups
+
+
+def timed(func):
+    start = time.perf_counter()
+    pairs = func()
+    assignments = [Assignment(giver_id=giver, receiver_id=receiver) for giver, receiver in pairs]
+    return time.perf_counter() - start, assignments
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'Teilnehmer':>12}{'Fall':>14}{'Python ms':>12}{'NumPy ms':>12}{'Faktor':>9}")
+    for n in args.sizes:
+        participant_ids = [f"user-{i}" for i in range(n)]
+        cases = [
+            (mode, lambda engine, mode=mode: engine.pairings(participant_ids, mode))
+            for mode in MODES
+        ]
+        groups = households(participant_ids, random.Random(args.seed))
+        excluded_pairs = [(participant_ids[i], participant_ids[(i + 7) % n]) for i in range(n)]
+        cases.append((
+            "constrained",
+            lambda engine: engine.constrained_pairings(participant_ids, groups, excluded_pairs),
+        ))
+        for name, run in cases:
+            python_time, _ = timed(lambda: run(AssignmentEngine(args.seed)))
+            numpy_time, _ = timed(lambda: run(NumpyAssignmentEngine(args.seed)))
+            print(f"{n:>12}{name:>14}{python_time * 1000:>12.1f}{numpy_time * 1000:>12.1f}"
+                  f"{python_time / numpy_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""
+Lokaler SMTP-Server als Ersatz für Gmail bei Last- und Fehlertests
+Nimmt Nachrichten an, zählt sie und speichert sie optional. Latenz pro
+Nachricht und pro Verbindung (Login/TLS-Aufwand) sowie Fehler (451, 550,
+Verbindungsabbruch) lassen sich einstellen. Kündigt AUTH PLAIN/LOGIN an (jedes
+Passwort gilt), aber kein STARTTLS: in der App SMTP_STARTTLS=false setzen
+
+Im eigenen Prozess:
+    with SMTPSink(latency=0.002, temp_fail_rate=0.01) as sink:
+        EmailConfig.SMTP_SERVER, EmailConfig.SMTP_PORT = sink.host, sink.port
+        ...
+        print(sink.stats())
+
+Als eigener Prozess (Statistik per SMTP-Kommando XSTATS, zurücksetzen mit XRESET):
+    python benchmarks/smtp_sink.py --port 2525 [--latency-ms 2] [--temp-fail-rate 0.01] [--store DIR]
+"""
+import argparse
+import json
+import os
+import random
+import smtplib
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import List, Optional, Tuple
+
+
+@dataclass
+class SinkStats:
+    """Zähler des SMTP-Sinks"""
+    connections: int = 0   # Verbindungen mit EHLO/HELO
+    logins: int = 0
+    messages: int = 0      # angenommene Nachrichten
+    temp_failed: int = 0   # RCPT mit 451 abgelehnt
+    rejected: int = 0      # RCPT mit 550 abgelehnt
+    dropped: int = 0       # vom Server getrennte Verbindungen
+
+
+@dataclass
+class StoredMessage:
+    """Gespeicherte Nachricht (nur mit store=True)"""
+    mail_from: str
+    recipients: List[str]
+    data: bytes
+
+
+class _SinkHandler(socketserver.StreamRequestHandler):
+    """Eine SMTP-Verbindung"""
+
+    def reply(self, line: str):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def read_line(self) -> Optional[str]:
+        line = self.rfile.readline()
+        return line.decode("utf-8", "replace").rstrip("\r\n") if line else None
+
+    def handle(self):
+        sink: 'SMTPSink' = self.server.sink
+        mail_from, recipients = "", []
+        self.reply("220 wichtel-sink ESMTP")
+        while True:
+            line = self.read_line()
+            if line is None:
+                return
+            verb, _, argument = line.partition(" ")
+            verb = verb.upper()
+
+            if verb in ("EHLO", "HELO"):
+                sink._count('connections')
+                sink._sleep(sink.connect_latency)
+                if verb == "HELO":
+                    self.reply("250 wichtel-sink")
+                else:
+                    self.reply("250-wichtel-sink")
+                    self.reply("250-8BITMIME")
+                    self.reply("250 AUTH PLAIN LOGIN")
+            elif verb == "AUTH":
+                mechanism, _, initial = argument.partition(" ")
+                if mechanism.upper() not in ("PLAIN", "LOGIN"):
+                    self.reply("504 5.5.4 Unrecognized authentication type")
+                    continue
+                if not self._authenticate(mechanism.upper(), initial):
+                    return
+                sink._count('logins')
+                self.reply("235 2.7.0 Authentication successful")
+            elif verb == "MAIL":
+                mail_from, recipients = argument, []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                failure = sink._recipient_failure()
+                if failure == 'rejected':
+                    self.reply("550 5.1.1 Mailbox unavailable (injected)")
+                elif failure == 'temp_failed':
+                    self.reply("451 4.3.0 Try again later (injected)")
+                else:
+                    recipients.append(argument)
+                    self.reply("250 OK")
+            elif verb == "DATA":
+                if not recipients:
+                    self.reply("503 5.5.1 No valid recipients")
+                    continue
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = self._read_data()
+                if data is None:
+                    return
+                sink._sleep(sink.latency + sink.jitter * random.random())
+                drop = sink._accept(StoredMessage(mail_from, recipients, data))
+                self.reply("250 OK queued")
+                mail_from, recipients = "", []
+                if drop:
+                    return  # Verbindung trennen wie ein Provider nach Idle/Limit
+            elif verb == "RSET":
+                mail_from, recipients = "", []
+                self.reply("250 OK")
+            elif verb == "NOOP":
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            elif verb == "XSTATS":
+                self.reply("250 " + json.dumps(asdict(sink.stats())))
+            elif verb == "XRESET":
+                sink.reset()
+                self.reply("250 OK")
+            else:
+                self.reply("502 5.5.2 Command not implemented")
+
+    def _authenticate(self, mechanism: str, initial: str) -> bool:
+        """PLAIN oder LOGIN, mit oder ohne Initial-Response; jedes Passwort gilt"""
+        if mechanism == "PLAIN":
+            prompts = [] if initial else [""]
+        else:
+            prompts = ["UGFzc3dvcmQ6"] if initial else ["VXNlcm5hbWU6", "UGFzc3dvcmQ6"]
+        for prompt in prompts:
+            self.reply("334 " + prompt)
+            if self.read_line() is None:
+                return False  # Verbindung getrennt
+        return True
+
+    def _read_data(self) -> Optional[bytes]:
+        lines = []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return None
+            if line.rstrip(b"\r\n") == b".":
+                return b"".join(lines)
+            lines.append(line[1:] if line.startswith(b"..") else line)
+
+
+class _SinkServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class SMTPSink:
+    """
+    SMTP-Server im Hintergrund-Thread (eine Verbindung pro Thread)
+
+    - latency (+ bis zu jitter) Sekunden pro Nachricht, connect_latency pro EHLO
+    - temp_fail_rate / reject_rate: Anteil der Empfänger mit 451 bzw. 550
+    - drop_every: trennt nach jeder n-ten Nachricht die Verbindung
+    - store=True hält die Nachrichten in messages, store_dir schreibt .eml-Dateien
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        connect_latency: float = 0.0,
+        temp_fail_rate: float = 0.0,
+        reject_rate: float = 0.0,
+        drop_every: int = 0,
+        store: bool = False,
+        store_dir: Optional[str] = None,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.connect_latency = connect_latency
+        self.temp_fail_rate = temp_fail_rate
+        self.reject_rate = reject_rate
+        self.drop_every = drop_every
+        self.store = store
+        self.store_dir = store_dir
+        self.messages: List[StoredMessage] = []
+        self._stats = SinkStats()
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._server = _SinkServer((host, port), _SinkHandler)
+        self._server.sink = self
+        self._thread: Optional[threading.Thread] = None
+        if store_dir:
+            os.makedirs(store_dir, exist_ok=True)
+
+    @property
+    def host(self) -> str:
+        return self._server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> 'SMTPSink':
+        self._thread = threading.Thread(target=self._server.serve_forever, name="smtp-sink", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Blockiert im aktuellen Thread (Sink als eigener Prozess)"""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'SMTPSink':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def stats(self) -> SinkStats:
+        with self._lock:
+            return SinkStats(**asdict(self._stats))
+
+    def reset(self):
+        """Setzt Zähler und gespeicherte Nachrichten zurück"""
+        with self._lock:
+            self._stats = SinkStats()
+            self.messages = []
+
+    def _count(self, name: str):
+        with self._lock:
+            setattr(self._stats, name, getattr(self._stats, name) + 1)
+
+    @staticmethod
+    def _sleep(seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def _recipient_failure(self) -> Optional[str]:
+        with self._lock:
+            roll = self._random.random()
+            if roll < self.reject_rate:
+                self._stats.rejected += 1
+                return 'rejected'
+            if roll < self.reject_rate + self.temp_fail_rate:
+                self._stats.temp_failed += 1
+                return 'temp_failed'
+        return None
+
+    def _accept(self, message: StoredMessage) -> bool:
+        """Zählt (und speichert) eine Nachricht; True, wenn die Verbindung getrennt werden soll"""
+        with self._lock:
+            self._stats.messages += 1
+            number = self._stats.messages
+            if self.store:
+                self.messages.append(message)
+            drop = bool(self.drop_every) and number % self.drop_every == 0
+            if drop:
+                self._stats.dropped += 1
+        if self.store_dir:
+            with open(os.path.join(self.store_dir, f"{number:07d}.eml"), "wb") as f:
+                f.write(message.data)
+        return drop
+
+
+def start_subprocess(*options: str) -> Tuple[subprocess.Popen, str, int]:
+    """
+    Startet den Sink als eigenen Prozess (options wie auf der Kommandozeile)
+
+    Returns:
+        (Prozess, Host, Port)
+    """
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--port", "0", *options],
+        stdout=subprocess.PIPE, text=True,
+    )
+    address = process.stdout.readline().strip().rsplit(" ", 1)[-1]
+    host, port = address.rsplit(":", 1)
+    return process, host, int(port)
+
+
+def remote_command(host: str, port: int, command: str) -> str:
+    """Schickt XSTATS/XRESET an einen laufenden Sink und gibt die Antwort zurück"""
+    client = smtplib.SMTP(host, port)
+    try:
+        code, reply = client.docmd(command)
+        if code != 250:
+            raise smtplib.SMTPResponseException(code, reply)
+        return reply.decode()
+    finally:
+        client.quit()
+
+
+def remote_stats(host: str, port: int) -> SinkStats:
+    """Zähler eines Sinks in einem anderen Prozess"""
+    return SinkStats(**json.loads(remote_command(host, port, "XSTATS")))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2525, help="0 = freier Port")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Verzögerung pro Nachricht")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="zusätzlich zufällig bis zu so viel")
+    parser.add_argument("--connect-latency-ms", type=float, default=0.0, help="Verzögerung pro Verbindung (EHLO)")
+    parser.add_argument("--temp-fail-rate", type=float, default=0.0, help="Anteil Empfänger mit 451")
+    parser.add_argument("--reject-rate", type=float, default=0.0, help="Anteil Empfänger mit 550")
+    parser.add_argument("--drop-every", type=int, default=0, help="Verbindung nach jeder n-ten Nachricht trennen")
+    parser.add_argument("--store", metavar="DIR", default=None, help="Nachrichten als .eml-Dateien speichern")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    sink = SMTPSink(
+        args.host, args.port,
+        latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+        connect_latency=args.connect_latency_ms / 1000,
+        temp_fail_rate=args.temp_fail_rate, reject_rate=args.reject_rate,
+        drop_every=args.drop_every, store_dir=args.store, seed=args.seed,
+    )
+    # Erste Zeile wird von start_subprocess gelesen
+    print(f"SMTP-Sink läuft auf {sink.host}:{sink.port}", flush=True)
+    try:
+        sink.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(asdict(sink.stats())), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
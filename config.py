@@ -5,6 +5,21 @@ Konfigurationsdatei für die Wichtel-App
 # Dateipfade
 USERS_FILE = "users.json"
 EVENTS_FILE = "events.json"
+LINK_INDEX_FILE = "links_index.json"  # Token -> (Event-ID, User-ID)
+EVENT_SUMMARIES_FILE = "event_summaries.json"  # Event-Zusammenfassungen + Teilnehmer -> Event-IDs
+EVENT_OFFSETS_FILE = "event_offsets.json"  # Event-ID -> (Offset, Länge) in events.json
+
+# Sharded JSON-Layout (JSON_STORAGE=sharded): ein File pro Event + Manifest
+EVENTS_DIR = "events"
+EVENTS_MANIFEST_FILE = "events/manifest.json"
+
+# Journal-Modus (JSON_STORAGE=journal): Mutationen werden angehängt und ab der Schwelle kompaktiert
+JOURNAL_FILE = "data_journal.jsonl"
+JOURNAL_COMPACT_THRESHOLD = 1000
+
+# Outbox für Benachrichtigungen (JSON-Backends), siehe outbox.py
+OUTBOX_FILE = "outbox.json"  # nur offene Mails (pending/sending)
+OUTBOX_DONE_FILE = "outbox_done.jsonl"  # abgeschlossene Mails, eine pro Zeile (nur angehängt)
 
 # Session State Keys
 SESSION_USER = "user"
@@ -17,6 +32,20 @@ VIEW_ADMIN = "admin"
 VIEW_PARTICIPANT = "participant"
 VIEW_EVENT_REVEAL = "reveal"
 
+# Read-Through-Cache für den DataManager (siehe data_cache.py)
+DATA_CACHE_TTL_SECONDS = 5.0
+DATA_CACHE_MAX_ENTRIES = 256
+
+# Zuweisungsmodus (siehe assignment_engine.py): "uniform" (gleichverteiltes Derangement) oder "cycle" (ein Kreis)
+ASSIGNMENT_MODE = "uniform"
+# Ab dieser Teilnehmerzahl wird (falls installiert) der NumPy-Pfad der Engine verwendet
+NUMPY_ASSIGNMENT_THRESHOLD = 20000
+# Beim Start werden die Paare der letzten N Events derselben Gruppe vermieden (0 = aus), siehe pairing_history.py
+PAIRING_HISTORY_WINDOW = 2
+
+# Seitengröße der Event-Übersicht
+EVENT_LIST_PAGE_SIZE = 20
+
 # E-Mail Konfiguration (optional für später)
 SMTP_SERVER = "smtp.gmail.com"
 SMTP_PORT = 587
@@ -0,0 +1,141 @@
+"""
+Read-Through-Cache für den DataManager
+Hält Ergebnisse von Lesezugriffen (load_users, load_events, ...) kurzzeitig im
+Speicher und verwirft sie bei jedem Schreibzugriff
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class CachedDataManager:
+    """
+    Cache-Hülle um einen beliebigen DataManager (JSON oder MongoDB)
+
+    - Lesemethoden aus CACHED_READS werden mit TTL und LRU-Verdrängung gecacht
+    - Jede Schreibmethode (WRITE_PREFIXES) leert den Cache
+    - Bietet das Backend storage_fingerprint() an (JSON: mtime/Größe der
+      Dateien), wird jeder Treffer dagegen validiert, damit mehrere Prozesse
+      kohärent bleiben
+    - Alle anderen Attribute werden unverändert durchgereicht; fehlende
+      Methoden lösen weiterhin AttributeError aus (JSON-Fallbacks bleiben intakt)
+
+    Jeder Aufrufer erhält Kopien (Dicts/Listen samt enthaltener User-, Event-
+    und Summary-Objekte): Änderungen an einem Ergebnis, auch wenn das Speichern
+    danach scheitert, wirken sich nicht auf den Cache aus.
+    """
+    CACHED_READS = frozenset({
+        'load_users',
+        'load_events',
+        'get_user_by_id',
+        'get_user_by_email',
+        'get_users_by_ids',
+        'get_event_by_id',
+        'find_event_by_token',
+        'get_events_by_participant',
+        'get_event_summaries',
+        'get_event_summaries_page',
+    })
+    WRITE_PREFIXES = ('save_', 'update_', 'create_', 'delete_', 'set_', 'add_', 'disable_')
+
+    def __init__(self, backend, ttl: float = 5.0, max_entries: int = 256):
+        self._backend = backend
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._fingerprint: Optional[Callable[[], Hashable]] = getattr(backend, 'storage_fingerprint', None)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._backend, name)
+        if not callable(attr):
+            return attr
+
+        if name in self.CACHED_READS:
+            wrapped = self._wrap_read(name, attr)
+        elif name.startswith(self.WRITE_PREFIXES):
+            wrapped = self._wrap_write(attr)
+        else:
+            return attr
+
+        # Wrapper merken, damit __getattr__ nur beim ersten Zugriff läuft
+        self.__dict__[name] = wrapped
+        return wrapped
+
+    @property
+    def backend(self):
+        """Der eigentliche DataManager hinter dem Cache"""
+        return self._backend
+
+    def invalidate(self):
+        """Verwirft alle gecachten Einträge"""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def _current_fingerprint(self) -> Hashable:
+        return self._fingerprint() if self._fingerprint else None
+
+    def _wrap_read(self, name: str, method: Callable) -> Callable:
+        def cached_read(*args, **kwargs):
+            try:
+                # Listen (z. B. ID-Listen) als Tupel in den Schlüssel übernehmen
+                key_args = tuple(tuple(arg) if isinstance(arg, list) else arg for arg in args)
+                key = (name, key_args, frozenset(kwargs.items()))
+                hash(key)
+            except TypeError:
+                return method(*args, **kwargs)
+
+            fingerprint = self._current_fingerprint()
+            now = time.monotonic()
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    value, stored_at, stored_fingerprint = entry
+                    if now - stored_at <= self._ttl and stored_fingerprint == fingerprint:
+                        self._entries.move_to_end(key)
+                        return _copy(value)
+                    del self._entries[key]
+                generation = self._generation
+
+            value = method(*args, **kwargs)
+
+            with self._lock:
+                # Nur speichern, wenn zwischenzeitlich nicht geschrieben wurde
+                if generation == self._generation:
+                    self._entries[key] = (value, now, fingerprint)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self._max_entries:
+                        self._entries.popitem(last=False)
+            return _copy(value)
+
+        cached_read.__name__ = name
+        cached_read.__doc__ = method.__doc__
+        return cached_read
+
+    def _wrap_write(self, method: Callable) -> Callable:
+        def invalidating_write(*args, **kwargs):
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.invalidate()
+
+        invalidating_write.__name__ = method.__name__
+        invalidating_write.__doc__ = method.__doc__
+        return invalidating_write
+
+
+def _copy(value):
+    """Kopie eines gecachten Ergebnisses; Modelle (alles mit copy()) werden einzeln kopiert"""
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_copy(item) for item in value)
+    if callable(getattr(value, 'copy', None)):
+        # z. B. LazyEventMap: kopiert selbst nur die bereits geladenen Events
+        return value.copy()
+    return value
@@ -3,18 +3,19 @@ MongoDB-Datenbank-Layer für die Wichtel-App
 Ersetzt die JSON-basierten Datenspeicherung
 """
 import os
-from typing import Dict, List, Optional, TYPE_CHECKING
+import time
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
 from datetime import datetime
 import uuid
-from pymongo import MongoClient
+from pymongo import MongoClient, ASCENDING, DESCENDING, ReplaceOne, DeleteMany, UpdateOne, ReturnDocument
+from pymongo.errors import OperationFailure
 from pymongo.database import Database
 from pymongo.collection import Collection
 from dotenv import load_dotenv
-from dataclasses import asdict
 
 # Type-only imports (nur für Type Checker, nicht zur Laufzeit)
 if TYPE_CHECKING:
-    from models import User, Event
+    from models import User, Event, AccessLink, EventSummary, PageCursor, OutboxMail
 
 # Lade Umgebungsvariablen
 load_dotenv()
@@ -26,6 +27,45 @@ class DatabaseConfig:
     DATABASE_NAME = os.getenv("DATABASE_NAME", "wichtel_app")
     USERS_COLLECTION = "users"
     EVENTS_COLLECTION = "events"
+    OUTBOX_COLLECTION = "outbox"
+    BULK_BATCH_SIZE = int(os.getenv("MONGODB_BULK_BATCH_SIZE", "1000"))
+
+
+# Indizes: (Collection, Keys, Optionen)
+INDEX_SPECS = [
+    (DatabaseConfig.USERS_COLLECTION, [('id', ASCENDING)], {'name': 'users_id_unique', 'unique': True}),
+    (DatabaseConfig.USERS_COLLECTION, [('email', ASCENDING)], {'name': 'users_email_unique', 'unique': True}),
+    (DatabaseConfig.EVENTS_COLLECTION, [('id', ASCENDING)], {'name': 'events_id_unique', 'unique': True}),
+    # Beide $or-Zweige der Teilnehmer-Abfrage liefern bereits nach (created_at, id) sortiert (SORT_MERGE)
+    (DatabaseConfig.EVENTS_COLLECTION, [('participant_ids', ASCENDING), ('created_at', DESCENDING), ('id', DESCENDING)], {'name': 'events_participant_ids_created_at'}),
+    (DatabaseConfig.EVENTS_COLLECTION, [('created_by', ASCENDING), ('created_at', DESCENDING), ('id', DESCENDING)], {'name': 'events_created_by_created_at_id'}),
+    (DatabaseConfig.EVENTS_COLLECTION, [('access_links.token', ASCENDING)], {'name': 'events_access_links_token'}),
+    (DatabaseConfig.OUTBOX_COLLECTION, [('id', ASCENDING)], {'name': 'outbox_id_unique', 'unique': True}),
+    (DatabaseConfig.OUTBOX_COLLECTION, [('status', ASCENDING), ('next_attempt_at', ASCENDING)], {'name': 'outbox_status_due'}),
+    (DatabaseConfig.OUTBOX_COLLECTION, [('event_id', ASCENDING), ('status', ASCENDING)], {'name': 'outbox_event_status'}),
+]
+
+# Durch INDEX_SPECS ersetzte Indizes (Collection, Name); ensure_indexes entfernt sie vor dem Anlegen,
+# sonst scheitert create_index an gleichem Namen bzw. gleichem Key-Pattern
+REPLACED_INDEXES = [
+    (DatabaseConfig.EVENTS_COLLECTION, 'events_participant_ids'),        # -> events_participant_ids_created_at
+    (DatabaseConfig.EVENTS_COLLECTION, 'events_created_by_created_at'),  # -> events_created_by_created_at_id
+    (DatabaseConfig.EVENTS_COLLECTION, 'access_links.token_1'),          # Standardname -> events_access_links_token
+]
+
+
+# Projektion für EventSummary (ohne Zuweisungen und Links)
+SUMMARY_PROJECTION = {'$project': {
+    '_id': 0,
+    'id': 1,
+    'title': 1,
+    'created_by': 1,
+    'created_at': 1,
+    'participant_count': {'$size': {'$ifNull': ['$participant_ids', []]}},
+    'is_started': {'$ifNull': ['$is_started', False]},
+    'gift_value': {'$ifNull': ['$gift_value', '']},
+    'gifts_per_person': {'$ifNull': ['$gifts_per_person', 1]},
+}}
 
 
 class MongoDB:
@@ -46,8 +86,55 @@ class MongoDB:
         if cls._db is None:
             client = cls.get_client()
             cls._db = client[DatabaseConfig.DATABASE_NAME]
+            cls.ensure_indexes(cls._db)
         return cls._db
     
+    @staticmethod
+    def ensure_indexes(db: Database) -> List[str]:
+        """
+        Legt alle Indizes aus INDEX_SPECS an (idempotent, läuft einmal beim Verbindungsaufbau)
+        
+        Returns:
+            Fehlermeldungen für Indizes, die nicht angelegt werden konnten
+            (z. B. doppelte E-Mail-Adressen beim Unique-Index)
+        """
+        errors = []
+        for collection_name, name in MongoDB.find_replaced_indexes(db):
+            try:
+                db[collection_name].drop_index(name)
+            except OperationFailure as e:
+                errors.append(f"{collection_name}.{name}: {e}")
+                print(f"⚠️ Veralteter Index {collection_name}.{name} konnte nicht entfernt werden: {e}")
+        for collection_name, keys, options in INDEX_SPECS:
+            try:
+                db[collection_name].create_index(keys, **options)
+            except OperationFailure as e:
+                errors.append(f"{collection_name}.{options['name']}: {e}")
+                print(f"⚠️ Index {collection_name}.{options['name']} konnte nicht angelegt werden: {e}")
+        return errors
+    
+    @staticmethod
+    def find_replaced_indexes(db: Database) -> List[Tuple[str, str]]:
+        """Noch vorhandene Indizes aus REPLACED_INDEXES"""
+        return [
+            (collection_name, name)
+            for collection_name, name in REPLACED_INDEXES
+            if name in db[collection_name].index_information()
+        ]
+    
+    @staticmethod
+    def find_missing_indexes(db: Database) -> List[str]:
+        """Vergleicht INDEX_SPECS mit den vorhandenen Indizes (nach Key-Pattern)"""
+        missing = []
+        for collection_name, keys, options in INDEX_SPECS:
+            existing = {
+                tuple((field, int(direction)) for field, direction in info['key'])
+                for info in db[collection_name].index_information().values()
+            }
+            if tuple(keys) not in existing:
+                missing.append(f"{collection_name}.{options['name']} {keys}")
+        return missing
+    
     @classmethod
     def get_users_collection(cls) -> Collection:
         """Gibt Users-Collection zurück"""
@@ -60,6 +147,12 @@ class MongoDB:
         db = cls.get_database()
         return db[DatabaseConfig.EVENTS_COLLECTION]
     
+    @classmethod
+    def get_outbox_collection(cls) -> Collection:
+        """Gibt Outbox-Collection zurück"""
+        db = cls.get_database()
+        return db[DatabaseConfig.OUTBOX_COLLECTION]
+    
     @classmethod
     def close(cls):
         """Schließt die Datenbankverbindung"""
@@ -69,6 +162,45 @@ class MongoDB:
             cls._db = None
 
 
+def _sync_collection(collection: Collection, docs: Dict[str, dict]) -> Dict[str, int]:
+    """
+    Gleicht eine Collection mit dem gewünschten Stand ab (Schlüssel: Feld 'id')
+    Nur geänderte/neue Dokumente werden per ReplaceOne-Upsert geschrieben und
+    fehlende gelöscht, in geordneten bulk_write-Batches. Anders als
+    delete_many + insert_many ist die Collection dabei nie leer.
+    
+    Returns:
+        Anzahl geschriebener und gelöschter Dokumente
+    """
+    batch_size = DatabaseConfig.BULK_BATCH_SIZE
+    upserts = []
+    existing_ids = set()
+
+    for current in collection.find({}, {'_id': 0}):
+        doc_id = current.get('id')
+        existing_ids.add(doc_id)
+        wanted = docs.get(doc_id)
+        if wanted is not None and wanted != current:
+            upserts.append(ReplaceOne({'id': doc_id}, wanted, upsert=True))
+
+    upserts.extend(
+        ReplaceOne({'id': doc_id}, wanted, upsert=True)
+        for doc_id, wanted in docs.items()
+        if doc_id not in existing_ids
+    )
+    obsolete = [doc_id for doc_id in existing_ids if doc_id not in docs]
+    deletes = [
+        DeleteMany({'id': {'$in': obsolete[start:start + batch_size]}})
+        for start in range(0, len(obsolete), batch_size)
+    ]
+
+    operations = upserts + deletes
+    for start in range(0, len(operations), batch_size):
+        collection.bulk_write(operations[start:start + batch_size], ordered=True)
+
+    return {'upserted': len(upserts), 'deleted': len(obsolete)}
+
+
 class MongoDataManager:
     """Datenbank-Manager für MongoDB (ersetzt DataManager)"""
     
@@ -92,19 +224,13 @@ class MongoDataManager:
     def save_users(users: Dict[str, 'User']):
         """Speichert alle Benutzer in die Datenbank"""
         collection = MongoDB.get_users_collection()
-        
-        # Lösche alle bestehenden und füge neue ein
-        collection.delete_many({})
-        
-        if users:
-            user_docs = [asdict(user) for user in users.values()]
-            collection.insert_many(user_docs)
+        _sync_collection(collection, {uid: user.to_dict() for uid, user in users.items()})
     
     @staticmethod
     def update_user(user: 'User'):
         """Aktualisiert einen einzelnen Benutzer"""
         collection = MongoDB.get_users_collection()
-        user_dict = asdict(user)
+        user_dict = user.to_dict()
         
         # Update oder Insert
         collection.update_one(
@@ -126,6 +252,21 @@ class MongoDataManager:
             return User.from_dict(doc)
         return None
     
+    @staticmethod
+    def get_users_by_ids(user_ids: Iterable[str]) -> Dict[str, 'User']:
+        """Lädt nur die angegebenen Benutzer ($in mit Projektion auf die User-Felder)"""
+        from models import User
+        
+        collection = MongoDB.get_users_collection()
+        projection = {'_id': 0, **{field: 1 for field in User.__dataclass_fields__}}
+        docs = collection.find({'id': {'$in': list(dict.fromkeys(user_ids))}}, projection)
+        
+        users = {}
+        for doc in docs:
+            user = User.from_dict(doc)
+            users[user.id] = user
+        return users
+    
     @staticmethod
     def get_user_by_email(email: str) -> Optional['User']:
         """Sucht Benutzer nach E-Mail"""
@@ -167,13 +308,7 @@ class MongoDataManager:
     def save_events(events: Dict[str, 'Event']):
         """Speichert alle Events in die Datenbank"""
         collection = MongoDB.get_events_collection()
-        
-        # Lösche alle bestehenden und füge neue ein
-        collection.delete_many({})
-        
-        if events:
-            event_docs = [event.to_dict() for event in events.values()]
-            collection.insert_many(event_docs)
+        _sync_collection(collection, {eid: event.to_dict() for eid, event in events.items()})
     
     @staticmethod
     def create_event(title: str, creator_id: str, participant_ids: List[str], gift_value: str = "") -> 'Event':
@@ -207,6 +342,53 @@ class MongoDataManager:
             upsert=True
         )
     
+    @staticmethod
+    def update_events(events: Iterable['Event']):
+        """Aktualisiert mehrere Events per bulk_write (ReplaceOne-Upserts, in Batches)"""
+        collection = MongoDB.get_events_collection()
+        batch_size = DatabaseConfig.BULK_BATCH_SIZE
+        operations = [ReplaceOne({'id': event.id}, event.to_dict(), upsert=True) for event in events]
+        for start in range(0, len(operations), batch_size):
+            collection.bulk_write(operations[start:start + batch_size], ordered=False)
+    
+    @staticmethod
+    def set_assignment_revealed(event_id: str, giver_id: str):
+        """Markiert alle Zuweisungen eines Schenkenden als aufgedeckt ($set mit arrayFilters)"""
+        collection = MongoDB.get_events_collection()
+        collection.update_one(
+            {'id': event_id, 'assignments.giver_id': giver_id},
+            {'$set': {'assignments.$[mine].revealed': True}},
+            array_filters=[{'mine.giver_id': giver_id}],
+        )
+    
+    @staticmethod
+    def add_access_links(event_id: str, links: List['AccessLink']):
+        """
+        Hängt Einladungs-Links an ein Event an (bereits vorhandene Tokens werden
+        übersprungen): ein $push pro Link mit eigener $ne-Bedingung, damit ein
+        schon vorhandener Token die übrigen Links nicht blockiert
+        """
+        operations = [
+            UpdateOne(
+                {'id': event_id, 'access_links.token': {'$ne': link.token}},
+                {'$push': {'access_links': link.to_dict()}}
+            )
+            for link in links
+        ]
+        if operations:
+            # ordered: Reihenfolge bleibt erhalten, ein im selben Aufruf doppelter Token wird ebenfalls übersprungen
+            MongoDB.get_events_collection().bulk_write(operations, ordered=True)
+    
+    @staticmethod
+    def disable_access_links(event_id: str, user_id: str):
+        """Deaktiviert alle aktiven Links eines Teilnehmers (arrayFilters)"""
+        collection = MongoDB.get_events_collection()
+        collection.update_one(
+            {'id': event_id},
+            {'$set': {'access_links.$[link].disabled': True}},
+            array_filters=[{'link.user_id': user_id, 'link.disabled': False}]
+        )
+    
     @staticmethod
     def get_event_by_id(event_id: str) -> Optional['Event']:
         """Holt ein Event anhand der ID"""
@@ -220,6 +402,33 @@ class MongoDataManager:
             return Event.from_dict(doc)
         return None
     
+    @staticmethod
+    def get_recent_started_events(created_by: str, limit: int) -> List['Event']:
+        """Die letzten limit gestarteten Events eines Organisators (neueste zuerst, Index events_created_by_created_at_id)"""
+        from models import Event
+        
+        if limit <= 0:
+            return []
+        docs = MongoDB.get_events_collection().find(
+            {'created_by': created_by, 'is_started': True}, {'_id': 0}
+        ).sort([('created_at', DESCENDING), ('id', DESCENDING)]).limit(limit)
+        return [Event.from_dict(doc) for doc in docs]
+    
+    @staticmethod
+    def find_event_by_token(token: str) -> Optional['Event']:
+        """Findet das Event zu einem aktiven Link-Token (nutzt Index auf access_links.token)"""
+        from models import Event
+        
+        collection = MongoDB.get_events_collection()
+        doc = collection.find_one({
+            'access_links': {'$elemMatch': {'token': token, 'disabled': False}}
+        })
+        
+        if doc:
+            doc.pop('_id', None)
+            return Event.from_dict(doc)
+        return None
+    
     @staticmethod
     def delete_event(event_id: str):
         """Löscht ein Event"""
@@ -250,6 +459,126 @@ class MongoDataManager:
         events.sort(key=lambda e: e.created_at, reverse=True)
         
         return events
+    
+    @staticmethod
+    def get_event_summaries(user_id: str) -> List['EventSummary']:
+        """Zusammenfassungen aller Events eines Benutzers (Projektion + $size, neueste zuerst)"""
+        from models import EventSummary
+        
+        collection = MongoDB.get_events_collection()
+        docs = collection.aggregate([
+            {'$match': {'$or': [{'participant_ids': user_id}, {'created_by': user_id}]}},
+            {'$sort': {'created_at': -1, 'id': -1}},
+            SUMMARY_PROJECTION,
+        ])
+        return [EventSummary.from_dict(doc) for doc in docs]
+    
+    @staticmethod
+    def get_event_summaries_page(
+        user_id: str, limit: int, cursor: Optional['PageCursor'] = None
+    ) -> Tuple[List['EventSummary'], Optional['PageCursor']]:
+        """Eine Seite der Event-Zusammenfassungen (serverseitig sortiert, Cursor auf created_at/id)"""
+        from models import EventSummary
+        
+        match = {'$or': [{'participant_ids': user_id}, {'created_by': user_id}]}
+        if cursor is not None:
+            created_at, event_id = cursor
+            match = {'$and': [match, {'$or': [
+                {'created_at': {'$lt': created_at}},
+                {'created_at': created_at, 'id': {'$lt': event_id}},
+            ]}]}
+        
+        collection = MongoDB.get_events_collection()
+        docs = list(collection.aggregate([
+            {'$match': match},
+            {'$sort': {'created_at': -1, 'id': -1}},
+            {'$limit': limit + 1},
+            SUMMARY_PROJECTION,
+        ]))
+        page = [EventSummary.from_dict(doc) for doc in docs[:limit]]
+        next_cursor = (page[-1].created_at, page[-1].id) if len(docs) > limit else None
+        return page, next_cursor
+    
+    # Outbox: nicht gecacht, die Namen passen daher bewusst nicht zu den WRITE_PREFIXES
+    
+    @staticmethod
+    def enqueue_outbox_mails(mails: Iterable['OutboxMail']):
+        """Legt neue Mails in der Outbox ab"""
+        docs = [mail.to_dict() for mail in mails]
+        if docs:
+            MongoDB.get_outbox_collection().insert_many(docs, ordered=False)
+    
+    @staticmethod
+    def claim_outbox_mails(limit: int, lease_seconds: float) -> List['OutboxMail']:
+        """Least bis zu limit fällige Mails (find_one_and_update: atomar pro Mail, mehrere Worker möglich)"""
+        from models import OutboxMail, OUTBOX_PENDING, OUTBOX_SENDING
+        
+        now = time.time()
+        collection = MongoDB.get_outbox_collection()
+        claimable = {'$or': [
+            {'status': OUTBOX_PENDING, 'next_attempt_at': {'$lte': now}},
+            {'status': OUTBOX_SENDING, 'lease_until': {'$lt': now}},
+        ]}
+        claimed = []
+        for _ in range(limit):
+            doc = collection.find_one_and_update(
+                claimable,
+                {'$set': {'status': OUTBOX_SENDING, 'lease_until': now + lease_seconds}},
+                sort=[('next_attempt_at', ASCENDING), ('created_at', ASCENDING)],
+                projection={'_id': 0},
+                return_document=ReturnDocument.AFTER,
+            )
+            if doc is None:
+                break
+            claimed.append(OutboxMail.from_dict(doc))
+        return claimed
+    
+    @staticmethod
+    def finish_outbox_mails(mails: Iterable['OutboxMail']):
+        """Schreibt Status, Versuche und Fehler bearbeiteter Mails zurück (bulk_write)"""
+        operations = [
+            UpdateOne({'id': mail.id}, {'$set': {
+                'status': mail.status,
+                'attempts': mail.attempts,
+                'last_error': mail.last_error,
+                'next_attempt_at': mail.next_attempt_at,
+                'lease_until': mail.lease_until,
+                'sent_at': mail.sent_at,
+                'finished_at': mail.finished_at,
+                'body_html': mail.body_html,
+            }})
+            for mail in mails
+        ]
+        if operations:
+            MongoDB.get_outbox_collection().bulk_write(operations, ordered=False)
+    
+    @staticmethod
+    def get_outbox_progress(event_id: str) -> Dict[str, int]:
+        """Anzahl Mails eines Events pro Status"""
+        docs = MongoDB.get_outbox_collection().aggregate([
+            {'$match': {'event_id': event_id}},
+            {'$group': {'_id': '$status', 'count': {'$sum': 1}}},
+        ])
+        return {doc['_id']: doc['count'] for doc in docs}
+    
+    @staticmethod
+    def count_outbox_sent_since(since: float) -> int:
+        """Anzahl seit since (Epoch-Sekunden) versendeter Mails"""
+        from models import OUTBOX_SENT
+        
+        return MongoDB.get_outbox_collection().count_documents({'status': OUTBOX_SENT, 'sent_at': {'$gte': since}})
+    
+    @staticmethod
+    def prune_outbox_mails(before: float) -> int:
+        """Entfernt vor before (Epoch-Sekunden) abgeschlossene Mails und gibt ihre Anzahl zurück"""
+        from models import OUTBOX_SENT, OUTBOX_FAILED
+        
+        # $not/$gte trifft auch ältere Dokumente ohne finished_at bzw. sent_at
+        return MongoDB.get_outbox_collection().delete_many({
+            'status': {'$in': [OUTBOX_SENT, OUTBOX_FAILED]},
+            'finished_at': {'$not': {'$gte': before}},
+            'sent_at': {'$not': {'$gte': before}},
+        }).deleted_count
 
 
 # Hilfsfunktion für Migration von JSON zu MongoDB
@@ -347,30 +676,105 @@ def init_default_users():
         print(f"✅ {len(default_users)} Standard-Benutzer erstellt")
 
 
+def _plan_stages(plan: dict) -> List[str]:
+    """Sammelt die Stages eines Explain-Plans (z. B. FETCH -> IXSCAN)"""
+    stages = [plan.get('stage', '?')]
+    if 'inputStage' in plan:
+        stages += _plan_stages(plan['inputStage'])
+    for child in plan.get('inputStages', []):
+        stages += _plan_stages(child)
+    return stages
+
+
+def explain_queries(db: Database) -> List[str]:
+    """Führt Explain für die typischen Abfragen aus und liefert je eine Zeile mit den Plan-Stages"""
+    users = db[DatabaseConfig.USERS_COLLECTION]
+    events = db[DatabaseConfig.EVENTS_COLLECTION]
+    sample_user = users.find_one({}, {'id': 1, 'email': 1}) or {}
+    sample_event = events.find_one({}, {'id': 1, 'created_by': 1, 'access_links.token': 1}) or {}
+    user_id = sample_event.get('created_by') or sample_user.get('id', '')
+    token = next((link.get('token') for link in sample_event.get('access_links', [])), '')
+
+    queries = [
+        ("get_user_by_email", users, {'email': sample_user.get('email', '')}),
+        ("get_event_by_id / update_event", events, {'id': sample_event.get('id', '')}),
+        ("get_events_by_participant", events, {'$or': [{'participant_ids': user_id}, {'created_by': user_id}]}),
+        ("find_event_by_token", events, {'access_links': {'$elemMatch': {'token': token, 'disabled': False}}}),
+    ]
+
+    report = []
+    for label, collection, query in queries:
+        plan = collection.find(query).explain()['queryPlanner']['winningPlan']
+        stages = _plan_stages(plan)
+        status = "⚠️ COLLSCAN" if 'COLLSCAN' in stages else "✅"
+        report.append(f"{status} {label}: {' -> '.join(stages)}")
+    return report
+
+
+def check_indexes(create: bool = False):
+    """CLI: meldet fehlende Indizes und zeigt die Explain-Pläne der wichtigsten Abfragen"""
+    # Datenbank direkt holen, damit der automatische Index-Bootstrap das Ergebnis nicht verdeckt
+    db = MongoDB.get_client()[DatabaseConfig.DATABASE_NAME]
+    if create:
+        MongoDB.ensure_indexes(db)
+
+    missing = MongoDB.find_missing_indexes(db)
+    replaced = MongoDB.find_replaced_indexes(db)
+    print("🔎 Indizes:")
+    for collection_name, name in replaced:
+        print(f"   🗑️ veraltet: {collection_name}.{name}")
+    if missing:
+        for entry in missing:
+            print(f"   ❌ fehlt: {entry}")
+    if missing or replaced:
+        print("   💡 Anlegen/Aufräumen mit: python database.py --check-indexes --create")
+    if not missing:
+        print(f"   ✅ alle {len(INDEX_SPECS)} Indizes vorhanden")
+
+    print("\n🧭 Explain-Pläne:")
+    for line in explain_queries(db):
+        print(f"   {line}")
+
+
 if __name__ == "__main__":
-    # Test-Skript
-    print("🧪 Teste MongoDB-Verbindung...")
-    
-    try:
-        # Teste Verbindung
-        client = MongoDB.get_client()
-        client.admin.command('ping')
-        print("✅ MongoDB-Verbindung erfolgreich!")
-        
-        # Initialisiere Standard-Benutzer
-        init_default_users()
-        
-        # Zeige Statistiken
-        users = MongoDataManager.load_users()
-        events = MongoDataManager.load_events()
-        print(f"\n📊 Aktuelle Datenbank:")
-        print(f"   👥 Benutzer: {len(users)}")
-        print(f"   🎄 Events: {len(events)}")
-        
-    except Exception as e:
-        print(f"❌ Fehler: {e}")
-        print("\n💡 Stelle sicher, dass MongoDB läuft:")
-        print("   - Lokal: mongod")
-        print("   - Oder setze MONGODB_URI in .env")
-    finally:
-        MongoDB.close()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="MongoDB-Verbindung testen und Indizes prüfen")
+    parser.add_argument("--check-indexes", action="store_true", help="fehlende Indizes und Explain-Pläne anzeigen")
+    parser.add_argument("--create", action="store_true", help="mit --check-indexes: fehlende Indizes vorher anlegen")
+    args = parser.parse_args()
+
+    if args.check_indexes:
+        try:
+            check_indexes(create=args.create)
+        except Exception as e:
+            print(f"❌ Fehler: {e}")
+        finally:
+            MongoDB.close()
+    else:
+        # Test-Skript
+        print("🧪 Teste MongoDB-Verbindung...")
+        
+        try:
+            # Teste Verbindung
+            client = MongoDB.get_client()
+            client.admin.command('ping')
+            print("✅ MongoDB-Verbindung erfolgreich!")
+            
+            # Initialisiere Standard-Benutzer
+            init_default_users()
+            
+            # Zeige Statistiken
+            users = MongoDataManager.load_users()
+            events = MongoDataManager.load_events()
+            print(f"\n📊 Aktuelle Datenbank:")
+            print(f"   👥 Benutzer: {len(users)}")
+            print(f"   🎄 Events: {len(events)}")
+            
+        except Exception as e:
+            print(f"❌ Fehler: {e}")
+            print("\n💡 Stelle sicher, dass MongoDB läuft:")
+            print("   - Lokal: mongod")
+            print("   - Oder setze MONGODB_URI in .env")
+        finally:
+            MongoDB.close()
@@ -1,13 +1,17 @@
 """
 E-Mail-Versand fur die Wichtel-App
 """
+import html
 import os
+import re
 import smtplib
+from functools import lru_cache
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from models import Event, DataManager
 from link_service import LinkAuthService, build_invite_url
-from typing import List
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
 from dotenv import load_dotenv
 
 # Lade Umgebungsvariablen
@@ -23,11 +27,138 @@ class EmailConfig:
     SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
     SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
     APP_URL = os.getenv("APP_URL", "http://localhost:8501")
+    SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "30"))
+    # STARTTLS abschalten nur fur lokale Relays/Test-Server
+    SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+    # Danach wird die Verbindung erneuert (Gmail & Co. begrenzen Nachrichten pro Verbindung)
+    SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100"))
+    # Sprache der Benachrichtigungen (siehe language.LANGUAGES)
+    LANGUAGE = os.getenv("MAIL_LANGUAGE", "de")
+
+
+# Arten von Benachrichtigungen
+MAIL_EVENT_CREATED = "event_created"
+MAIL_EVENT_STARTED = "event_started"
+
+
+@dataclass
+class MailResult:
+    """Ergebnis fur einen Empfanger"""
+    email: str
+    ok: bool
+    error: str = ""
+    # Vorubergehender Fehler (4xx, Verbindungsabbruch, Timeout): erneuter Versuch sinnvoll
+    transient: bool = False
+
+
+class SMTPSession:
+    """
+    Wiederverwendbare, authentifizierte SMTP-Verbindung fur viele E-Mails
+
+    - STARTTLS und Login nur einmal pro Verbindung statt pro E-Mail
+    - Bricht die Verbindung ab, wird einmal neu verbunden und erneut gesendet
+    - Nach SMTP_MAX_MESSAGES_PER_CONNECTION E-Mails wird die Verbindung erneuert
+      (Provider begrenzen die Anzahl Nachrichten pro Verbindung)
+    - Schlagt der Login fehl, werden die restlichen E-Mails ohne weitere
+      Verbindungsversuche als fehlgeschlagen gemeldet
+
+    Verwendung:
+        with SMTPSession() as session:
+            for ...:
+                session.send(to_email, subject, body_html)
+    """
+
+    def __init__(self):
+        self._server: Optional[smtplib.SMTP] = None
+        self._sent_on_connection = 0
+        self._fatal_error: Optional[str] = None
+
+    def __enter__(self) -> 'SMTPSession':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _connect(self):
+        server = smtplib.SMTP(EmailConfig.SMTP_SERVER, EmailConfig.SMTP_PORT, timeout=EmailConfig.SMTP_TIMEOUT)
+        try:
+            if EmailConfig.SMTP_STARTTLS:
+                server.starttls()
+            server.login(EmailConfig.SENDER_EMAIL, EmailConfig.SENDER_PASSWORD)
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+        self._sent_on_connection = 0
+
+    @property
+    def broken(self) -> bool:
+        """True nach fehlgeschlagenem Login (die Session sendet nichts mehr)"""
+        return self._fatal_error is not None
+
+    def close(self):
+        """Beendet die Verbindung (Fehler beim QUIT werden ignoriert)"""
+        server, self._server = self._server, None
+        if server is not None:
+            try:
+                server.quit()
+            except (smtplib.SMTPException, OSError):
+                server.close()
+
+    def send(self, to_email: str, subject: str, body_html: str) -> MailResult:
+        """Sendet eine E-Mail uber die bestehende Verbindung (verbindet bei Bedarf neu)"""
+        if self._fatal_error is not None:
+            return MailResult(to_email, False, self._fatal_error)
+        message = build_message(to_email, subject, body_html)
+
+        for attempt in range(2):
+            try:
+                if self._server is None or self._sent_on_connection >= EmailConfig.SMTP_MAX_MESSAGES_PER_CONNECTION:
+                    self.close()
+                    self._connect()
+                self._server.send_message(message)
+                self._sent_on_connection += 1
+                return MailResult(to_email, True)
+            except smtplib.SMTPAuthenticationError as e:
+                self._fatal_error = f"Login fehlgeschlagen: {e}"
+                self.close()
+                return MailResult(to_email, False, self._fatal_error)
+            except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError) as e:
+                # Verbindung weg (Timeout, Server-Neustart): einmal neu verbinden
+                self.close()
+                if attempt == 1:
+                    return MailResult(to_email, False, str(e), transient=True)
+            except (smtplib.SMTPException, OSError) as e:
+                # Empfanger abgelehnt o. A.: betrifft nur diese E-Mail
+                if isinstance(e, OSError):
+                    self.close()
+                return MailResult(to_email, False, str(e), transient=_is_transient(e))
+        return MailResult(to_email, False, "Senden fehlgeschlagen", transient=True)
+
+
+def _is_transient(error: Exception) -> bool:
+    """4xx-Antworten, Timeouts und Netzwerkfehler sind vorubergehend, 5xx endgultig"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, OSError)
+
+
+def build_message(to_email: str, subject: str, body_html: str) -> MIMEMultipart:
+    """Baut die MIME-Nachricht fur eine HTML-E-Mail"""
+    message = MIMEMultipart("alternative")
+    message["Subject"] = subject
+    message["From"] = EmailConfig.SENDER_EMAIL
+    message["To"] = to_email
+    message.attach(MIMEText(body_html, "html"))
+    return message
 
 
 def send_email(to_email: str, subject: str, body_html: str) -> bool:
     """
-    Sendet eine E-Mail uber Gmail
+    Sendet eine einzelne E-Mail uber Gmail (eigene Verbindung)
+    Fur mehrere E-Mails SMTPSession bzw. send_bulk verwenden
     
     Args:
         to_email: Empfanger E-Mail-Adresse
@@ -37,40 +168,63 @@ def send_email(to_email: str, subject: str, body_html: str) -> bool:
     Returns:
         True wenn erfolgreich, False bei Fehler
     """
-    try:
-        # E-Mail erstellen
-        message = MIMEMultipart("alternative")
-        message["Subject"] = subject
-        message["From"] = EmailConfig.SENDER_EMAIL
-        message["To"] = to_email
-        
-        # HTML-Teil hinzufugen
-        html_part = MIMEText(body_html, "html")
-        message.attach(html_part)
-        
-        # Verbindung zu Gmail herstellen
-        with smtplib.SMTP(EmailConfig.SMTP_SERVER, EmailConfig.SMTP_PORT) as server:
-            server.starttls()
-            server.login(EmailConfig.SENDER_EMAIL, EmailConfig.SENDER_PASSWORD)
-            server.send_message(message)
-        
-        return True
-    except Exception as e:
-        print(f"Fehler beim E-Mail-Versand an {to_email}: {e}")
-        return False
+    with SMTPSession() as session:
+        result = session.send(to_email, subject, body_html)
+    if not result.ok:
+        print(f"Fehler beim E-Mail-Versand an {to_email}: {result.error}")
+    return result.ok
 
 
-def create_event_created_email(event_title: str, event_url: str) -> str:
-    """Erstellt HTML fur Event-Erstellungs-E-Mail"""
-    return f"""
+def send_bulk(messages: Iterable[Tuple[str, str, str]], session: Optional[SMTPSession] = None) -> List[MailResult]:
+    """
+    Sendet viele E-Mails (to_email, subject, body_html) uber eine gemeinsame Verbindung
+    
+    Args:
+        messages: Nachrichten als (Empfanger, Betreff, HTML)
+        session: bestehende SMTPSession (z. B. uber mehrere Events hinweg); sonst eigene
+    
+    Returns:
+        Ergebnis pro Empfanger in der Reihenfolge von messages
+    """
+    if session is None:
+        with SMTPSession() as own_session:
+            return send_bulk(messages, own_session)
+    results = []
+    for to_email, subject, body_html in messages:
+        result = session.send(to_email, subject, body_html)
+        if not result.ok:
+            print(f"Fehler beim E-Mail-Versand an {to_email}: {result.error}")
+        results.append(result)
+    return results
+
+
+# Farben und Texte pro E-Mail-Art (Texte kommen aus language.TRANSLATIONS)
+_EMAIL_THEMES = {
+    MAIL_EVENT_CREATED: {
+        'prefix': "email_invite",
+        'text_key': "email_invite_body_waiting",
+        'header_color': "#D32F2F", 'header_color_dark': "#E57373",  # Festive Red
+        'box': ("#2E7D32", "#4CAF50"), 'box_dark': ("#1B5E20", "#388E3C"),  # Green
+        'button': ("#D32F2F", "#E57373"), 'button_dark': ("#C62828", "#D32F2F"),  # Red
+    },
+    MAIL_EVENT_STARTED: {
+        'prefix': "email_started",
+        'text_key': "email_started_body_assignment",
+        'header_color': "#2E7D32", 'header_color_dark': "#4CAF50",  # Dark Green
+        'box': ("#D32F2F", "#E57373"), 'box_dark': ("#C62828", "#D32F2F"),  # Red
+        'button': ("#2E7D32", "#4CAF50"), 'button_dark': ("#1B5E20", "#388E3C"),  # Green
+    },
+}
+
+_EMAIL_PAGE = """
     <!DOCTYPE html>
-    <html>
+    <html lang="{lang}">
     <head>
         <meta charset="utf-8">
         <meta name="viewport" content="width=device-width, initial-scale=1">
         <meta name="color-scheme" content="light dark">
         <meta name="supported-color-schemes" content="light dark">
-        <title>Wichtel-Einladung!</title>
+        <title>{title}</title>
         <link href="https://fonts.googleapis.com/css2?family=Mountains+of+Christmas:wght@700&family=Roboto:wght@400;700&display=swap" rel="stylesheet">
         <style>
             body {{
@@ -96,19 +250,19 @@ def create_event_created_email(event_title: str, event_url: str) -> str:
             }}
             .header h1 {{
                 font-family: 'Mountains of Christmas', cursive;
-                color: #D32F2F; /* Festive Red */
+                color: {header_color};
                 font-size: 32px;
                 margin: 0;
             }}
-            .invitation-box {{
-                background: linear-gradient(135deg, #2E7D32 0%, #4CAF50 100%); /* Dark Green to Light Green */
+            .highlight-box {{
+                background: linear-gradient(135deg, {box[0]} 0%, {box[1]} 100%);
                 color: white;
                 padding: 20px;
                 border-radius: 10px;
                 margin-bottom: 20px;
                 text-align: center;
             }}
-            .invitation-box h2 {{
+            .highlight-box h2 {{
                 font-family: 'Mountains of Christmas', cursive;
                 margin: 0;
                 font-size: 24px;
@@ -118,7 +272,7 @@ def create_event_created_email(event_title: str, event_url: str) -> str:
                 margin: 30px 0;
             }}
             .button {{
-                background: linear-gradient(135deg, #D32F2F 0%, #E57373 100%); /* Festive Red to Light Red */
+                background: linear-gradient(135deg, {button[0]} 0%, {button[1]} 100%);
                 color: white !important;
                 padding: 15px 30px;
                 text-decoration: none;
@@ -146,13 +300,13 @@ def create_event_created_email(event_title: str, event_url: str) -> str:
                     border: 1px solid #3a3a3a;
                 }}
                 .header h1 {{
-                    color: #E57373; /* Lighter Red for Dark Mode */
+                    color: {header_color_dark};
                 }}
-                .invitation-box {{
-                    background: linear-gradient(135deg, #1B5E20 0%, #388E3C 100%); /* Darker Green for Dark Mode */
+                .highlight-box {{
+                    background: linear-gradient(135deg, {box_dark[0]} 0%, {box_dark[1]} 100%);
                 }}
                 .button {{
-                    background: linear-gradient(135deg, #C62828 0%, #D32F2F 100%); /* Darker Red for Dark Mode */
+                    background: linear-gradient(135deg, {button_dark[0]} 0%, {button_dark[1]} 100%);
                 }}
                 .footer {{
                     color: #bbb;
@@ -163,230 +317,198 @@ def create_event_created_email(event_title: str, event_url: str) -> str:
     <body>
         <div class="container">
             <div class="header">
-                <h1>Wichtel-Einladung!</h1>
+                <h1>{heading}</h1>
             </div>
             
-            <div class="invitation-box">
-                <h2>Du wurdest eingeladen!</h2>
+            <div class="highlight-box">
+                <h2>{subheading}</h2>
             </div>
             
-            <p>Hallo!</p>
+            <p>{hello}</p>
             
-            <p>Du wurdest zum Wichtel-Event <strong>"{event_title}"</strong> eingeladen!</p>
+            <p>{body_event}</p>
             
             <p>
-                Das Event wurde erstellt und wartet darauf, gestartet zu werden. 
-                Du erhältst eine weitere E-Mail, sobald die Wichtel-Zuweisungen erfolgt sind.
+                {body_text}
             </p>
             
             <div class="button-container">
                 <a href="{event_url}" class="button">
-                     Zum Event
+                     {button_label}
                 </a>
             </div>
             
             <p class="footer">
-                Frohe Weihnachten und viel Spaß beim Wichteln!
+                {footer}
             </p>
         </div>
     </body>
     </html>
     """
 
+# Platzhalter fur die Felder pro Empfanger, solange die Vorlage minifiziert wird
+_TITLE_MARK = "\x00event_title\x00"
+_URL_MARK = "\x00event_url\x00"
 
-def create_event_started_email(event_title: str, event_url: str) -> str:
-    """Erstellt HTML fur Event-Start-E-Mail"""
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1">
-        <meta name="color-scheme" content="light dark">
-        <meta name="supported-color-schemes" content="light dark">
-        <title>Dein Wichtel wartet!</title>
-        <link href="https://fonts.googleapis.com/css2?family=Mountains+of+Christmas:wght@700&family=Roboto:wght@400;700&display=swap" rel="stylesheet">
-        <style>
-            body {{
-                font-family: 'Roboto', sans-serif;
-                line-height: 1.6;
-                color: #333;
-                background-color: #f4f4f4;
-                margin: 0;
-                padding: 0;
-            }}
-            .container {{
-                max-width: 600px;
-                margin: 20px auto;
-                padding: 20px;
-                background-color: #ffffff;
-                border-radius: 10px;
-                box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-                border: 1px solid #e0e0e0;
-            }}
-            .header {{
-                text-align: center;
-                margin-bottom: 30px;
-            }}
-            .header h1 {{
-                font-family: 'Mountains of Christmas', cursive;
-                color: #2E7D32; /* Dark Green */
-                font-size: 32px;
-                margin: 0;
-            }}
-            .assignment-box {{
-                background: linear-gradient(135deg, #D32F2F 0%, #E57373 100%); /* Festive Red to Light Red */
-                color: white;
-                padding: 20px;
-                border-radius: 10px;
-                margin-bottom: 20px;
-                text-align: center;
-            }}
-            .assignment-box h2 {{
-                font-family: 'Mountains of Christmas', cursive;
-                margin: 0;
-                font-size: 24px;
-            }}
-            .button-container {{
-                text-align: center;
-                margin: 30px 0;
-            }}
-            .button {{
-                background: linear-gradient(135deg, #2E7D32 0%, #4CAF50 100%); /* Dark Green to Light Green */
-                color: white !important;
-                padding: 15px 30px;
-                text-decoration: none;
-                border-radius: 25px;
-                font-weight: bold;
-                display: inline-block;
-                font-size: 18px;
-            }}
-            .footer {{
-                font-size: 14px;
-                color: #666;
-                margin-top: 30px;
-                text-align: center;
-            }}
 
-            /* Dark Mode Styles */
-            @media (prefers-color-scheme: dark) {{
-                body {{
-                    background-color: #1a1a1a;
-                    color: #f4f4f4;
-                }}
-                .container {{
-                    background-color: #2d2d2d;
-                    box-shadow: 0 4px 8px rgba(0,0,0,0.3);
-                    border: 1px solid #3a3a3a;
-                }}
-                .header h1 {{
-                    color: #4CAF50; /* Lighter Green for Dark Mode */
-                }}
-                .assignment-box {{
-                    background: linear-gradient(135deg, #C62828 0%, #D32F2F 100%); /* Darker Red for Dark Mode */
-                }}
-                .button {{
-                    background: linear-gradient(135deg, #1B5E20 0%, #388E3C 100%); /* Darker Green for Dark Mode */
-                }}
-                .footer {{
-                    color: #bbb;
-                }}
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>Los geht's!</h1>
-            </div>
-            
-            <div class="assignment-box">
-                <h2>Die Wichtel wurden zugewiesen!</h2>
-            </div>
-            
-            <p>Hallo!</p>
-            
-            <p>Das Wichtel-Event <strong>"{event_title}"</strong> wurde gestartet!</p>
-            
-            <p>
-                Deine Wichtel-Zuweisung wartet auf dich. Klicke auf den Button unten, 
-                um zu erfahren, für wen du ein Geschenk besorgen darfst!
-            </p>
-            
-            <div class="button-container">
-                <a href="{event_url}" class="button">
-                     Meinen Wichtel zeigen!
-                </a>
-            </div>
-            
-            <p class="footer">
-                Viel Spaß beim Geschenke besorgen!
-            </p>
-        </div>
-    </body>
-    </html>
+def minify_html(source: str) -> str:
+    """Entfernt CSS-Kommentare und uberflussige Leerzeichen (Text bleibt gleich dargestellt)"""
+    def minify_css(match: re.Match) -> str:
+        css = re.sub(r"/\*.*?\*/", "", match.group(2), flags=re.S)
+        css = re.sub(r"\s+", " ", css)
+        css = re.sub(r"\s*([{};:,])\s*", r"\1", css).replace(";}", "}")
+        return match.group(1) + css.strip() + match.group(3)
+
+    html_source = re.sub(r"(<style[^>]*>)(.*?)(</style>)", minify_css, source, flags=re.S)
+    html_source = re.sub(r"\s+", " ", html_source)
+    html_source = re.sub(r">\s+<", "><", html_source)
+    return html_source.strip()
+
+
+class EmailTemplate:
+    """
+    Vorkompilierte E-Mail fur eine Sprache und Art: HTML und Betreff sind fertig
+    gerendert und minifiziert, pro Empfanger werden nur noch Event-Titel und
+    Einladungs-URL eingesetzt (ein %-Format statt Neuaufbau des ganzen HTML)
     """
+    __slots__ = ('lang', 'kind', '_subject', '_body')
+
+    def __init__(self, lang: str, kind: str, subject_format: str, body_format: str):
+        self.lang = lang
+        self.kind = kind
+        self._subject = subject_format
+        self._body = body_format
+
+    def render(self, event_title: str, event_url: str) -> Tuple[str, str]:
+        """(Betreff, HTML) fur einen Empfanger"""
+        fields = {
+            'event_title': html.escape(event_title),
+            'event_url': html.escape(event_url),
+        }
+        return self._subject % {'event_title': event_title}, self._body % fields
+
+
+@lru_cache(maxsize=None)
+def get_email_template(lang: str, kind: str) -> EmailTemplate:
+    """Kompiliert die Vorlage einmal pro (Sprache, Art) und liefert sie danach aus dem Cache"""
+    from language import TRANSLATIONS
 
+    theme = _EMAIL_THEMES.get(kind)
+    if theme is None:
+        raise ValueError(f"Unbekannte E-Mail-Art: {kind!r}")
+    if lang not in TRANSLATIONS:
+        lang = "de"  # wie get_translator: Fallback auf Deutsch
+    texts = TRANSLATIONS[lang]
+    prefix = theme['prefix']
+    page = _EMAIL_PAGE.format(
+        lang=lang,
+        title=texts[f"{prefix}_title"],
+        heading=texts[f"{prefix}_heading"],
+        subheading=texts[f"{prefix}_subheading"],
+        hello=texts[f"{prefix}_body_hello"],
+        body_event=texts[f"{prefix}_body_event"].format(event_title=_TITLE_MARK),
+        body_text=texts[theme['text_key']],
+        button_label=texts[f"{prefix}_button"],
+        footer=texts[f"{prefix}_footer"],
+        event_url=_URL_MARK,
+        **theme,
+    )
+    body_format = (
+        minify_html(page).replace("%", "%%")
+        .replace(_TITLE_MARK, "%(event_title)s").replace(_URL_MARK, "%(event_url)s")
+    )
+    subject_format = texts[f"{prefix}_subject"].replace("%", "%%").format(event_title="%(event_title)s")
+    return EmailTemplate(lang, kind, subject_format, body_format)
 
-def send_event_created_emails(event: Event, app_url: str = None) -> List[str]:
+
+def create_event_created_email(event_title: str, event_url: str, lang: str = None) -> str:
+    """Erstellt HTML fur Event-Erstellungs-E-Mail"""
+    return get_email_template(lang or EmailConfig.LANGUAGE, MAIL_EVENT_CREATED).render(event_title, event_url)[1]
+
+
+def create_event_started_email(event_title: str, event_url: str, lang: str = None) -> str:
+    """Erstellt HTML fur Event-Start-E-Mail"""
+    return get_email_template(lang or EmailConfig.LANGUAGE, MAIL_EVENT_STARTED).render(event_title, event_url)[1]
+
+
+def send_event_created_emails(event: Event, app_url: str = None, session: Optional[SMTPSession] = None) -> List[str]:
     """
     Sendet E-Mails an alle Teilnehmer nach Event-Erstellung
     
     Args:
         event: Das erstellte Event
         app_url: URL zur Streamlit-App (optional, wird aus Config geladen wenn nicht angegeben)
+        session: bestehende SMTPSession (optional)
     
     Returns:
         Liste der E-Mail-Adressen, an die erfolgreich versendet wurde
     """
-    if app_url is None:
-        app_url = EmailConfig.APP_URL
-    event = LinkAuthService.ensure_links_for_event(event)
-    
-    users = DataManager.load_users()
-    successful_emails = []
-    
-    for participant_id in event.participant_ids:
-        user = users.get(participant_id)
-        if user:
-            link = LinkAuthService.get_or_create_link(event, participant_id)
-            invite_url = build_invite_url(link.token, app_url)
-            subject = f" Einladung zum Wichtel-Event: {event.title}"
-            body = create_event_created_email(event.title, invite_url)
-            
-            if send_email(user.email, subject, body):
-                successful_emails.append(user.email)
-    
-    return successful_emails
+    results = send_event_emails(event, MAIL_EVENT_CREATED, app_url, session)
+    return [result.email for result in results if result.ok]
 
 
-def send_event_started_emails(event: Event, app_url: str = None) -> List[str]:
+def send_event_started_emails(event: Event, app_url: str = None, session: Optional[SMTPSession] = None) -> List[str]:
     """
     Sendet E-Mails an alle Teilnehmer nach Event-Start
     
     Args:
         event: Das gestartete Event
         app_url: URL zur Streamlit-App (optional, wird aus Config geladen wenn nicht angegeben)
+        session: bestehende SMTPSession (optional)
     
     Returns:
         Liste der E-Mail-Adressen, an die erfolgreich versendet wurde
     """
+    results = send_event_emails(event, MAIL_EVENT_STARTED, app_url, session)
+    return [result.email for result in results if result.ok]
+
+
+def send_event_emails(
+    event: Event, kind: str, app_url: str = None, session: Optional[SMTPSession] = None
+) -> List[MailResult]:
+    """
+    Sendet die Benachrichtigung kind (MAIL_EVENT_CREATED / MAIL_EVENT_STARTED) an alle
+    Teilnehmer und wartet auf das Ergebnis. Mit session nacheinander uber diese
+    Verbindung, sonst uber den Dispatcher (parallel, mit Rate-Limit und Wiederholungen)
+    
+    Returns:
+        Ergebnis pro Empfanger
+    """
+    if session is not None:
+        return send_bulk(build_event_emails(event, kind, app_url), session)
+    return queue_event_emails(event, kind, app_url).results()
+
+
+def queue_event_emails(event: Event, kind: str, app_url: str = None):
+    """
+    Reiht die Benachrichtigungen eines Events beim Dispatcher ein und kehrt sofort
+    zuruck (z. B. aus einem Streamlit-Button-Handler)
+    
+    Returns:
+        mail_dispatch.MailBatch mit Fortschritt und Ergebnissen
+    """
+    from mail_dispatch import get_dispatcher
+    
+    return get_dispatcher().dispatch(build_event_emails(event, kind, app_url))
+
+
+def build_event_emails(
+    event: Event, kind: str, app_url: str = None, lang: str = None
+) -> List[Tuple[str, str, str]]:
+    """Nachrichten (Empfanger, Betreff, HTML) fur alle Teilnehmer eines Events"""
+    template = get_email_template(lang or EmailConfig.LANGUAGE, kind)
     if app_url is None:
         app_url = EmailConfig.APP_URL
     
     event = LinkAuthService.ensure_links_for_event(event)
-    users = DataManager.load_users()
-    successful_emails = []
+    users = DataManager.get_users_by_ids(event.participant_ids)
+    messages = []
     
     for participant_id in event.participant_ids:
         user = users.get(participant_id)
         if user:
             link = LinkAuthService.get_or_create_link(event, participant_id)
-            invite_url = build_invite_url(link.token, app_url)
-            subject = f" Dein Wichtel wartet auf dich: {event.title}"
-            body = create_event_started_email(event.title, invite_url)
-            
-            if send_email(user.email, subject, body):
-                successful_emails.append(user.email)
+            subject, body = template.render(event.title, build_invite_url(link.token, app_url))
+            messages.append((user.email, subject, body))
     
-    return successful_emails
+    return messages
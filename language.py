@@ -80,9 +80,11 @@ TRANSLATIONS = {
         "no_events_yet": "Noch keine Events vorhanden.",
         "participants": "{count} Teilnehmer",
         "gift_value": "Wert: {value}",
+        "gifts_per_person_count": "{count} Geschenke pro Person",
         "started": "Gestartet",
         "waiting": "Wartet",
         "open_event": "Event öffnen",
+        "load_more_events": "Weitere Events laden",
         "delete_button": "Löschen",
         "confirm_delete_event": "Event '{title}' wirklich löschen?",
         "yes_delete": "Ja, löschen",
@@ -102,7 +104,18 @@ TRANSLATIONS = {
         "logged_in_via_invite": "Angemeldet über Einladungslink.",
         "event_not_started": "Das Event wurde noch nicht gestartet.",
         "start_assignments": "Wichtel-Zuweisungen starten",
-        "assignments_sent": "Zuweisungen erstellt und Mails versendet.",
+        "assignments_sent": "Zuweisungen erstellt, die Mails werden im Hintergrund versendet.",
+        "exclusion_groups": "Ausschlussgruppen (z. B. Paare, Haushalte)",
+        "exclusion_groups_info": "Teilnehmer einer Gruppe beschenken sich nicht gegenseitig.",
+        "new_exclusion_group": "Neue Gruppe",
+        "add_exclusion_group": "Gruppe hinzufügen",
+        "remove_exclusion_group": "Entfernen",
+        "exclusion_group_too_small": "Eine Gruppe braucht mindestens zwei Teilnehmer.",
+        "assignment_infeasible": "Mit diesen Ausschlussgruppen ist keine Zuweisung möglich: {reason}",
+        "gifts_per_person": "Geschenke pro Person",
+        "mail_progress": "{sent} von {total} Benachrichtigungen versendet",
+        "mail_progress_failed": "{count} Benachrichtigungen konnten nicht zugestellt werden.",
+        "gifts_per_person_info": "Jeder beschenkt so viele verschiedene Teilnehmer und bekommt ebenso viele Geschenke.",
         "show_my_wichtel": "Meinen Wichtel anzeigen",
         "you_wichtel_for": "Du wichtelst für:",
         "event_information": "Event Informationen",
@@ -114,6 +127,7 @@ TRANSLATIONS = {
         "link_refreshed": "Link erneuert.",
         "logout_button": "Abmelden",
         "email_invite_subject": "Einladung zum Wichtel-Event: {event_title}",
+        "email_invite_title": "Wichtel-Einladung!",
         "email_invite_heading": "Wichtel-Einladung!",
         "email_invite_subheading": "Du wurdest eingeladen!",
         "email_invite_body_hello": "Hallo!",
@@ -122,6 +136,7 @@ TRANSLATIONS = {
         "email_invite_button": "Zum Event",
         "email_invite_footer": "Frohe Weihnachten und viel Spaß beim Wichteln!",
         "email_started_subject": "Dein Wichtel wartet auf dich: {event_title}",
+        "email_started_title": "Dein Wichtel wartet!",
         "email_started_heading": "Los geht's!",
         "email_started_subheading": "Die Wichtel wurden zugewiesen!",
         "email_started_body_hello": "Hallo!",
@@ -163,9 +178,11 @@ TRANSLATIONS = {
         "no_events_yet": "No events available yet.",
         "participants": "{count} participants",
         "gift_value": "Value: {value}",
+        "gifts_per_person_count": "{count} gifts per person",
         "started": "Started",
         "waiting": "Waiting",
         "open_event": "Open Event",
+        "load_more_events": "Load more events",
         "delete_button": "Delete",
         "confirm_delete_event": "Really delete event '{title}'?",
         "yes_delete": "Yes, delete",
@@ -185,7 +202,18 @@ TRANSLATIONS = {
         "logged_in_via_invite": "Logged in via invite link.",
         "event_not_started": "The event has not started yet.",
         "start_assignments": "Start Secret Santa Assignments",
-        "assignments_sent": "Assignments created and emails sent.",
+        "assignments_sent": "Assignments created, emails are being sent in the background.",
+        "exclusion_groups": "Exclusion groups (e.g. couples, households)",
+        "exclusion_groups_info": "Members of a group will not be assigned to each other.",
+        "new_exclusion_group": "New group",
+        "add_exclusion_group": "Add group",
+        "remove_exclusion_group": "Remove",
+        "exclusion_group_too_small": "A group needs at least two participants.",
+        "assignment_infeasible": "No assignment is possible with these exclusion groups: {reason}",
+        "gifts_per_person": "Gifts per person",
+        "mail_progress": "{sent} of {total} notifications sent",
+        "mail_progress_failed": "{count} notifications could not be delivered.",
+        "gifts_per_person_info": "Everyone gives to this many different participants and receives as many gifts.",
         "show_my_wichtel": "Show my Secret Santa",
         "you_wichtel_for": "You are Secret Santa for:",
         "event_information": "Event Information",
@@ -197,6 +225,7 @@ TRANSLATIONS = {
         "link_refreshed": "Link refreshed.",
         "logout_button": "Logout",
         "email_invite_subject": "Invitation to Secret Santa Event: {event_title}",
+        "email_invite_title": "Secret Santa Invitation!",
         "email_invite_heading": "Secret Santa Invitation!",
         "email_invite_subheading": "You have been invited!",
         "email_invite_body_hello": "Hello!",
@@ -205,6 +234,7 @@ TRANSLATIONS = {
         "email_invite_button": "To the Event",
         "email_invite_footer": "Merry Christmas and have fun with Secret Santa!",
         "email_started_subject": "Your Secret Santa is waiting for you: {event_title}",
+        "email_started_title": "Your Secret Santa is waiting!",
         "email_started_heading": "Let's go!",
         "email_started_subheading": "The Secret Santas have been assigned!",
         "email_started_body_hello": "Hello!",
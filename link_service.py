@@ -4,7 +4,7 @@ Service fr Magic-Link Authentifizierung der Teilnehmer
 import os
 import uuid
 from datetime import datetime
-from typing import Optional, Tuple
+from typing import Iterable, List, Optional, Tuple
 
 from models import Event, AccessLink, DataManager
 
@@ -29,32 +29,36 @@ class LinkAuthService:
         """
         Stellt sicher, dass alle Teilnehmer einen Link haben
         """
-        changed = False
-        existing_user_ids = {link.user_id for link in event.access_links if not link.disabled}
+        new_links = LinkAuthService.add_missing_links(event)
 
-        for participant_id in event.participant_ids:
-            if participant_id not in existing_user_ids:
-                event.access_links.append(
-                    AccessLink(
-                        token=LinkAuthService._generate_token(),
-                        user_id=participant_id,
-                        created_at=datetime.now().isoformat(),
-                        disabled=False
-                    )
-                )
-                changed = True
-
-        if changed:
-            LinkAuthService._persist_event(event)
+        if new_links:
+            LinkAuthService._persist_link_changes(event, added=new_links)
 
         return event
 
+    @staticmethod
+    def add_missing_links(event: Event) -> List[AccessLink]:
+        """
+        Legt fehlende Links nur im Event-Objekt an (ohne zu speichern),
+        z. B. damit sie mit einem Sammel-Schreibvorgang persistiert werden
+        """
+        new_links = []
+        for participant_id in event.participant_ids:
+            if not event.active_links_for(participant_id):
+                link = AccessLink(
+                    token=LinkAuthService._generate_token(),
+                    user_id=participant_id,
+                    created_at=datetime.now().isoformat(),
+                    disabled=False
+                )
+                event.add_access_link(link)
+                new_links.append(link)
+        return new_links
+
     @staticmethod
     def get_link_for_user(event: Event, user_id: str) -> Optional[AccessLink]:
-        for link in event.access_links:
-            if link.user_id == user_id and not link.disabled:
-                return link
-        return None
+        links = event.active_links_for(user_id)
+        return links[0] if links else None
 
     @staticmethod
     def get_or_create_link(event: Event, user_id: str) -> AccessLink:
@@ -66,8 +70,8 @@ class LinkAuthService:
                 created_at=datetime.now().isoformat(),
                 disabled=False
             )
-            event.access_links.append(link)
-            LinkAuthService._persist_event(event)
+            event.add_access_link(link)
+            LinkAuthService._persist_link_changes(event, added=[link])
         return link
 
     @staticmethod
@@ -75,9 +79,7 @@ class LinkAuthService:
         """
         Deaktiviert vorhandene Links und erstellt einen neuen
         """
-        for link in event.access_links:
-            if link.user_id == user_id:
-                link.disabled = True
+        event.disable_links_for(user_id)
 
         new_link = AccessLink(
             token=LinkAuthService._generate_token(),
@@ -85,32 +87,52 @@ class LinkAuthService:
             created_at=datetime.now().isoformat(),
             disabled=False
         )
-        event.access_links.append(new_link)
-        LinkAuthService._persist_event(event)
+        event.add_access_link(new_link)
+        LinkAuthService._persist_link_changes(event, added=[new_link], disabled_user_ids=[user_id])
         return new_link
 
     @staticmethod
     def disable_link(event: Event, user_id: str):
-        changed = False
-        for link in event.access_links:
-            if link.user_id == user_id and not link.disabled:
-                link.disabled = True
-                changed = True
-        if changed:
-            LinkAuthService._persist_event(event)
+        if event.disable_links_for(user_id):
+            LinkAuthService._persist_link_changes(event, disabled_user_ids=[user_id])
 
     @staticmethod
     def resolve_token(token: str) -> Optional[Tuple[Event, AccessLink]]:
         """
         Findet Event + Link zu einem Token
         """
-        events = DataManager.load_events()
-        for event in events.values():
+        try:
+            # Indizierte Suche (JSON-Token-Index bzw. MongoDB-Index)
+            event = DataManager.find_event_by_token(token)
+            candidates = [event] if event else []
+        except AttributeError:
+            candidates = DataManager.load_events().values()
+
+        for event in candidates:
             for link in event.access_links:
                 if not link.disabled and link.token == token:
                     return event, link
         return None
 
+    @staticmethod
+    def _persist_link_changes(
+        event: Event,
+        added: Iterable[AccessLink] = (),
+        disabled_user_ids: Iterable[str] = (),
+    ):
+        """
+        Schreibt nur die geänderten Links, wenn das Backend gezielte Updates kann,
+        sonst das komplette Event
+        """
+        added = list(added)
+        try:
+            for user_id in disabled_user_ids:
+                DataManager.disable_access_links(event.id, user_id)
+            if added:
+                DataManager.add_access_links(event.id, added)
+        except AttributeError:
+            LinkAuthService._persist_event(event)
+
     @staticmethod
     def _persist_event(event: Event):
         try:
@@ -0,0 +1,228 @@
+"""
+Nebenläufiger Mailversand für die Wichtel-App
+Ein Thread-Pool versendet die Nachrichten im Hintergrund (jeder Worker mit
+eigener SMTPSession), ein Token-Bucket pro Minute und pro Tag hält die
+Provider-Limits ein (das Tageslimit zählt nach einem Neustart die in den letzten
+24 Stunden aus der Outbox versendeten Mails mit), vorübergehende Fehler werden
+mit exponentiellem Backoff wiederholt
+"""
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from email_service import MailResult, SMTPSession
+from models import DataManager
+
+DAY_SECONDS = 86400
+
+
+class MailDispatchConfig:
+    """Einstellungen des Versands (Standardwerte orientieren sich an Gmail)"""
+    CONCURRENCY = int(os.getenv("MAIL_CONCURRENCY", "4"))
+    # 0 = unbegrenzt; Gmail erlaubt privaten Konten ca. 500 Empfänger pro Tag
+    RATE_PER_MINUTE = int(os.getenv("MAIL_RATE_PER_MINUTE", "60"))
+    RATE_PER_DAY = int(os.getenv("MAIL_RATE_PER_DAY", "500"))
+    MAX_RETRIES = int(os.getenv("MAIL_MAX_RETRIES", "4"))
+    BACKOFF_BASE_SECONDS = float(os.getenv("MAIL_BACKOFF_BASE_SECONDS", "2"))
+    BACKOFF_MAX_SECONDS = float(os.getenv("MAIL_BACKOFF_MAX_SECONDS", "120"))
+
+
+class TokenBucket:
+    """
+    Thread-sicherer Token-Bucket: bis zu capacity Sendungen sofort, danach
+    rate Tokens pro Sekunde. tokens ist der Anfangsstand (Standard: voll; negativ,
+    wenn schon mehr als capacity verbraucht wurde)
+    """
+
+    def __init__(self, rate: float, capacity: float, tokens: Optional[float] = None):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("Rate und Kapazität müssen positiv sein")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity if tokens is None else min(capacity, tokens)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> float:
+        """Nimmt ein Token und gibt 0 zurück, sonst die Wartezeit bis zum nächsten Token"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def available(self) -> int:
+        """Anzahl Sendungen, die sofort möglich sind"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(0, int(self._tokens))
+
+    def acquire(self):
+        """Blockiert, bis ein Token verfügbar ist"""
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            time.sleep(wait)
+
+
+class RateLimiter:
+    """
+    Kombiniert die Limits pro Minute und pro Tag (0 = kein Limit); sent_last_day
+    Sendungen der letzten 24 Stunden sind vom Tageslimit schon abgezogen
+    """
+
+    def __init__(self, per_minute: int = 0, per_day: int = 0, sent_last_day: int = 0):
+        self.buckets = []
+        if per_minute:
+            self.buckets.append(TokenBucket(per_minute / 60.0, per_minute))
+        if per_day:
+            self.buckets.append(TokenBucket(per_day / DAY_SECONDS, per_day, per_day - sent_last_day))
+
+    def acquire(self):
+        for bucket in self.buckets:
+            bucket.acquire()
+
+    def available(self) -> Optional[int]:
+        """Sofort mögliche Sendungen (None = unbegrenzt)"""
+        return min((bucket.available() for bucket in self.buckets), default=None)
+
+
+class MailBatch:
+    """Fortschritt und Ergebnisse einer eingereihten Menge von E-Mails"""
+
+    def __init__(self, futures: List[Future]):
+        self.futures = futures
+
+    @property
+    def total(self) -> int:
+        return len(self.futures)
+
+    @property
+    def done(self) -> int:
+        return sum(1 for future in self.futures if future.done())
+
+    @property
+    def finished(self) -> bool:
+        return all(future.done() for future in self.futures)
+
+    def results(self, timeout: Optional[float] = None) -> List[MailResult]:
+        """Wartet auf alle E-Mails und gibt das Ergebnis pro Empfänger zurück"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        return [
+            future.result(None if deadline is None else max(0.0, deadline - time.monotonic()))
+            for future in self.futures
+        ]
+
+
+class MailDispatcher:
+    """
+    Versendet E-Mails im Hintergrund
+
+    - concurrency Worker-Threads, jeder mit eigener SMTPSession (Verbindung wird
+      über viele E-Mails hinweg wiederverwendet)
+    - jede Sendung (auch Wiederholungen) verbraucht ein Token des RateLimiter;
+      ein übergebener limiter wird mit anderen Dispatchern geteilt
+    - vorübergehende Fehler (MailResult.transient) werden bis zu max_retries-mal
+      nach base * 2^n Sekunden (mit Jitter, höchstens backoff_max) wiederholt
+    """
+
+    def __init__(
+        self,
+        concurrency: int = MailDispatchConfig.CONCURRENCY,
+        per_minute: int = MailDispatchConfig.RATE_PER_MINUTE,
+        per_day: int = MailDispatchConfig.RATE_PER_DAY,
+        max_retries: int = MailDispatchConfig.MAX_RETRIES,
+        backoff_base: float = MailDispatchConfig.BACKOFF_BASE_SECONDS,
+        backoff_max: float = MailDispatchConfig.BACKOFF_MAX_SECONDS,
+        session_factory: Callable[[], SMTPSession] = SMTPSession,
+        sent_last_day: int = 0,
+        limiter: Optional[RateLimiter] = None,
+    ):
+        self.limiter = limiter if limiter is not None else RateLimiter(per_minute, per_day, sent_last_day)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._session_factory = session_factory
+        self._pool = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="mail")
+        self._local = threading.local()
+        self._sessions: List[SMTPSession] = []
+        self._sessions_lock = threading.Lock()
+        # Neue Batches dürfen nach einem fehlgeschlagenen Login wieder eine Session aufbauen
+        self._generation = 0
+
+    def _session(self) -> SMTPSession:
+        session = getattr(self._local, 'session', None)
+        if session is None or (session.broken and self._local.generation != self._generation):
+            session = self._session_factory()
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        self._local.generation = self._generation
+        return session
+
+    def backoff_delay(self, attempt: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    def _deliver(self, to_email: str, subject: str, body_html: str) -> MailResult:
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            result = self._session().send(to_email, subject, body_html)
+            if result.ok or not result.transient or attempt >= self.max_retries:
+                if not result.ok:
+                    print(f"Fehler beim E-Mail-Versand an {to_email}: {result.error}")
+                return result
+            time.sleep(self.backoff_delay(attempt))
+            attempt += 1
+
+    def submit(self, to_email: str, subject: str, body_html: str) -> Future:
+        """Reiht eine E-Mail ein; das Future liefert ein MailResult"""
+        return self._pool.submit(self._deliver, to_email, subject, body_html)
+
+    def dispatch(self, messages: Iterable[Tuple[str, str, str]]) -> MailBatch:
+        """Reiht viele E-Mails (Empfänger, Betreff, HTML) ein und kehrt sofort zurück"""
+        self._generation += 1
+        return MailBatch([self.submit(*message) for message in messages])
+
+    def shutdown(self, wait: bool = True):
+        """Wartet (optional) auf alle E-Mails und schließt die Verbindungen"""
+        self._pool.shutdown(wait=wait)
+        if not wait:
+            return  # laufende Sendungen nutzen ihre Verbindung noch
+        with self._sessions_lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+
+
+_dispatcher: Optional[MailDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def sent_last_day() -> int:
+    """In den letzten 24 Stunden über die Outbox versendete Mails (auch von früheren Prozessen)"""
+    if not MailDispatchConfig.RATE_PER_DAY:
+        return 0
+    try:
+        return DataManager.count_outbox_sent_since(time.time() - DAY_SECONDS)
+    except AttributeError:
+        return 0  # Backend ohne Outbox-Zählung
+
+
+def get_dispatcher() -> MailDispatcher:
+    """Gemeinsamer Dispatcher des Prozesses (Limits gelten für alle Events zusammen)"""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = MailDispatcher(sent_last_day=sent_last_day())
+        return _dispatcher
@@ -5,11 +5,25 @@ Unterstützt sowohl MongoDB als auch JSON-Files
 import json
 import uuid
 import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Optional, Dict
-from dataclasses import dataclass, asdict, field
+from typing import List, Optional, Dict, Tuple, Iterable, Iterator
+from collections.abc import MutableMapping
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from config import USERS_FILE, EVENTS_FILE
+try:
+    import fcntl  # Dateisperren für Journal und Outbox (POSIX)
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+from config import (
+    USERS_FILE, EVENTS_FILE, LINK_INDEX_FILE, EVENT_SUMMARIES_FILE, EVENT_OFFSETS_FILE,
+    EVENTS_DIR, EVENTS_MANIFEST_FILE,
+    JOURNAL_FILE, JOURNAL_COMPACT_THRESHOLD, OUTBOX_FILE, OUTBOX_DONE_FILE,
+    DATA_CACHE_TTL_SECONDS, DATA_CACHE_MAX_ENTRIES,
+)
 try:
     import tomllib  # Python 3.11+
 except ImportError:  # pragma: no cover
@@ -73,6 +87,89 @@ _load_local_secrets()
 _load_dotenv_file()
 
 
+# Zuweisungen und Links existieren einmal pro Teilnehmer: mit __slots__ entfällt das
+# __dict__ jeder Instanz (dataclass(slots=True) gibt es erst ab Python 3.10)
+_SLOTTED = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+# Codec-Schicht für alle JSON-Dateien (Snapshot, Shards, Indizes, Journal)
+class StdlibJSONCodec:
+    """Standardbibliothek, kompakte Ausgabe ohne Einrückung"""
+    name = "json"
+
+    @staticmethod
+    def dumps(data) -> bytes:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    @staticmethod
+    def loads(raw: bytes):
+        return json.loads(raw)
+
+
+class OrjsonCodec:
+    """orjson (optional, pip install orjson)"""
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self.dumps = orjson.dumps
+        self.loads = orjson.loads  # orjson.JSONDecodeError ist ein ValueError
+
+
+class MsgspecCodec:
+    """msgspec (optional, pip install msgspec)"""
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+        self._decode_error = msgspec.DecodeError
+        self.dumps = msgspec.json.Encoder().encode
+        self._decoder = msgspec.json.Decoder()
+
+    def loads(self, raw: bytes):
+        try:
+            return self._decoder.decode(raw)
+        except self._decode_error as e:
+            # Wie bei json/orjson: beschädigte Daten melden sich als ValueError
+            raise ValueError(str(e)) from e
+
+
+def _select_json_codec(name: str):
+    """
+    Wählt den Codec über JSON_CODEC: "auto" (orjson, dann msgspec, sonst json),
+    "orjson", "msgspec" oder "json"; fehlt die gewünschte Bibliothek, wird json verwendet
+    """
+    candidates = {
+        "auto": (OrjsonCodec, MsgspecCodec),
+        "orjson": (OrjsonCodec,),
+        "msgspec": (MsgspecCodec,),
+    }.get(name, ())
+    for codec_class in candidates:
+        try:
+            return codec_class()
+        except ImportError:
+            if name != "auto":
+                print(f" JSON-Codec '{name}' nicht installiert - Fallback auf json")
+    return StdlibJSONCodec()
+
+
+JSON_CODEC = _select_json_codec(os.getenv("JSON_CODEC", "auto").lower())
+
+
+def _read_json(path: str):
+    """Liest eine JSON-Datei mit dem aktiven Codec (FileNotFoundError/ValueError wie bisher)"""
+    with open(path, 'rb') as f:
+        return JSON_CODEC.loads(f.read())
+
+
+def _write_json(path: str, data, durable: bool = False):
+    with open(path, 'wb') as f:
+        f.write(JSON_CODEC.dumps(data))
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+
+
 @dataclass
 class User:
     """Benutzer-Modell"""
@@ -85,16 +182,31 @@ class User:
     
     @classmethod
     def from_dict(cls, data: dict):
-        # Setze Standardwerte für neue Felder, falls sie fehlen
-        data = data.copy()
-        if 'is_admin' not in data:
-            data['is_admin'] = False
-        if 'password_changed' not in data:
-            data['password_changed'] = False
-        return cls(**data)
+        # Standardwerte für neue Felder, falls sie fehlen; unbekannte Felder werden ignoriert
+        return cls(
+            id=data['id'],
+            name=data['name'],
+            email=data['email'],
+            password=data['password'],
+            is_admin=data.get('is_admin', False),
+            password_changed=data.get('password_changed', False),
+        )
 
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'name': self.name,
+            'email': self.email,
+            'password': self.password,
+            'is_admin': self.is_admin,
+            'password_changed': self.password_changed,
+        }
 
-@dataclass
+    def copy(self) -> 'User':
+        return replace(self)
+
+
+@dataclass(**_SLOTTED)
 class Assignment:
     """Wichtel-Zuweisung"""
     giver_id: str
@@ -103,10 +215,13 @@ class Assignment:
     
     @classmethod
     def from_dict(cls, data: dict):
-        return cls(**data)
+        return cls(data['giver_id'], data['receiver_id'], data.get('revealed', False))
 
+    def to_dict(self) -> dict:
+        return {'giver_id': self.giver_id, 'receiver_id': self.receiver_id, 'revealed': self.revealed}
 
-@dataclass
+
+@dataclass(**_SLOTTED)
 class AccessLink:
     """Einladungs-Link für Teilnehmer"""
     token: str
@@ -116,11 +231,27 @@ class AccessLink:
 
     @classmethod
     def from_dict(cls, data: dict):
-        return cls(**data)
+        return cls(data['token'], data['user_id'], data['created_at'], data.get('disabled', False))
 
+    def to_dict(self) -> dict:
+        return {
+            'token': self.token,
+            'user_id': self.user_id,
+            'created_at': self.created_at,
+            'disabled': self.disabled,
+        }
 
-@dataclass
-class Event:
+
+class _EventIndexSlots:
+    """
+    Speicherplatz der Lookup-Indizes von Event außerhalb der Dataclass-Felder:
+    so tauchen sie weder in fields()/asdict() noch in __init__ oder __eq__ auf
+    """
+    __slots__ = ('_giver_index', '_link_index')
+
+
+@dataclass(**_SLOTTED)
+class Event(_EventIndexSlots):
     """Wichtel-Event"""
     id: str
     title: str
@@ -131,27 +262,361 @@ class Event:
     access_links: List[AccessLink] = field(default_factory=list)
     is_started: bool = False
     gift_value: str = ""
+    # Gruppen (Paare, Haushalte), innerhalb derer sich niemand beschenkt
+    exclusion_groups: List[List[str]] = field(default_factory=list)
+    # Anzahl Beschenkte pro Person (jeder bekommt ebenso viele Geschenke)
+    gifts_per_person: int = 1
+
+    def __post_init__(self):
+        # Lazy aufgebaute Lookup-Indizes (nicht persistiert), jeweils (Liste, Länge, Index)
+        self._giver_index: Optional[tuple] = None
+        self._link_index: Optional[tuple] = None
     
     @classmethod
     def from_dict(cls, data: dict):
-        # Entferne veraltete Felder für Abwärtskompatibilität
-        data = data.copy()
-        data.pop('is_revealed', None)
-        
-        data['assignments'] = [Assignment.from_dict(a) for a in data.get('assignments', [])]
-        data['access_links'] = [AccessLink.from_dict(link) for link in data.get('access_links', [])]
-        
-        # Setze Standardwert für neues Feld
-        if 'gift_value' not in data:
-            data['gift_value'] = ""
-            
-        return cls(**data)
+        # Veraltete Felder (z. B. is_revealed) werden ignoriert, neue Felder erhalten Standardwerte.
+        # Listen werden immer neu aufgebaut, das Event teilt also keinen Zustand mit data.
+        return cls(
+            id=data['id'],
+            title=data['title'],
+            created_by=data['created_by'],
+            created_at=data['created_at'],
+            participant_ids=list(data.get('participant_ids', [])),
+            assignments=[Assignment.from_dict(a) for a in data.get('assignments', [])],
+            access_links=[AccessLink.from_dict(link) for link in data.get('access_links', [])],
+            is_started=data.get('is_started', False),
+            gift_value=data.get('gift_value', ""),
+            exclusion_groups=[list(group) for group in data.get('exclusion_groups', [])],
+            gifts_per_person=data.get('gifts_per_person', 1),
+        )
     
-    def to_dict(self):
-        result = asdict(self)
-        result['assignments'] = [asdict(a) for a in self.assignments]
-        result['access_links'] = [asdict(link) for link in self.access_links]
-        return result
+    def to_dict(self) -> dict:
+        # Handgeschrieben statt dataclasses.asdict (kein rekursives deepcopy)
+        return {
+            'id': self.id,
+            'title': self.title,
+            'created_by': self.created_by,
+            'created_at': self.created_at,
+            'participant_ids': list(self.participant_ids),
+            'assignments': [a.to_dict() for a in self.assignments],
+            'access_links': [link.to_dict() for link in self.access_links],
+            'is_started': self.is_started,
+            'gift_value': self.gift_value,
+            'exclusion_groups': [list(group) for group in self.exclusion_groups],
+            'gifts_per_person': self.gifts_per_person,
+        }
+
+    def copy(self) -> 'Event':
+        """Unabhängige Kopie: Listen, Zuweisungen und Links werden neu aufgebaut (Indizes lazy)"""
+        return Event(
+            id=self.id,
+            title=self.title,
+            created_by=self.created_by,
+            created_at=self.created_at,
+            participant_ids=list(self.participant_ids),
+            assignments=[Assignment(a.giver_id, a.receiver_id, a.revealed) for a in self.assignments],
+            access_links=[
+                AccessLink(link.token, link.user_id, link.created_at, link.disabled) for link in self.access_links
+            ],
+            is_started=self.is_started,
+            gift_value=self.gift_value,
+            exclusion_groups=[list(group) for group in self.exclusion_groups],
+            gifts_per_person=self.gifts_per_person,
+        )
+
+    # Die Indizes gelten als veraltet, sobald die Liste ersetzt oder in der Länge verändert
+    # wurde; geänderte oder überschriebene Einträge fängt die Prüfung jedes Treffers ab.
+    # Neue Einträge deshalb anhängen (add_access_link) oder die Liste neu zuweisen.
+
+    def _giver_positions(self, rebuild: bool = False) -> Dict[str, List[int]]:
+        cached = self._giver_index
+        if rebuild or cached is None or cached[0] is not self.assignments or cached[1] != len(self.assignments):
+            positions = {}
+            for position, assignment in enumerate(self.assignments):
+                positions.setdefault(assignment.giver_id, []).append(position)
+            cached = self._giver_index = (self.assignments, len(self.assignments), positions)
+        return cached[2]
+
+    def _link_positions(self, rebuild: bool = False) -> Dict[str, List[int]]:
+        cached = self._link_index
+        if rebuild or cached is None or cached[0] is not self.access_links or cached[1] != len(self.access_links):
+            positions = {}
+            for position, link in enumerate(self.access_links):
+                if not link.disabled:
+                    positions.setdefault(link.user_id, []).append(position)
+            cached = self._link_index = (self.access_links, len(self.access_links), positions)
+        return cached[2]
+
+    def assignment_for(self, giver_id: str) -> Optional[Assignment]:
+        """Erste Zuweisung eines Schenkenden (O(1) über den Giver-Index)"""
+        assignments = self.assignments_for(giver_id)
+        return assignments[0] if assignments else None
+
+    def assignments_for(self, giver_id: str) -> List[Assignment]:
+        """Alle Zuweisungen eines Schenkenden (gifts_per_person Stück, O(k) über den Giver-Index)"""
+        for rebuild in (False, True):
+            assignments = [self.assignments[position] for position in self._giver_positions(rebuild).get(giver_id, ())]
+            if all(assignment.giver_id == giver_id for assignment in assignments):
+                break
+        return assignments
+
+    def active_links_for(self, user_id: str) -> List[AccessLink]:
+        """Aktive Links eines Teilnehmers in Listenreihenfolge (O(1) über den Link-Index)"""
+        for rebuild in (False, True):
+            links = [self.access_links[position] for position in self._link_positions(rebuild).get(user_id, ())]
+            if all(link.user_id == user_id and not link.disabled for link in links):
+                break
+        return links
+
+    def add_access_link(self, link: AccessLink):
+        """Hängt einen Link an und führt den Link-Index mit"""
+        positions = self._link_positions()
+        self.access_links.append(link)
+        if not link.disabled:
+            positions.setdefault(link.user_id, []).append(len(self.access_links) - 1)
+        self._link_index = (self.access_links, len(self.access_links), positions)
+
+    def disable_links_for(self, user_id: str) -> List[AccessLink]:
+        """Deaktiviert alle aktiven Links eines Teilnehmers und gibt sie zurück"""
+        links = self.active_links_for(user_id)
+        for link in links:
+            link.disabled = True
+        self._link_positions().pop(user_id, None)
+        return links
+
+
+@dataclass
+class EventSummary:
+    """Leichtgewichtige Event-Sicht für Listen (ohne Zuweisungen und Links)"""
+    id: str
+    title: str
+    created_by: str
+    created_at: str
+    participant_count: int
+    is_started: bool = False
+    gift_value: str = ""
+    gifts_per_person: int = 1
+
+    @classmethod
+    def from_event(cls, event: Event):
+        return cls(
+            id=event.id,
+            title=event.title,
+            created_by=event.created_by,
+            created_at=event.created_at,
+            participant_count=len(event.participant_ids),
+            is_started=event.is_started,
+            gift_value=event.gift_value,
+            gifts_per_person=event.gifts_per_person,
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(**data)
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'title': self.title,
+            'created_by': self.created_by,
+            'created_at': self.created_at,
+            'participant_count': self.participant_count,
+            'is_started': self.is_started,
+            'gift_value': self.gift_value,
+            'gifts_per_person': self.gifts_per_person,
+        }
+
+    def copy(self) -> 'EventSummary':
+        return replace(self)
+
+
+# Status einer Outbox-Mail: pending -> sending (geleast) -> sent / failed (bzw. zurück auf pending)
+OUTBOX_PENDING = "pending"
+OUTBOX_SENDING = "sending"
+OUTBOX_SENT = "sent"
+OUTBOX_FAILED = "failed"
+
+
+@dataclass(**_SLOTTED)
+class OutboxMail:
+    """Eine Benachrichtigung in der Outbox (dauerhaft gespeichert, bis sie versendet ist)"""
+    id: str
+    event_id: str
+    kind: str
+    to_email: str
+    subject: str
+    body_html: str
+    created_at: str
+    status: str = OUTBOX_PENDING
+    attempts: int = 0
+    last_error: str = ""
+    # Epoch-Sekunden: frühester nächster Versuch bzw. Ende des Leases eines Workers
+    next_attempt_at: float = 0.0
+    lease_until: float = 0.0
+    # Epoch-Sekunden des erfolgreichen Versands (Grundlage des Tageslimits nach einem Neustart)
+    sent_at: float = 0.0
+    # Epoch-Sekunden, seit denen die Mail abgeschlossen ist (sent/failed); danach wird sie aufgeräumt
+    finished_at: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(
+            id=data['id'],
+            event_id=data['event_id'],
+            kind=data['kind'],
+            to_email=data['to_email'],
+            subject=data['subject'],
+            body_html=data.get('body_html', ""),
+            created_at=data['created_at'],
+            status=data.get('status', OUTBOX_PENDING),
+            attempts=data.get('attempts', 0),
+            last_error=data.get('last_error', ""),
+            next_attempt_at=data.get('next_attempt_at', 0.0),
+            lease_until=data.get('lease_until', 0.0),
+            sent_at=data.get('sent_at', 0.0),
+            finished_at=data.get('finished_at', 0.0),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'event_id': self.event_id,
+            'kind': self.kind,
+            'to_email': self.to_email,
+            'subject': self.subject,
+            'body_html': self.body_html,
+            'created_at': self.created_at,
+            'status': self.status,
+            'attempts': self.attempts,
+            'last_error': self.last_error,
+            'next_attempt_at': self.next_attempt_at,
+            'lease_until': self.lease_until,
+            'sent_at': self.sent_at,
+            'finished_at': self.finished_at,
+        }
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (OUTBOX_SENT, OUTBOX_FAILED)
+
+    def expired(self, before: float) -> bool:
+        """Abgeschlossen vor before (ältere Einträge ohne finished_at zählen über sent_at)"""
+        return self.finished and max(self.finished_at, self.sent_at) < before
+
+    def claimable(self, now: float) -> bool:
+        """Fällig und frei: wartend und fällig, oder geleast mit abgelaufenem Lease (Worker abgestürzt)"""
+        if self.status == OUTBOX_PENDING:
+            return self.next_attempt_at <= now
+        return self.status == OUTBOX_SENDING and self.lease_until < now
+
+
+# Cursor für die seitenweise Event-Übersicht: (created_at, id) des letzten Eintrags
+PageCursor = Tuple[str, str]
+
+
+def _summary_sort_key(summary) -> PageCursor:
+    if isinstance(summary, dict):
+        return summary['created_at'], summary['id']
+    return summary.created_at, summary.id
+
+
+def paginate_summaries(
+    summaries: List[EventSummary], limit: int, cursor: Optional[PageCursor] = None, presorted: bool = False
+) -> Tuple[List[EventSummary], Optional[PageCursor]]:
+    """
+    Liefert eine Seite (neueste zuerst, Tie-Break über id) und den Cursor für die nächste Seite
+    presorted=True: Liste ist bereits absteigend nach (created_at, id) sortiert (Binärsuche statt Sortierung)
+    """
+    if not presorted:
+        summaries = sorted(summaries, key=_summary_sort_key, reverse=True)
+    start = 0
+    if cursor is not None:
+        cursor = tuple(cursor)
+        low, high = 0, len(summaries)
+        while low < high:
+            mid = (low + high) // 2
+            if _summary_sort_key(summaries[mid]) >= cursor:
+                low = mid + 1
+            else:
+                high = mid
+        start = low
+    page = summaries[start:start + limit]
+    has_more = start + limit < len(summaries)
+    return page, (_summary_sort_key(page[-1]) if page and has_more else None)
+
+
+class _SortedSummaryView:
+    """Sequenz-Sicht auf die vorsortierten Event-IDs eines Benutzers (lädt Zusammenfassungen erst bei Zugriff)"""
+
+    def __init__(self, index: dict, event_ids: List[str]):
+        self._index = index
+        self._event_ids = event_ids
+
+    def __len__(self) -> int:
+        return len(self._event_ids)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [EventSummary.from_dict(self._index['events'][eid]) for eid in self._event_ids[position]]
+        return self._index['events'][self._event_ids[position]]
+
+
+def _build_summary_index(events: Iterable[Event]) -> dict:
+    """
+    Baut {'events': Event-ID -> Zusammenfassung, 'by_user': User-ID -> Event-IDs}
+    Die Listen in 'by_user' sind absteigend nach (created_at, id) sortiert
+    """
+    index = {'events': {}, 'by_user': {}}
+    for event in events:
+        _add_to_summary_index(index, event)
+    _sort_summary_index(index, index['by_user'].keys())
+    return index
+
+
+def _sort_summary_index(index: dict, user_ids: Iterable[str]):
+    for user_id in user_ids:
+        if user_id in index['by_user']:
+            index['by_user'][user_id].sort(
+                key=lambda eid: _summary_sort_key(index['events'][eid]), reverse=True
+            )
+
+
+def _add_to_summary_index(index: dict, event: Event):
+    index['events'][event.id] = EventSummary.from_event(event).to_dict()
+    for user_id in dict.fromkeys([event.created_by, *event.participant_ids]):
+        index['by_user'].setdefault(user_id, []).append(event.id)
+
+
+def _remove_from_summary_index(index: dict, event_ids: set):
+    for event_id in event_ids:
+        index['events'].pop(event_id, None)
+    for user_id in list(index['by_user']):
+        remaining = [eid for eid in index['by_user'][user_id] if eid not in event_ids]
+        if remaining:
+            index['by_user'][user_id] = remaining
+        else:
+            del index['by_user'][user_id]
+
+
+def _summaries_for_user(index: dict, user_id: str) -> List[EventSummary]:
+    return [
+        EventSummary.from_dict(index['events'][eid])
+        for eid in index['by_user'].get(user_id, [])
+        if eid in index['events']
+    ]
+
+
+def _summary_page_for_user(
+    index: dict, user_id: str, limit: int, cursor: Optional[PageCursor]
+) -> Tuple[List[EventSummary], Optional[PageCursor]]:
+    view = _SortedSummaryView(index, index['by_user'].get(user_id, []))
+    return paginate_summaries(view, limit, cursor, presorted=True)
+
+
+def _recent_started_ids(summaries: Iterable[EventSummary], created_by: str, limit: int) -> List[str]:
+    """IDs der letzten limit gestarteten Events eines Organisators (Zusammenfassungen neueste zuerst)"""
+    ids = [summary.id for summary in summaries if summary.created_by == created_by and summary.is_started]
+    return ids[:max(0, limit)]
 
 
 # JSON-basierter DataManager (Fallback)
@@ -162,18 +627,21 @@ class JSONDataManager:
     def load_users() -> Dict[str, User]:
         """Lädt Benutzer aus JSON-Datei"""
         try:
-            with open(USERS_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return {uid: User.from_dict(user_data) for uid, user_data in data.items()}
+            data = _read_json(USERS_FILE)
+            return {uid: User.from_dict(user_data) for uid, user_data in data.items()}
         except FileNotFoundError:
             return {}
     
     @staticmethod
     def save_users(users: Dict[str, User]):
         """Speichert Benutzer in JSON-Datei"""
-        data = {uid: asdict(user) for uid, user in users.items()}
-        with open(USERS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        _write_json(USERS_FILE, {uid: user.to_dict() for uid, user in users.items()})
+    
+    @staticmethod
+    def get_users_by_ids(user_ids: Iterable[str]) -> Dict[str, User]:
+        """Lädt nur die angegebenen Benutzer (fehlende IDs werden ausgelassen)"""
+        users = JSONDataManager.load_users()
+        return {uid: users[uid] for uid in dict.fromkeys(user_ids) if uid in users}
     
     @staticmethod
     def update_user(user: User):
@@ -211,18 +679,136 @@ class JSONDataManager:
     def load_events() -> Dict[str, Event]:
         """Lädt Events aus JSON-Datei"""
         try:
-            with open(EVENTS_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return {eid: Event.from_dict(event_data) for eid, event_data in data.items()}
+            data = _read_json(EVENTS_FILE)
+            return {eid: Event.from_dict(event_data) for eid, event_data in data.items()}
         except FileNotFoundError:
             return {}
     
     @staticmethod
     def save_events(events: Dict[str, Event]):
-        """Speichert Events in JSON-Datei"""
-        data = {eid: event.to_dict() for eid, event in events.items()}
-        with open(EVENTS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        """Speichert Events in JSON-Datei (plus Offset-, Token- und Zusammenfassungs-Index)"""
+        offsets = _write_events_file({eid: event.to_dict() for eid, event in events.items()})
+        JSONDataManager._save_event_offsets(offsets)
+        JSONDataManager._save_link_index(JSONDataManager._build_link_index(events.values()))
+        _atomic_write_json(EVENT_SUMMARIES_FILE, _build_summary_index(events.values()))
+    
+    @staticmethod
+    def update_events(events: Iterable[Event]):
+        """Schreibt mehrere Events mit einem einzigen Speichervorgang"""
+        stored = JSONDataManager.load_events()
+        stored.update((event.id, event) for event in events)
+        JSONDataManager.save_events(stored)
+    
+    @staticmethod
+    def get_event_by_id(event_id: str) -> Optional[Event]:
+        """
+        Holt ein Event anhand der ID: über den Offset-Index wird nur dieses Event
+        aus events.json gelesen und dekodiert. Passt der Index nicht zur Datei
+        (fehlt, oder events.json wurde von außen geändert), wird wie bisher die
+        ganze Datei geladen
+        """
+        try:
+            index = _read_json(EVENT_OFFSETS_FILE)
+            stat = os.stat(EVENTS_FILE)
+            if [stat.st_size, stat.st_mtime_ns] == index['file']:
+                entry = index['offsets'].get(event_id)
+                if entry is None:
+                    return None
+                with open(EVENTS_FILE, 'rb') as f:
+                    f.seek(entry[0])
+                    data = JSON_CODEC.loads(f.read(entry[1]))
+                if data.get('id') == event_id:
+                    return Event.from_dict(data)
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            pass
+        return JSONDataManager.load_events().get(event_id)
+    
+    @staticmethod
+    def _save_event_offsets(offsets: Dict[str, Tuple[int, int]]):
+        """Speichert den Offset-Index zusammen mit Größe und mtime der gerade geschriebenen events.json"""
+        stat = os.stat(EVENTS_FILE)
+        _write_json(EVENT_OFFSETS_FILE, {'file': [stat.st_size, stat.st_mtime_ns], 'offsets': offsets})
+    
+    @staticmethod
+    def get_recent_started_events(created_by: str, limit: int) -> List[Event]:
+        """Die letzten limit gestarteten Events eines Organisators (neueste zuerst), z. B. für die Paar-Historie"""
+        ids = _recent_started_ids(JSONDataManager.get_event_summaries(created_by), created_by, limit)
+        events = JSONDataManager.load_events() if ids else {}
+        return [events[event_id] for event_id in ids if event_id in events]
+    
+    @staticmethod
+    def find_event_by_token(token: str) -> Optional[Event]:
+        """
+        Findet das Event zu einem aktiven Link-Token über den Token-Index; das Event
+        selbst liest get_event_by_id über den Offset-Index, ohne die ganze events.json
+        zu dekodieren. Der Token-Index (links_index.json) wird dabei weiterhin ganz
+        gelesen und wächst mit der Zahl aktiver Links
+        """
+        index = JSONDataManager._load_link_index()
+        entry = index.get(token)
+        if entry is None:
+            return None
+        event = JSONDataManager.get_event_by_id(entry[0])
+        if event is None:
+            return None
+        for link in event.access_links:
+            if link.token == token and not link.disabled:
+                return event
+        return None
+    
+    @staticmethod
+    def _build_link_index(events) -> Dict[str, Tuple[str, str]]:
+        """Baut den Index Token -> (Event-ID, User-ID) für aktive Links"""
+        return {
+            link.token: (event.id, link.user_id)
+            for event in events
+            for link in event.access_links
+            if not link.disabled
+        }
+    
+    @staticmethod
+    def _save_link_index(index: Dict[str, Tuple[str, str]]):
+        _write_json(LINK_INDEX_FILE, index)
+    
+    @staticmethod
+    def _load_link_index() -> Dict[str, Tuple[str, str]]:
+        """Lädt den Token-Index (siehe _load_sidecar)"""
+        return JSONDataManager._load_sidecar(LINK_INDEX_FILE, JSONDataManager._build_link_index)
+    
+    @staticmethod
+    def _load_sidecar(path: str, build):
+        """
+        Lädt eine Index-Datei neben events.json; fehlt sie oder ist sie älter als
+        events.json (z. B. nach manueller Bearbeitung), wird sie neu aufgebaut
+        """
+        try:
+            if os.path.getmtime(path) >= os.path.getmtime(EVENTS_FILE):
+                return _read_json(path)
+        except (FileNotFoundError, ValueError):
+            pass
+        data = build(JSONDataManager.load_events().values())
+        if os.path.exists(EVENTS_FILE):
+            _atomic_write_json(path, data)
+        return data
+    
+    @staticmethod
+    def get_event_summaries(user_id: str) -> List[EventSummary]:
+        """Zusammenfassungen aller Events eines Benutzers (neueste zuerst) aus dem vorberechneten Index"""
+        index = JSONDataManager._load_sidecar(EVENT_SUMMARIES_FILE, _build_summary_index)
+        return _summaries_for_user(index, user_id)
+    
+    @staticmethod
+    def get_event_summaries_page(
+        user_id: str, limit: int, cursor: Optional[PageCursor] = None
+    ) -> Tuple[List[EventSummary], Optional[PageCursor]]:
+        """Eine Seite der Event-Zusammenfassungen (Binärsuche im vorsortierten Index)"""
+        index = JSONDataManager._load_sidecar(EVENT_SUMMARIES_FILE, _build_summary_index)
+        return _summary_page_for_user(index, user_id, limit, cursor)
+    
+    @staticmethod
+    def storage_fingerprint() -> Tuple:
+        """Änderungsstand der JSON-Dateien (für Cache-Validierung über Prozesse hinweg)"""
+        return _stat_fingerprint(USERS_FILE, EVENTS_FILE)
     
     @staticmethod
     def get_user_by_email(email: str) -> Optional[User]:
@@ -240,10 +826,908 @@ class JSONDataManager:
         if user and user.password == password:
             return user
         return None
+    
+    # Outbox (gilt für alle JSON-Layouts). Die Namen passen bewusst nicht zu den
+    # WRITE_PREFIXES des Caches: die Outbox wird nicht gecacht und soll ihn nicht leeren.
+    
+    @staticmethod
+    def enqueue_outbox_mails(mails: Iterable[OutboxMail]):
+        """Legt neue Mails in der Outbox ab"""
+        with JSONOutbox.locked():
+            outbox = JSONOutbox.load()
+            outbox.update((mail.id, mail.to_dict()) for mail in mails)
+            JSONOutbox.save(outbox)
+    
+    @staticmethod
+    def claim_outbox_mails(limit: int, lease_seconds: float) -> List[OutboxMail]:
+        """Least bis zu limit fällige Mails (älteste zuerst) für lease_seconds"""
+        now = time.time()
+        with JSONOutbox.locked():
+            outbox = JSONOutbox.load()
+            # Abgeschlossene Mails aus älteren Versionen einmalig ins Log verschieben
+            archived = JSONOutbox.archive_finished(outbox)
+            due = sorted(
+                (mail for mail in map(OutboxMail.from_dict, outbox.values()) if mail.claimable(now)),
+                key=lambda mail: (mail.next_attempt_at, mail.created_at),
+            )[:limit]
+            for mail in due:
+                mail.status = OUTBOX_SENDING
+                mail.lease_until = now + lease_seconds
+                outbox[mail.id] = mail.to_dict()
+            if due or archived:
+                JSONOutbox.save(outbox)
+        return due
+    
+    @staticmethod
+    def finish_outbox_mails(mails: Iterable[OutboxMail]):
+        """Schreibt Status, Versuche und Fehler bearbeiteter Mails zurück (abgeschlossene ins Log)"""
+        with JSONOutbox.locked():
+            outbox = JSONOutbox.load()
+            for mail in mails:
+                if mail.id in outbox:
+                    outbox[mail.id] = mail.to_dict()
+            JSONOutbox.archive_finished(outbox)
+            JSONOutbox.save(outbox)
+    
+    @staticmethod
+    def get_outbox_progress(event_id: str) -> Dict[str, int]:
+        """Anzahl Mails eines Events pro Status (offene und noch nicht aufgeräumte abgeschlossene)"""
+        counts: Dict[str, int] = {}
+        for data in JSONOutbox.entries():
+            if data['event_id'] == event_id:
+                counts[data['status']] = counts.get(data['status'], 0) + 1
+        return counts
+    
+    @staticmethod
+    def count_outbox_sent_since(since: float) -> int:
+        """Anzahl seit since (Epoch-Sekunden) versendeter Mails"""
+        return sum(
+            1 for data in JSONOutbox.entries()
+            if data['status'] == OUTBOX_SENT and data.get('sent_at', 0.0) >= since
+        )
+    
+    @staticmethod
+    def prune_outbox_mails(before: float) -> int:
+        """Entfernt vor before (Epoch-Sekunden) abgeschlossene Mails und gibt ihre Anzahl zurück"""
+        with JSONOutbox.locked():
+            done = JSONOutbox.load_done()
+            kept = [data for data in done if not OutboxMail.from_dict(data).expired(before)]
+            if len(kept) < len(done):
+                JSONOutbox.save_done(kept)
+        return len(done) - len(kept)
+
+
+class JSONOutbox:
+    """
+    Outbox-Dateien für die JSON-Backends: outbox.json (ID -> Mail) hält nur offene
+    Mails, abgeschlossene werden an outbox_done.jsonl angehängt. Claims und
+    Ergebnisse schreiben so nur die offenen Mails neu, das Log wird erst beim
+    Aufräumen (prune_outbox_mails) umgeschrieben. Schreibzugriffe laufen unter
+    einer Datei-Sperre, damit App und Worker-Prozess sich nicht gegenseitig überschreiben
+    """
+    _lock = threading.RLock()
+
+    @classmethod
+    @contextmanager
+    def locked(cls):
+        with cls._lock:
+            lock_file = None
+            if fcntl is not None:
+                lock_file = open(f"{OUTBOX_FILE}.lock", 'a')
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if lock_file is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    lock_file.close()
+
+    @staticmethod
+    def load() -> Dict[str, dict]:
+        try:
+            return _read_json(OUTBOX_FILE)
+        except FileNotFoundError:
+            return {}
+
+    @staticmethod
+    def save(outbox: Dict[str, dict]):
+        _atomic_write_json(OUTBOX_FILE, outbox)
+
+    @staticmethod
+    def load_done() -> List[dict]:
+        """Abgeschlossene Mails aus dem Log (abgebrochene oder gerade geschriebene Zeilen werden übersprungen)"""
+        done = []
+        try:
+            with open(OUTBOX_DONE_FILE, 'rb') as f:
+                for line in f:
+                    try:
+                        done.append(JSON_CODEC.loads(line))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            pass
+        return done
+
+    @staticmethod
+    def save_done(done: List[dict]):
+        tmp_path = f"{OUTBOX_DONE_FILE}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(b''.join(JSON_CODEC.dumps(data) + b'\n' for data in done))
+        os.replace(tmp_path, OUTBOX_DONE_FILE)
+
+    @staticmethod
+    def archive_finished(outbox: Dict[str, dict]) -> int:
+        """Verschiebt abgeschlossene Mails aus outbox (in place) ans Log; nur unter locked() aufrufen"""
+        finished = [mail_id for mail_id, data in outbox.items() if data['status'] in (OUTBOX_SENT, OUTBOX_FAILED)]
+        if finished:
+            # Erst anhängen, dann (beim Aufrufer) outbox.json speichern: ein Absturz dazwischen
+            # hinterlässt die Mail höchstens doppelt, zählt sie aber nie zu wenig
+            with open(OUTBOX_DONE_FILE, 'ab') as f:
+                f.write(b''.join(JSON_CODEC.dumps(outbox.pop(mail_id)) + b'\n' for mail_id in finished))
+        return len(finished)
+
+    @staticmethod
+    def entries() -> Iterator[dict]:
+        """Offene und abgeschlossene Mails"""
+        yield from JSONOutbox.load().values()
+        yield from JSONOutbox.load_done()
+
+
+def _stat_fingerprint(*paths: str) -> Tuple:
+    """(mtime, Größe) je Pfad, None für fehlende Dateien"""
+    fingerprint = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            fingerprint.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            fingerprint.append(None)
+    return tuple(fingerprint)
+
+
+def _write_events_file(events: Dict[str, dict]) -> Dict[str, Tuple[int, int]]:
+    """
+    Schreibt events.json im selben Format wie _write_json (kompaktes Objekt
+    ID -> Event), kodiert aber jedes Event einzeln und gibt Offset und Länge
+    pro Event zurück, damit get_event_by_id ein Event allein lesen kann
+    """
+    offsets = {}
+    parts = [b'{']
+    position = 1
+    for number, (event_id, data) in enumerate(events.items()):
+        key = (b',' if number else b'') + JSON_CODEC.dumps(event_id) + b':'
+        value = JSON_CODEC.dumps(data)
+        offsets[event_id] = (position + len(key), len(value))
+        position += len(key) + len(value)
+        parts += (key, value)
+    parts.append(b'}')
+    with open(EVENTS_FILE, 'wb') as f:
+        f.write(b''.join(parts))
+    return offsets
+
+
+def _atomic_write_json(path: str, data, durable: bool = False):
+    """
+    Schreibt JSON über eine temporäre Datei + os.replace (nie halb geschriebene Files)
+    durable=True: Datei vor und Verzeichnis nach dem Umbenennen per fsync sichern
+    (übersteht auch einen Stromausfall, z. B. vor dem Kürzen des Journals)
+    """
+    tmp_path = f"{path}.tmp"
+    _write_json(tmp_path, data, durable)
+    os.replace(tmp_path, path)
+    if durable:
+        _fsync_directory(path)
+
+
+def _fsync_directory(path: str):
+    """Sichert den Verzeichniseintrag von path (auf Plattformen ohne Verzeichnis-fsync ein No-op)"""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class LazyEventMap(MutableMapping):
+    """
+    Dict-artige Sicht auf die Event-Shards
+    Die Event-IDs kommen aus dem Manifest, die Events selbst werden erst beim
+    ersten Zugriff gelesen. Merkt sich geladene/gesetzte und entfernte Events,
+    damit save_events nur diese Shards schreiben muss.
+    """
+
+    def __init__(self, event_ids: Iterable[str]):
+        self._ids: Dict[str, None] = dict.fromkeys(event_ids)
+        self._loaded: Dict[str, Event] = {}
+        self._removed = set()
+
+    def __getitem__(self, event_id: str) -> Event:
+        if event_id not in self._ids:
+            raise KeyError(event_id)
+        event = self._loaded.get(event_id)
+        if event is None:
+            event = ShardedJSONDataManager._read_shard(event_id)
+            if event is None:
+                raise KeyError(event_id)
+            self._loaded[event_id] = event
+        return event
+
+    def __setitem__(self, event_id: str, event: Event):
+        self._ids[event_id] = None
+        self._loaded[event_id] = event
+        self._removed.discard(event_id)
+
+    def __delitem__(self, event_id: str):
+        del self._ids[event_id]
+        self._loaded.pop(event_id, None)
+        self._removed.add(event_id)
+
+    def __iter__(self):
+        return iter(list(self._ids))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def copy(self) -> 'LazyEventMap':
+        clone = LazyEventMap(self._ids)
+        # Geladene Events werden mitkopiert, die Kopie teilt keine Event-Objekte
+        clone._loaded = {event_id: event.copy() for event_id, event in self._loaded.items()}
+        clone._removed = set(self._removed)
+        return clone
+
+    @property
+    def loaded_events(self) -> Dict[str, Event]:
+        """Bisher geladene oder gesetzte Events"""
+        return dict(self._loaded)
+
+    @property
+    def removed_ids(self) -> set:
+        """Seit dem Laden entfernte Event-IDs"""
+        return set(self._removed)
+
+
+class ShardedJSONDataManager(JSONDataManager):
+    """
+    JSON-DataManager mit einem File pro Event (events/<id>.json) und einem
+    kleinen Manifest; Benutzer liegen weiterhin in users.json
+    update_event/create_event/delete_event schreiben nur das betroffene Shard
+    (plus Manifest bzw. Token-Index, wenn sich deren Inhalt ändert)
+    """
+
+    @staticmethod
+    def _shard_path(event_id: str) -> str:
+        if not event_id or os.sep in event_id or (os.altsep and os.altsep in event_id) or event_id.startswith('.'):
+            raise ValueError(f"Ungültige Event-ID: {event_id!r}")
+        return os.path.join(EVENTS_DIR, f"{event_id}.json")
+
+    @staticmethod
+    def _manifest_entry(event: Event) -> dict:
+        return {'created_at': event.created_at, 'created_by': event.created_by}
+
+    @staticmethod
+    def _load_manifest() -> Dict[str, dict]:
+        try:
+            return _read_json(EVENTS_MANIFEST_FILE)
+        except FileNotFoundError:
+            return {}
+
+    @staticmethod
+    def _save_manifest(manifest: Dict[str, dict]):
+        os.makedirs(EVENTS_DIR, exist_ok=True)
+        _atomic_write_json(EVENTS_MANIFEST_FILE, manifest)
+
+    @staticmethod
+    def _read_shard(event_id: str) -> Optional[Event]:
+        try:
+            return Event.from_dict(_read_json(ShardedJSONDataManager._shard_path(event_id)))
+        except (FileNotFoundError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_shard(event: Event):
+        os.makedirs(EVENTS_DIR, exist_ok=True)
+        _atomic_write_json(ShardedJSONDataManager._shard_path(event.id), event.to_dict())
+
+    @staticmethod
+    def _remove_shard(event_id: str):
+        try:
+            os.remove(ShardedJSONDataManager._shard_path(event_id))
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _active_tokens(event: Optional[Event]) -> set:
+        if event is None:
+            return set()
+        return {link.token for link in event.access_links if not link.disabled}
+
+    @staticmethod
+    def _update_link_index(upserted: Iterable[Event], removed_ids: Iterable[str]):
+        """Ersetzt die Index-Einträge der betroffenen Events"""
+        upserted = list(upserted)
+        affected = set(removed_ids) | {event.id for event in upserted}
+        index = ShardedJSONDataManager._load_link_index()
+        index = {token: entry for token, entry in index.items() if entry[0] not in affected}
+        index.update(JSONDataManager._build_link_index(upserted))
+        JSONDataManager._save_link_index(index)
+
+    @staticmethod
+    def _load_link_index() -> Dict[str, Tuple[str, str]]:
+        return ShardedJSONDataManager._load_sidecar(LINK_INDEX_FILE, JSONDataManager._build_link_index)
+
+    @staticmethod
+    def _load_sidecar(path: str, build):
+        """Lädt eine Index-Datei; fehlt sie, wird sie aus allen Shards neu aufgebaut"""
+        try:
+            return _read_json(path)
+        except (FileNotFoundError, ValueError):
+            data = build(ShardedJSONDataManager.load_events().values())
+            _atomic_write_json(path, data)
+            return data
+
+    @staticmethod
+    def _summary_key(event: Optional[Event]):
+        if event is None:
+            return None
+        return EventSummary.from_event(event).to_dict(), event.participant_ids
+
+    @staticmethod
+    def _update_summary_index(upserted: Iterable[Event], removed_ids: Iterable[str]):
+        """Ersetzt die Zusammenfassungen der betroffenen Events"""
+        upserted = list(upserted)
+        index = ShardedJSONDataManager._load_sidecar(EVENT_SUMMARIES_FILE, _build_summary_index)
+        _remove_from_summary_index(index, set(removed_ids) | {event.id for event in upserted})
+        for event in upserted:
+            _add_to_summary_index(index, event)
+        _sort_summary_index(index, {uid for event in upserted for uid in [event.created_by, *event.participant_ids]})
+        _atomic_write_json(EVENT_SUMMARIES_FILE, index)
+
+    @staticmethod
+    def get_event_summaries(user_id: str) -> List[EventSummary]:
+        """Zusammenfassungen aller Events eines Benutzers (neueste zuerst) ohne Shards zu lesen"""
+        index = ShardedJSONDataManager._load_sidecar(EVENT_SUMMARIES_FILE, _build_summary_index)
+        return _summaries_for_user(index, user_id)
+
+    @staticmethod
+    def get_event_summaries_page(
+        user_id: str, limit: int, cursor: Optional[PageCursor] = None
+    ) -> Tuple[List[EventSummary], Optional[PageCursor]]:
+        """Eine Seite der Event-Zusammenfassungen (Binärsuche im vorsortierten Index)"""
+        index = ShardedJSONDataManager._load_sidecar(EVENT_SUMMARIES_FILE, _build_summary_index)
+        return _summary_page_for_user(index, user_id, limit, cursor)
+
+    @staticmethod
+    def load_events() -> LazyEventMap:
+        """Liefert eine Lazy-Sicht auf alle Events (Shards werden erst bei Zugriff gelesen)"""
+        return LazyEventMap(ShardedJSONDataManager._load_manifest().keys())
+
+    @staticmethod
+    def save_events(events: Dict[str, Event]):
+        """
+        Speichert Events; bei einer LazyEventMap nur die geladenen/geänderten
+        und entfernten Events, sonst den kompletten Bestand
+        """
+        if isinstance(events, LazyEventMap):
+            manifest = ShardedJSONDataManager._load_manifest()
+            changed = events.loaded_events
+            removed = events.removed_ids
+        else:
+            manifest = {}
+            changed = dict(events)
+            removed = set(ShardedJSONDataManager._load_manifest()) - set(changed)
+
+        for event in changed.values():
+            ShardedJSONDataManager._write_shard(event)
+            manifest[event.id] = ShardedJSONDataManager._manifest_entry(event)
+        for event_id in removed:
+            manifest.pop(event_id, None)
+        ShardedJSONDataManager._save_manifest(manifest)
+        for event_id in removed:
+            ShardedJSONDataManager._remove_shard(event_id)
+
+        if isinstance(events, LazyEventMap):
+            ShardedJSONDataManager._update_link_index(changed.values(), removed)
+            ShardedJSONDataManager._update_summary_index(changed.values(), removed)
+        else:
+            JSONDataManager._save_link_index(JSONDataManager._build_link_index(changed.values()))
+            _atomic_write_json(EVENT_SUMMARIES_FILE, _build_summary_index(changed.values()))
+
+    @staticmethod
+    def create_event(title: str, creator_id: str, participant_ids: List[str], gift_value: str = "") -> Event:
+        """Erstellt ein neues Event"""
+        event = Event(
+            id=str(uuid.uuid4()),
+            title=title,
+            created_by=creator_id,
+            created_at=datetime.now().isoformat(),
+            participant_ids=participant_ids,
+            assignments=[],
+            gift_value=gift_value
+        )
+        ShardedJSONDataManager.update_event(event)
+        return event
+
+    @staticmethod
+    def update_event(event: Event):
+        """Schreibt nur das Shard des Events (Manifest/Index nur bei Änderung)"""
+        previous = ShardedJSONDataManager._read_shard(event.id)
+        ShardedJSONDataManager._write_shard(event)
+
+        entry = ShardedJSONDataManager._manifest_entry(event)
+        if previous is None or ShardedJSONDataManager._manifest_entry(previous) != entry:
+            manifest = ShardedJSONDataManager._load_manifest()
+            if manifest.get(event.id) != entry:
+                manifest[event.id] = entry
+                ShardedJSONDataManager._save_manifest(manifest)
+
+        if ShardedJSONDataManager._active_tokens(previous) != ShardedJSONDataManager._active_tokens(event):
+            ShardedJSONDataManager._update_link_index([event], [])
+
+        if ShardedJSONDataManager._summary_key(previous) != ShardedJSONDataManager._summary_key(event):
+            ShardedJSONDataManager._update_summary_index([event], [])
+
+    @staticmethod
+    def update_events(events: Iterable[Event]):
+        """Schreibt die Shards mehrerer Events; Manifest und Indizes nur einmal"""
+        events = list(events)
+        for event in events:
+            ShardedJSONDataManager._write_shard(event)
+        manifest = ShardedJSONDataManager._load_manifest()
+        entries = {event.id: ShardedJSONDataManager._manifest_entry(event) for event in events}
+        if any(manifest.get(event_id) != entry for event_id, entry in entries.items()):
+            manifest.update(entries)
+            ShardedJSONDataManager._save_manifest(manifest)
+        ShardedJSONDataManager._update_link_index(events, [])
+        ShardedJSONDataManager._update_summary_index(events, [])
+
+    @staticmethod
+    def delete_event(event_id: str):
+        """Löscht ein Event"""
+        manifest = ShardedJSONDataManager._load_manifest()
+        if event_id not in manifest:
+            return
+        del manifest[event_id]
+        ShardedJSONDataManager._save_manifest(manifest)
+        ShardedJSONDataManager._remove_shard(event_id)
+        ShardedJSONDataManager._update_link_index([], [event_id])
+        ShardedJSONDataManager._update_summary_index([], [event_id])
+
+    @staticmethod
+    def get_event_by_id(event_id: str) -> Optional[Event]:
+        """Holt ein Event anhand der ID (liest nur dessen Shard)"""
+        return ShardedJSONDataManager._read_shard(event_id)
+
+    @staticmethod
+    def get_recent_started_events(created_by: str, limit: int) -> List[Event]:
+        """Die letzten limit gestarteten Events eines Organisators (liest nur deren Shards)"""
+        ids = _recent_started_ids(ShardedJSONDataManager.get_event_summaries(created_by), created_by, limit)
+        events = (ShardedJSONDataManager._read_shard(event_id) for event_id in ids)
+        return [event for event in events if event is not None]
+
+    @staticmethod
+    def find_event_by_token(token: str) -> Optional[Event]:
+        """Findet das Event zu einem aktiven Link-Token über den Token-Index"""
+        entry = ShardedJSONDataManager._load_link_index().get(token)
+        if entry is None:
+            return None
+        event = ShardedJSONDataManager._read_shard(entry[0])
+        if event is not None and token in ShardedJSONDataManager._active_tokens(event):
+            return event
+        return None
+
+    @staticmethod
+    def storage_fingerprint() -> Tuple:
+        """
+        Änderungsstand von users.json und dem Event-Verzeichnis
+        (Shards werden per os.replace geschrieben, das aktualisiert die mtime des Verzeichnisses)
+        """
+        return _stat_fingerprint(USERS_FILE, EVENTS_DIR)
+
+
+class JSONJournal:
+    """
+    Write-Ahead-Journal für JSON_STORAGE=journal
+    Zustand = Snapshot (users.json/events.json) + angehängte Mutationen aus
+    data_journal.jsonl. Jeder Record ist idempotent (put/delete/replace, Links
+    per Token), daher ist das erneute Abspielen nach einem Absturz während der
+    Kompaktierung unkritisch. Eine unvollständige letzte Zeile (Absturz beim
+    Schreiben) wird beim nächsten Laden abgeschnitten.
+    """
+    _lock = threading.RLock()
+    _depth = 0
+    _users: Optional[Dict[str, dict]] = None
+    _events: Dict[str, dict] = {}
+    _tokens: Dict[str, str] = {}
+    _offset = 0
+    _records = 0
+    _snapshot_fingerprint: Optional[Tuple] = None
+    _compacting = False
+
+    @classmethod
+    @contextmanager
+    def locked(cls):
+        """Sperrt Journal und In-Memory-Zustand (Threads und, falls möglich, Prozesse)"""
+        with cls._lock:
+            lock_file = None
+            if cls._depth == 0 and fcntl is not None:
+                lock_file = open(f"{JOURNAL_FILE}.lock", 'a')
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            cls._depth += 1
+            try:
+                yield
+            finally:
+                cls._depth -= 1
+                if lock_file is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    lock_file.close()
+
+    @classmethod
+    def refresh(cls):
+        """Bringt den Zustand auf den Stand von Snapshot + Journal (nur neue Records werden gelesen)"""
+        with cls.locked():
+            fingerprint = _stat_fingerprint(USERS_FILE, EVENTS_FILE)
+            if cls._users is None or fingerprint != cls._snapshot_fingerprint:
+                cls._load_snapshot()
+                cls._snapshot_fingerprint = fingerprint
+
+            try:
+                with open(JOURNAL_FILE, 'rb') as f:
+                    f.seek(0, os.SEEK_END)
+                    if f.tell() < cls._offset:
+                        # Journal wurde von einem anderen Prozess kompaktiert
+                        cls._load_snapshot()
+                    f.seek(cls._offset)
+                    data = f.read()
+            except FileNotFoundError:
+                return
+
+            lines = data.split(b'\n')
+            partial = lines.pop()
+            for line in lines:
+                cls._offset += len(line) + 1
+                if not line.strip():
+                    continue
+                try:
+                    cls._apply(JSON_CODEC.loads(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    print(f" Überspringe beschädigten Journal-Eintrag: {e}")
+                cls._records += 1
+
+            if partial:
+                # Rest eines abgebrochenen Schreibvorgangs verwerfen
+                with open(JOURNAL_FILE, 'r+b') as f:
+                    f.truncate(cls._offset)
+
+    @classmethod
+    def append(cls, record: dict):
+        """Hängt einen Record an (fsync) und wendet ihn auf den Zustand an"""
+        line = JSON_CODEC.dumps(record) + b'\n'
+        with cls.locked():
+            cls.refresh()
+            with open(JOURNAL_FILE, 'ab') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            cls._offset += len(line)
+            cls._apply(record)
+            cls._records += 1
+            due = cls._records >= JOURNAL_COMPACT_THRESHOLD and not cls._compacting
+            if due:
+                cls._compacting = True
+        if due:
+            threading.Thread(target=cls._compact_in_background, daemon=True).start()
+
+    @classmethod
+    def compact(cls):
+        """Schreibt den aktuellen Zustand als Snapshot und leert das Journal"""
+        with cls.locked():
+            cls.refresh()
+            _atomic_write_json(EVENTS_FILE, cls._events, durable=True)
+            _atomic_write_json(USERS_FILE, cls._users, durable=True)
+            # Erst nach dem (per fsync gesicherten) Snapshot kürzen: ein Absturz dazwischen
+            # spielt nur idempotente Records erneut ab
+            with open(JOURNAL_FILE, 'wb') as f:
+                f.flush()
+                os.fsync(f.fileno())
+            cls._offset = 0
+            cls._records = 0
+            cls._snapshot_fingerprint = _stat_fingerprint(USERS_FILE, EVENTS_FILE)
+
+    @classmethod
+    def _compact_in_background(cls):
+        try:
+            cls.compact()
+        except Exception as e:
+            print(f" Journal-Kompaktierung fehlgeschlagen: {e}")
+        finally:
+            cls._compacting = False
+
+    @classmethod
+    def _load_snapshot(cls):
+        def read(path):
+            try:
+                return _read_json(path)
+            except FileNotFoundError:
+                return {}
+
+        cls._users = read(USERS_FILE)
+        cls._events = read(EVENTS_FILE)
+        cls._tokens = {}
+        for event_id, event in cls._events.items():
+            cls._index_tokens(event_id, event)
+        cls._offset = 0
+        cls._records = 0
+
+    @classmethod
+    def _index_tokens(cls, event_id: str, event: dict):
+        for link in event.get('access_links', []):
+            if not link.get('disabled'):
+                cls._tokens[link['token']] = event_id
+
+    @classmethod
+    def _unindex_tokens(cls, event: Optional[dict]):
+        for link in (event or {}).get('access_links', []):
+            cls._tokens.pop(link['token'], None)
+
+    @classmethod
+    def _apply(cls, record: dict):
+        op = record['op']
+        if op == 'put_user':
+            cls._users[record['user']['id']] = record['user']
+        elif op == 'replace_users':
+            cls._users = dict(record['users'])
+        elif op in ('put_event', 'put_events'):
+            for event in record['events'] if op == 'put_events' else [record['event']]:
+                cls._unindex_tokens(cls._events.get(event['id']))
+                cls._events[event['id']] = event
+                cls._index_tokens(event['id'], event)
+        elif op == 'delete_event':
+            cls._unindex_tokens(cls._events.pop(record['event_id'], None))
+        elif op == 'replace_events':
+            cls._events = dict(record['events'])
+            cls._tokens = {}
+            for event_id, event in cls._events.items():
+                cls._index_tokens(event_id, event)
+        elif op == 'reveal':
+            event = cls._events.get(record['event_id'])
+            for assignment in (event or {}).get('assignments', []):
+                if assignment['giver_id'] == record['giver_id']:
+                    assignment['revealed'] = True
+        elif op == 'add_links':
+            event = cls._events.get(record['event_id'])
+            if event is not None:
+                links = event.setdefault('access_links', [])
+                known = {link['token'] for link in links}
+                for link in record['links']:
+                    if link['token'] not in known:
+                        links.append(link)
+                        if not link.get('disabled'):
+                            cls._tokens[link['token']] = event['id']
+        elif op == 'disable_links':
+            event = cls._events.get(record['event_id'])
+            tokens = set(record['tokens'])
+            for link in (event or {}).get('access_links', []):
+                if link['token'] in tokens:
+                    link['disabled'] = True
+                    cls._tokens.pop(link['token'], None)
+        else:
+            raise KeyError(f"Unbekannte Journal-Operation: {op}")
+
+    @classmethod
+    def users(cls) -> Dict[str, dict]:
+        cls.refresh()
+        return cls._users
+
+    @classmethod
+    def events(cls) -> Dict[str, dict]:
+        cls.refresh()
+        return cls._events
+
+    @classmethod
+    def event_id_for_token(cls, token: str) -> Optional[str]:
+        cls.refresh()
+        return cls._tokens.get(token)
+
+
+class JournalJSONDataManager(JSONDataManager):
+    """
+    JSON-DataManager im Journal-Modus (JSON_STORAGE=journal)
+    Mutationen werden als kleine Records an data_journal.jsonl angehängt statt
+    den kompletten Bestand neu zu schreiben; ab JOURNAL_COMPACT_THRESHOLD
+    Records wird im Hintergrund in users.json/events.json kompaktiert
+    """
+
+    @staticmethod
+    def load_users() -> Dict[str, User]:
+        """Lädt Benutzer aus Snapshot + Journal"""
+        with JSONJournal.locked():
+            return {uid: User.from_dict(data) for uid, data in JSONJournal.users().items()}
+
+    @staticmethod
+    def save_users(users: Dict[str, User]):
+        """Ersetzt alle Benutzer"""
+        JSONJournal.append({'op': 'replace_users', 'users': {uid: user.to_dict() for uid, user in users.items()}})
+
+    @staticmethod
+    def update_user(user: User):
+        """Aktualisiert einen Benutzer"""
+        JSONJournal.append({'op': 'put_user', 'user': user.to_dict()})
+
+    @staticmethod
+    def get_users_by_ids(user_ids: Iterable[str]) -> Dict[str, User]:
+        """Lädt nur die angegebenen Benutzer (fehlende IDs werden ausgelassen)"""
+        with JSONJournal.locked():
+            users = JSONJournal.users()
+            return {uid: User.from_dict(users[uid]) for uid in dict.fromkeys(user_ids) if uid in users}
+
+    @staticmethod
+    def get_user_by_email(email: str) -> Optional[User]:
+        """Sucht Benutzer nach E-Mail"""
+        with JSONJournal.locked():
+            for data in JSONJournal.users().values():
+                if data.get('email') == email:
+                    return User.from_dict(data)
+        return None
+
+    @staticmethod
+    def authenticate(email: str, password: str) -> Optional[User]:
+        """Authentifiziert einen Benutzer"""
+        user = JournalJSONDataManager.get_user_by_email(email)
+        if user and user.password == password:
+            return user
+        return None
+
+    @staticmethod
+    def load_events() -> Dict[str, Event]:
+        """Lädt Events aus Snapshot + Journal"""
+        with JSONJournal.locked():
+            return {eid: Event.from_dict(data) for eid, data in JSONJournal.events().items()}
+
+    @staticmethod
+    def save_events(events: Dict[str, Event]):
+        """Ersetzt alle Events"""
+        JSONJournal.append({'op': 'replace_events', 'events': {eid: event.to_dict() for eid, event in events.items()}})
+
+    @staticmethod
+    def create_event(title: str, creator_id: str, participant_ids: List[str], gift_value: str = "") -> Event:
+        """Erstellt ein neues Event"""
+        event = Event(
+            id=str(uuid.uuid4()),
+            title=title,
+            created_by=creator_id,
+            created_at=datetime.now().isoformat(),
+            participant_ids=participant_ids,
+            assignments=[],
+            gift_value=gift_value
+        )
+        JournalJSONDataManager.update_event(event)
+        return event
+
+    @staticmethod
+    def update_event(event: Event):
+        """Schreibt das komplette Event als Journal-Record"""
+        JSONJournal.append({'op': 'put_event', 'event': event.to_dict()})
+
+    @staticmethod
+    def update_events(events: Iterable[Event]):
+        """Schreibt mehrere Events als einen Journal-Record"""
+        JSONJournal.append({'op': 'put_events', 'events': [event.to_dict() for event in events]})
+
+    @staticmethod
+    def delete_event(event_id: str):
+        """Löscht ein Event"""
+        JSONJournal.append({'op': 'delete_event', 'event_id': event_id})
+
+    @staticmethod
+    def get_event_by_id(event_id: str) -> Optional[Event]:
+        """Holt ein Event anhand der ID"""
+        with JSONJournal.locked():
+            data = JSONJournal.events().get(event_id)
+            return Event.from_dict(data) if data else None
+
+    @staticmethod
+    def get_recent_started_events(created_by: str, limit: int) -> List[Event]:
+        """Die letzten limit gestarteten Events eines Organisators (neueste zuerst)"""
+        ids = _recent_started_ids(JournalJSONDataManager.get_event_summaries(created_by), created_by, limit)
+        events = (JournalJSONDataManager.get_event_by_id(event_id) for event_id in ids)
+        return [event for event in events if event is not None]
+
+    @staticmethod
+    def find_event_by_token(token: str) -> Optional[Event]:
+        """Findet das Event zu einem aktiven Link-Token (In-Memory-Token-Index)"""
+        with JSONJournal.locked():
+            event_id = JSONJournal.event_id_for_token(token)
+            return JournalJSONDataManager.get_event_by_id(event_id) if event_id else None
+
+    @staticmethod
+    def get_event_summaries(user_id: str) -> List[EventSummary]:
+        """Zusammenfassungen aller Events eines Benutzers (neueste zuerst) direkt aus dem Zustand"""
+        with JSONJournal.locked():
+            summaries = [
+                EventSummary(
+                    id=data['id'],
+                    title=data['title'],
+                    created_by=data['created_by'],
+                    created_at=data['created_at'],
+                    participant_count=len(data.get('participant_ids', [])),
+                    is_started=data.get('is_started', False),
+                    gift_value=data.get('gift_value', ""),
+                    gifts_per_person=data.get('gifts_per_person', 1),
+                )
+                for data in JSONJournal.events().values()
+                if data['created_by'] == user_id or user_id in data.get('participant_ids', [])
+            ]
+        return sorted(summaries, key=lambda s: s.created_at, reverse=True)
+
+    @staticmethod
+    def get_event_summaries_page(
+        user_id: str, limit: int, cursor: Optional[PageCursor] = None
+    ) -> Tuple[List[EventSummary], Optional[PageCursor]]:
+        """Eine Seite der Event-Zusammenfassungen"""
+        return paginate_summaries(JournalJSONDataManager.get_event_summaries(user_id), limit, cursor)
+
+    @staticmethod
+    def set_assignment_revealed(event_id: str, giver_id: str):
+        """Markiert die Zuweisung eines Schenkenden als aufgedeckt"""
+        JSONJournal.append({'op': 'reveal', 'event_id': event_id, 'giver_id': giver_id})
+
+    @staticmethod
+    def add_access_links(event_id: str, links: List[AccessLink]):
+        """Hängt Einladungs-Links an ein Event an (bereits vorhandene Tokens werden übersprungen)"""
+        JSONJournal.append({'op': 'add_links', 'event_id': event_id, 'links': [link.to_dict() for link in links]})
+
+    @staticmethod
+    def disable_access_links(event_id: str, user_id: str):
+        """Deaktiviert alle aktiven Links eines Teilnehmers"""
+        with JSONJournal.locked():
+            event = JSONJournal.events().get(event_id) or {}
+            tokens = [
+                link['token'] for link in event.get('access_links', [])
+                if link['user_id'] == user_id and not link.get('disabled')
+            ]
+            if tokens:
+                JSONJournal.append({'op': 'disable_links', 'event_id': event_id, 'tokens': tokens})
+
+    @staticmethod
+    def compact():
+        """Kompaktiert das Journal sofort (z. B. vor einem Wechsel auf JSON_STORAGE=file)"""
+        JSONJournal.compact()
+
+    @staticmethod
+    def storage_fingerprint() -> Tuple:
+        """Änderungsstand von Snapshot und Journal"""
+        return _stat_fingerprint(USERS_FILE, EVENTS_FILE, JOURNAL_FILE)
+
+
+def migrate_json_to_sharded():
+    """
+    Migriert events.json in das Sharded-Layout (events/<id>.json + Manifest)
+    Einmalig ausführen beim Umstieg auf JSON_STORAGE=sharded; events.json bleibt als Backup erhalten
+    """
+    print("🔄 Starte Migration von events.json ins Sharded-Layout...")
+    if not os.path.exists(EVENTS_FILE):
+        print("⚠️ events.json nicht gefunden - nichts zu migrieren")
+        return
+    events = JSONDataManager.load_events()
+    ShardedJSONDataManager.save_events(events)
+    print(f"✅ {len(events)} Events nach '{EVENTS_DIR}/' migriert")
+    print("✨ Migration abgeschlossen!")
 
 
 # Bestimme welchen DataManager wir verwenden
 USE_MONGODB = os.getenv("USE_MONGODB", "false").lower() == "true"
+USE_SQLITE = os.getenv("USE_SQLITE", "false").lower() == "true"
+# JSON-Layout: "file" (events.json), "sharded" (ein File pro Event) oder "journal" (Snapshot + Journal)
+JSON_STORAGE = os.getenv("JSON_STORAGE", "file").lower()
+JSONBackend = {
+    "sharded": ShardedJSONDataManager,
+    "journal": JournalJSONDataManager,
+}.get(JSON_STORAGE, JSONDataManager)
 
 if USE_MONGODB:
     # Verwende MongoDB
@@ -254,8 +1738,24 @@ if USE_MONGODB:
     except ImportError as e:
         print(f" MongoDB-Import fehlgeschlagen: {e}")
         print(" Fallback auf JSON-Files")
-        DataManager = JSONDataManager
+        DataManager = JSONBackend
+elif USE_SQLITE:
+    # Verwende SQLite
+    from sqlite_database import SQLiteDataManager
+    DataManager = SQLiteDataManager
+    print(" Verwende SQLite als Datenbank")
 else:
     # Verwende JSON-Files (Standard)
-    DataManager = JSONDataManager
-    print(" Verwende JSON-Files als Datenbank")
+    DataManager = JSONBackend
+    print(f" Verwende JSON-Files als Datenbank (Layout: {JSON_STORAGE})")
+
+# Read-Through-Cache um den gewählten DataManager (abschaltbar mit USE_DATA_CACHE=false)
+USE_DATA_CACHE = os.getenv("USE_DATA_CACHE", "true").lower() == "true"
+
+if USE_DATA_CACHE:
+    from data_cache import CachedDataManager
+    DataManager = CachedDataManager(
+        DataManager,
+        ttl=DATA_CACHE_TTL_SECONDS,
+        max_entries=DATA_CACHE_MAX_ENTRIES,
+    )
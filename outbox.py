@@ -0,0 +1,240 @@
+"""
+Dauerhafte Outbox für Benachrichtigungen
+Beim Start eines Events werden die Mails nur gespeichert (JSON, SQLite oder
+MongoDB, je nach Backend); ein Worker holt sie in Batches ab, versendet sie
+über den Mail-Dispatcher und schreibt das Ergebnis zurück. Jeder Batch ist für
+OUTBOX_LEASE_SECONDS geleast: stürzt der Worker ab, übernimmt der nächste die
+Mails nach Ablauf des Leases (mindestens einmal zugestellt). Abgeschlossene
+Mails räumt der Worker nach OUTBOX_RETENTION_SECONDS (mindestens ein Tag) auf
+
+Aufruf (Worker als eigener Prozess, mit OUTBOX_WORKER=external in der App):
+    python outbox.py [--once] [--batch-size 50]
+"""
+import argparse
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from email_service import build_event_emails
+from mail_dispatch import DAY_SECONDS, MailDispatcher, get_dispatcher
+from models import DataManager, Event, OutboxMail, OUTBOX_PENDING, OUTBOX_SENT, OUTBOX_FAILED
+
+
+class OutboxConfig:
+    """Einstellungen von Outbox und Worker"""
+    BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+    LEASE_SECONDS = float(os.getenv("OUTBOX_LEASE_SECONDS", "300"))
+    POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "2"))
+    MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "6"))
+    # Ergebnisse werden spätestens nach so vielen Mails gespeichert (begrenzt Doppelversand nach Absturz)
+    FLUSH_EVERY = int(os.getenv("OUTBOX_FLUSH_EVERY", "10"))
+    # "thread": Worker-Thread im App-Prozess (Standard), "external": eigener Prozess (python outbox.py)
+    WORKER = os.getenv("OUTBOX_WORKER", "thread").lower()
+    # Abgeschlossene Mails so lange behalten (mindestens ein Tag, das Tageslimit zählt sie)
+    RETENTION_SECONDS = max(float(os.getenv("OUTBOX_RETENTION_SECONDS", "86400")), DAY_SECONDS)
+    PRUNE_INTERVAL_SECONDS = float(os.getenv("OUTBOX_PRUNE_INTERVAL_SECONDS", "3600"))
+
+
+@dataclass
+class OutboxProgress:
+    """Versandstand der Mails eines Events"""
+    total: int = 0
+    sent: int = 0
+    failed: int = 0
+
+    @property
+    def pending(self) -> int:
+        return self.total - self.sent - self.failed
+
+    @property
+    def finished(self) -> bool:
+        return self.pending == 0
+
+
+def enqueue_event_emails(event: Event, kind: str, app_url: str = None) -> int:
+    """
+    Legt die Benachrichtigungen eines Events in der Outbox ab und kehrt sofort zurück
+
+    Returns:
+        Anzahl eingereihter Mails
+    """
+    created_at = datetime.now().isoformat()
+    mails = [
+        OutboxMail(
+            id=str(uuid.uuid4()),
+            event_id=event.id,
+            kind=kind,
+            to_email=to_email,
+            subject=subject,
+            body_html=body_html,
+            created_at=created_at,
+        )
+        for to_email, subject, body_html in build_event_emails(event, kind, app_url)
+    ]
+    if mails:
+        DataManager.enqueue_outbox_mails(mails)
+        ensure_background_worker()
+    return len(mails)
+
+
+def event_progress(event_id: str) -> OutboxProgress:
+    """Versandstand eines Events aus der Outbox"""
+    counts = DataManager.get_outbox_progress(event_id)
+    return OutboxProgress(
+        total=sum(counts.values()),
+        sent=counts.get(OUTBOX_SENT, 0),
+        failed=counts.get(OUTBOX_FAILED, 0),
+    )
+
+
+def wait_for_events(
+    event_ids: Iterable[str], timeout: Optional[float] = None, poll_seconds: float = 0.2
+) -> Dict[str, float]:
+    """
+    Wartet, bis die Outbox-Mails der Events versendet (oder endgültig gescheitert) sind
+
+    Returns:
+        Sekunden bis zum Abschluss pro Event (fehlt, wenn timeout vorher abgelaufen ist)
+    """
+    started = time.monotonic()
+    waiting = set(event_ids)
+    finished_after: Dict[str, float] = {}
+    while waiting:
+        for event_id in list(waiting):
+            if event_progress(event_id).finished:
+                finished_after[event_id] = time.monotonic() - started
+                waiting.discard(event_id)
+        if not waiting or (timeout is not None and time.monotonic() - started >= timeout):
+            break
+        time.sleep(poll_seconds)
+    return finished_after
+
+
+class OutboxWorker:
+    """
+    Leert die Outbox: least fällige Mails, versendet sie über den Dispatcher
+    (ohne dessen eigene Wiederholungen) und speichert das Ergebnis. Vorübergehende
+    Fehler gehen mit Backoff zurück auf pending, bis MAX_ATTEMPTS erreicht ist
+    """
+
+    def __init__(
+        self,
+        dispatcher: Optional[MailDispatcher] = None,
+        batch_size: int = OutboxConfig.BATCH_SIZE,
+        lease_seconds: float = OutboxConfig.LEASE_SECONDS,
+        max_attempts: int = OutboxConfig.MAX_ATTEMPTS,
+    ):
+        # Eigene Wiederholungslogik, aber dieselben Provider-Limits wie der Prozess-Dispatcher
+        self.dispatcher = dispatcher if dispatcher is not None else MailDispatcher(
+            max_retries=0, limiter=get_dispatcher().limiter
+        )
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    def drain_once(self) -> int:
+        """Bearbeitet einen Batch und gibt die Anzahl bearbeiteter Mails zurück"""
+        # Nicht mehr leasen, als das Rate-Limit zeitnah zulässt (sonst läuft das Lease ab)
+        available = self.dispatcher.limiter.available()
+        limit = self.batch_size if available is None else max(1, min(self.batch_size, available))
+        mails = DataManager.claim_outbox_mails(limit, self.lease_seconds)
+        if not mails:
+            return 0
+
+        batch = self.dispatcher.dispatch([(mail.to_email, mail.subject, mail.body_html) for mail in mails])
+        done: List[OutboxMail] = []
+        for mail, future in zip(mails, batch.futures):
+            self._apply_result(mail, future.result())
+            done.append(mail)
+            if len(done) >= OutboxConfig.FLUSH_EVERY:
+                DataManager.finish_outbox_mails(done)
+                done = []
+        if done:
+            DataManager.finish_outbox_mails(done)
+        return len(mails)
+
+    def _apply_result(self, mail: OutboxMail, result):
+        now = time.time()
+        mail.attempts += 1
+        mail.lease_until = 0.0
+        if result.ok:
+            mail.status = OUTBOX_SENT
+            mail.sent_at = mail.finished_at = now
+            mail.last_error = ""
+            mail.body_html = ""  # wird nicht mehr gebraucht, hält die Outbox klein
+        elif result.transient and mail.attempts < self.max_attempts:
+            mail.status = OUTBOX_PENDING
+            mail.last_error = result.error
+            mail.next_attempt_at = now + self.dispatcher.backoff_delay(mail.attempts - 1)
+        else:
+            mail.status = OUTBOX_FAILED
+            mail.finished_at = now
+            mail.last_error = result.error
+
+    def prune(self) -> int:
+        """Entfernt Mails, die seit mehr als RETENTION_SECONDS abgeschlossen sind"""
+        try:
+            return DataManager.prune_outbox_mails(time.time() - OutboxConfig.RETENTION_SECONDS)
+        except AttributeError:
+            return 0  # Backend ohne Aufräumen
+
+    def run(self, stop: Optional[threading.Event] = None, once: bool = False):
+        """Läuft, bis stop gesetzt ist (once=True: bis die Outbox leer ist)"""
+        stop = stop or threading.Event()
+        pruned_at = None
+        while not stop.is_set():
+            try:
+                if pruned_at is None or time.monotonic() - pruned_at >= OutboxConfig.PRUNE_INTERVAL_SECONDS:
+                    pruned_at = time.monotonic()
+                    self.prune()
+                processed = self.drain_once()
+            except Exception as e:  # Worker soll weiterlaufen (z. B. Datenbank kurz weg)
+                print(f"Fehler im Outbox-Worker: {e}")
+                processed = 0
+            if not processed:
+                if once:
+                    return
+                stop.wait(OutboxConfig.POLL_SECONDS)
+
+
+_background_worker: Optional[threading.Thread] = None
+_background_lock = threading.Lock()
+
+
+def ensure_background_worker():
+    """
+    Startet (einmal pro Prozess) den Worker-Thread, falls OUTBOX_WORKER=thread;
+    nach einem Neustart werden so auch liegengebliebene Mails weiter versendet
+    """
+    global _background_worker
+    if OutboxConfig.WORKER != "thread":
+        return
+    with _background_lock:
+        if _background_worker is None or not _background_worker.is_alive():
+            _background_worker = threading.Thread(target=OutboxWorker().run, name="outbox-worker", daemon=True)
+            _background_worker.start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Outbox-Worker: versendet gespeicherte Benachrichtigungen")
+    parser.add_argument("--once", action="store_true", help="nur bis die Outbox leer ist")
+    parser.add_argument("--batch-size", type=int, default=OutboxConfig.BATCH_SIZE)
+    parser.add_argument("--lease-seconds", type=float, default=OutboxConfig.LEASE_SECONDS)
+    args = parser.parse_args()
+
+    worker = OutboxWorker(batch_size=args.batch_size, lease_seconds=args.lease_seconds)
+    print("📮 Outbox-Worker läuft (Strg+C zum Beenden)")
+    try:
+        worker.run(once=args.once)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        worker.dispatcher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
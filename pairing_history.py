@@ -0,0 +1,181 @@
+"""
+Zuweisungs-Historie über mehrere Events (z. B. Jahre) hinweg
+Merkt sich pro Gruppe die Paare der letzten gestarteten Events, damit die
+Engine kürzlich gezogene Paare vermeiden kann. Quelle sind die gespeicherten
+Event.assignments, die Historie lässt sich also jederzeit aus den Events aufbauen;
+load_history liest dafür nur die letzten gestarteten Events der betroffenen Gruppen
+"""
+from itertools import chain
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+from assignment_engine import InfeasibleAssignmentError
+from config import PAIRING_HISTORY_WINDOW
+from models import DataManager, Event
+
+Pair = Tuple[str, str]
+
+
+def group_key(event: Event) -> str:
+    """Gruppe eines Events: Events desselben Organisators gelten als eine Wichtel-Runde"""
+    return event.created_by
+
+
+class _GroupHistory:
+    """Die letzten window Events einer Gruppe plus Paar-Index über alle davon"""
+    __slots__ = ('entries', 'pair_counts', 'by_giver')
+
+    def __init__(self):
+        # (created_at, event_id, Paare), neuestes Event zuerst
+        self.entries: List[Tuple[str, str, List[Pair]]] = []
+        # (Schenkender, Beschenkter) -> Anzahl Events im Fenster
+        self.pair_counts: Dict[Pair, int] = {}
+        # Schenkender -> {Beschenkter: Anzahl}
+        self.by_giver: Dict[str, Dict[str, int]] = {}
+
+    def add_pairs(self, pairs: Iterable[Pair]):
+        for pair in pairs:
+            self.pair_counts[pair] = self.pair_counts.get(pair, 0) + 1
+            receivers = self.by_giver.setdefault(pair[0], {})
+            receivers[pair[1]] = receivers.get(pair[1], 0) + 1
+
+    def remove_pairs(self, pairs: Iterable[Pair]):
+        for pair in pairs:
+            count = self.pair_counts[pair] - 1
+            receivers = self.by_giver[pair[0]]
+            if count:
+                self.pair_counts[pair] = count
+                receivers[pair[1]] -= 1
+            else:
+                del self.pair_counts[pair]
+                del receivers[pair[1]]
+                if not receivers:
+                    del self.by_giver[pair[0]]
+
+
+class PairingHistory:
+    """
+    Paar-Historie pro Gruppe mit begrenztem Rückblick (window Events pro Gruppe)
+
+    - contains() prüft ein Paar in O(1)
+    - receivers_of() liefert die kürzlichen Beschenkten eines Schenkenden
+    - recent_pairs() liefert die Paare pro Event (neuestes zuerst) für den Solver
+    """
+
+    def __init__(self, window: int = PAIRING_HISTORY_WINDOW):
+        if window < 0:
+            raise ValueError("Das Historien-Fenster darf nicht negativ sein")
+        self.window = window
+        self._groups: Dict[str, _GroupHistory] = {}
+
+    @classmethod
+    def from_events(cls, events: Iterable[Event], window: int = PAIRING_HISTORY_WINDOW) -> 'PairingHistory':
+        """Baut die Historie aus gespeicherten Events auf (Backfill)"""
+        history = cls(window)
+        for event in events:
+            history.record(event)
+        return history
+
+    def record(self, event: Event):
+        """
+        Übernimmt die Zuweisungen eines gestarteten Events; ein erneut erfasstes
+        Event ersetzt seinen alten Eintrag. Ältere Events als die letzten window
+        der Gruppe fallen heraus
+        """
+        if not event.is_started or not event.assignments or not self.window:
+            return
+        group = self._groups.setdefault(group_key(event), _GroupHistory())
+        self._drop(group, event.id)
+
+        entries = group.entries
+        position = 0
+        while position < len(entries) and (entries[position][0], entries[position][1]) > (event.created_at, event.id):
+            position += 1
+        if position >= self.window:
+            return  # älter als alles im Fenster
+
+        pairs = [(a.giver_id, a.receiver_id) for a in event.assignments]
+        entries.insert(position, (event.created_at, event.id, pairs))
+        group.add_pairs(pairs)
+        while len(entries) > self.window:
+            group.remove_pairs(entries.pop()[2])
+
+    def forget(self, event: Event):
+        """Entfernt ein Event aus der Historie (z. B. nach dem Löschen)"""
+        group = self._groups.get(group_key(event))
+        if group is not None:
+            self._drop(group, event.id)
+
+    @staticmethod
+    def _drop(group: _GroupHistory, event_id: str):
+        for position, entry in enumerate(group.entries):
+            if entry[1] == event_id:
+                group.remove_pairs(group.entries.pop(position)[2])
+                return
+
+    def contains(self, group: str, giver_id: str, receiver_id: str) -> bool:
+        """Wurde giver_id -> receiver_id im Fenster der Gruppe schon gezogen?"""
+        history = self._groups.get(group)
+        return history is not None and (giver_id, receiver_id) in history.pair_counts
+
+    def receivers_of(self, group: str, giver_id: str) -> Set[str]:
+        """Alle kürzlichen Beschenkten eines Schenkenden in der Gruppe"""
+        history = self._groups.get(group)
+        return set(history.by_giver.get(giver_id, ())) if history is not None else set()
+
+    def recent_pairs(self, event: Event) -> List[List[Pair]]:
+        """
+        Paare der früheren Events aus der Gruppe von event, neuestes Event zuerst,
+        beschränkt auf Paare, deren beide Personen an event teilnehmen
+        """
+        history = self._groups.get(group_key(event))
+        if history is None:
+            return []
+        participants = set(event.participant_ids)
+        return [
+            [pair for pair in pairs if pair[0] in participants and pair[1] in participants]
+            for _, event_id, pairs in history.entries
+            if event_id != event.id
+        ]
+
+
+def load_history(groups: Iterable[str], window: int = PAIRING_HISTORY_WINDOW) -> PairingHistory:
+    """
+    Historie für die angegebenen Gruppen (siehe group_key): pro Gruppe werden nur
+    deren letzte window gestarteten Events geladen (DataManager.get_recent_started_events),
+    nicht der ganze Bestand
+    """
+    events: List[Event] = []
+    if window:
+        for group in dict.fromkeys(groups):
+            try:
+                events.extend(DataManager.get_recent_started_events(group, window))
+            except AttributeError:
+                # Backend ohne gezielte Abfrage: alle Events durchgehen
+                return PairingHistory.from_events(DataManager.load_events().values(), window)
+    return PairingHistory.from_events(events, window)
+
+
+def pairings_avoiding_history(
+    engine,
+    participant_ids: Sequence[str],
+    exclusion_groups: Sequence[Sequence[str]],
+    recent_pairs: Sequence[Sequence[Pair]],
+    gifts: int = 1,
+) -> Tuple[List[Pair], int]:
+    """
+    Zuweisung ohne die Paare der letzten Events; ist das nicht lösbar, wird der
+    Rückblick schrittweise verkürzt (die Ausschlussgruppen gelten immer).
+    gifts > 1: mehrere Beschenkte pro Person (engine.multi_pairings)
+
+    Returns:
+        (Paare, Anzahl tatsächlich berücksichtigter früherer Events)
+    """
+    for window in range(len(recent_pairs), -1, -1):
+        excluded = chain.from_iterable(recent_pairs[:window])
+        try:
+            if gifts > 1:
+                return engine.multi_pairings(participant_ids, gifts, exclusion_groups, excluded), window
+            return engine.constrained_pairings(participant_ids, exclusion_groups, excluded), window
+        except InfeasibleAssignmentError:
+            if window == 0:
+                raise
@@ -0,0 +1,646 @@
+"""
+SQLite-Datenbank-Layer für die Wichtel-App
+Normalisierte Tabellen mit Indizes, ohne externen Server (USE_SQLITE=true)
+"""
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+# Type-only imports (nur für Type Checker, nicht zur Laufzeit)
+if TYPE_CHECKING:
+    from models import User, Event, AccessLink, EventSummary, PageCursor, OutboxMail
+
+
+class SQLiteConfig:
+    """Datenbank-Konfiguration"""
+    DATABASE_PATH = os.getenv("SQLITE_PATH", "wichtel.db")
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    password TEXT NOT NULL,
+    is_admin INTEGER NOT NULL DEFAULT 0,
+    password_changed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
+
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    created_by TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    is_started INTEGER NOT NULL DEFAULT 0,
+    gift_value TEXT NOT NULL DEFAULT '',
+    gifts_per_person INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_events_creator ON events(created_by, created_at);
+
+CREATE TABLE IF NOT EXISTS event_participants (
+    event_id TEXT NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    user_id TEXT NOT NULL,
+    PRIMARY KEY (event_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_participants_user ON event_participants(user_id);
+
+CREATE TABLE IF NOT EXISTS assignments (
+    event_id TEXT NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    giver_id TEXT NOT NULL,
+    receiver_id TEXT NOT NULL,
+    revealed INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (event_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_assignments_giver ON assignments(event_id, giver_id);
+
+CREATE TABLE IF NOT EXISTS access_links (
+    token TEXT PRIMARY KEY,
+    event_id TEXT NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    user_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    disabled INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_access_links_event_user ON access_links(event_id, user_id);
+
+CREATE TABLE IF NOT EXISTS event_exclusions (
+    event_id TEXT NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+    group_index INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    user_id TEXT NOT NULL,
+    PRIMARY KEY (event_id, group_index, position)
+);
+
+CREATE TABLE IF NOT EXISTS outbox (
+    id TEXT PRIMARY KEY,
+    event_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    to_email TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body_html TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT NOT NULL DEFAULT '',
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    lease_until REAL NOT NULL DEFAULT 0,
+    sent_at REAL NOT NULL DEFAULT 0,
+    finished_at REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox(status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS idx_outbox_event ON outbox(event_id, status);
+"""
+
+# Fällig und frei (siehe OutboxMail.claimable)
+_OUTBOX_CLAIMABLE = "((status = 'pending' AND next_attempt_at <= ?) OR (status = 'sending' AND lease_until < ?))"
+
+
+class SQLiteDB:
+    """SQLite-Verbindungs-Manager (eine Verbindung pro Thread)"""
+    _local = threading.local()
+    _schema_lock = threading.Lock()
+    _schema_ready = False
+
+    @classmethod
+    def get_connection(cls) -> sqlite3.Connection:
+        """Gibt die Verbindung des aktuellen Threads zurück"""
+        conn = getattr(cls._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(SQLiteConfig.DATABASE_PATH, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            with cls._schema_lock:
+                if not cls._schema_ready:
+                    conn.executescript(SCHEMA)
+                    _add_missing_columns(conn)
+                    cls._schema_ready = True
+            cls._local.conn = conn
+        return conn
+
+    @classmethod
+    def close(cls):
+        """Schließt die Verbindung des aktuellen Threads"""
+        conn = getattr(cls._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            cls._local.conn = None
+
+
+# Nachträglich ergänzte Spalten: (Tabelle, Spalte, Definition) für ältere Datenbanken
+ADDED_COLUMNS = [
+    ('events', 'gifts_per_person', 'INTEGER NOT NULL DEFAULT 1'),
+    ('outbox', 'sent_at', 'REAL NOT NULL DEFAULT 0'),
+    ('outbox', 'finished_at', 'REAL NOT NULL DEFAULT 0'),
+]
+
+
+def _add_missing_columns(conn: sqlite3.Connection):
+    for table, column, definition in ADDED_COLUMNS:
+        existing = {row['name'] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in existing:
+            with conn:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def _user_from_row(row: sqlite3.Row) -> 'User':
+    from models import User
+
+    return User(
+        id=row['id'],
+        name=row['name'],
+        email=row['email'],
+        password=row['password'],
+        is_admin=bool(row['is_admin']),
+        password_changed=bool(row['password_changed']),
+    )
+
+
+def _fetch_events(where: str = "", params: Tuple = (), order: str = "") -> List['Event']:
+    """Lädt Events samt Teilnehmern, Zuweisungen und Links mit je einer Abfrage pro Tabelle"""
+    from models import Event, Assignment, AccessLink
+
+    conn = SQLiteDB.get_connection()
+    event_rows = conn.execute(f"SELECT * FROM events {where} {order}", params).fetchall()
+    if not event_rows:
+        return []
+
+    events = {}
+    for row in event_rows:
+        events[row['id']] = Event(
+            id=row['id'],
+            title=row['title'],
+            created_by=row['created_by'],
+            created_at=row['created_at'],
+            participant_ids=[],
+            assignments=[],
+            access_links=[],
+            is_started=bool(row['is_started']),
+            gift_value=row['gift_value'],
+            gifts_per_person=row['gifts_per_person'],
+        )
+
+    subquery = f"SELECT id FROM events {where}"
+    for row in conn.execute(
+        f"SELECT event_id, user_id FROM event_participants WHERE event_id IN ({subquery}) ORDER BY event_id, position",
+        params,
+    ):
+        events[row['event_id']].participant_ids.append(row['user_id'])
+    for row in conn.execute(
+        f"SELECT event_id, giver_id, receiver_id, revealed FROM assignments WHERE event_id IN ({subquery}) ORDER BY event_id, position",
+        params,
+    ):
+        events[row['event_id']].assignments.append(
+            Assignment(giver_id=row['giver_id'], receiver_id=row['receiver_id'], revealed=bool(row['revealed']))
+        )
+    for row in conn.execute(
+        f"SELECT event_id, token, user_id, created_at, disabled FROM access_links WHERE event_id IN ({subquery}) ORDER BY event_id, position",
+        params,
+    ):
+        events[row['event_id']].access_links.append(
+            AccessLink(token=row['token'], user_id=row['user_id'], created_at=row['created_at'], disabled=bool(row['disabled']))
+        )
+    for row in conn.execute(
+        f"SELECT event_id, group_index, user_id FROM event_exclusions WHERE event_id IN ({subquery}) "
+        "ORDER BY event_id, group_index, position",
+        params,
+    ):
+        groups = events[row['event_id']].exclusion_groups
+        if len(groups) <= row['group_index']:
+            groups.append([])
+        groups[-1].append(row['user_id'])
+
+    return list(events.values())
+
+
+def _fetch_summaries(
+    user_id: str, cursor: Optional['PageCursor'] = None, limit: Optional[int] = None
+) -> List['EventSummary']:
+    """Event-Zusammenfassungen eines Benutzers, absteigend nach (created_at, id)"""
+    from models import EventSummary
+
+    sql = (
+        "SELECT e.id, e.title, e.created_by, e.created_at, e.is_started, e.gift_value, e.gifts_per_person, "
+        "(SELECT COUNT(*) FROM event_participants p WHERE p.event_id = e.id) AS participant_count "
+        "FROM events e "
+        "WHERE (e.created_by = ? OR e.id IN (SELECT event_id FROM event_participants WHERE user_id = ?))"
+    )
+    params: list = [user_id, user_id]
+    if cursor is not None:
+        sql += " AND (e.created_at < ? OR (e.created_at = ? AND e.id < ?))"
+        params += [cursor[0], cursor[0], cursor[1]]
+    sql += " ORDER BY e.created_at DESC, e.id DESC"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+
+    return [
+        EventSummary(
+            id=row['id'],
+            title=row['title'],
+            created_by=row['created_by'],
+            created_at=row['created_at'],
+            participant_count=row['participant_count'],
+            is_started=bool(row['is_started']),
+            gift_value=row['gift_value'],
+            gifts_per_person=row['gifts_per_person'],
+        )
+        for row in SQLiteDB.get_connection().execute(sql, params)
+    ]
+
+
+def _write_event(conn: sqlite3.Connection, event: 'Event'):
+    """Schreibt ein Event komplett (innerhalb einer offenen Transaktion)"""
+    conn.execute(
+        "INSERT INTO events (id, title, created_by, created_at, is_started, gift_value, gifts_per_person) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(id) DO UPDATE SET title = excluded.title, created_by = excluded.created_by, "
+        "created_at = excluded.created_at, is_started = excluded.is_started, gift_value = excluded.gift_value, "
+        "gifts_per_person = excluded.gifts_per_person",
+        (
+            event.id, event.title, event.created_by, event.created_at, int(event.is_started),
+            event.gift_value, event.gifts_per_person,
+        ),
+    )
+    for table in ("event_participants", "assignments", "access_links", "event_exclusions"):
+        conn.execute(f"DELETE FROM {table} WHERE event_id = ?", (event.id,))
+    conn.executemany(
+        "INSERT INTO event_participants (event_id, position, user_id) VALUES (?, ?, ?)",
+        [(event.id, pos, user_id) for pos, user_id in enumerate(event.participant_ids)],
+    )
+    conn.executemany(
+        "INSERT INTO assignments (event_id, position, giver_id, receiver_id, revealed) VALUES (?, ?, ?, ?, ?)",
+        [(event.id, pos, a.giver_id, a.receiver_id, int(a.revealed)) for pos, a in enumerate(event.assignments)],
+    )
+    conn.executemany(
+        "INSERT INTO access_links (token, event_id, position, user_id, created_at, disabled) VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (link.token, event.id, pos, link.user_id, link.created_at, int(link.disabled))
+            for pos, link in enumerate(event.access_links)
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO event_exclusions (event_id, group_index, position, user_id) VALUES (?, ?, ?, ?)",
+        [
+            (event.id, group_index, pos, user_id)
+            for group_index, group in enumerate(group for group in event.exclusion_groups if group)
+            for pos, user_id in enumerate(group)
+        ],
+    )
+
+
+def _write_users(conn: sqlite3.Connection, users: Iterable['User']):
+    conn.executemany(
+        "INSERT INTO users (id, name, email, password, is_admin, password_changed) VALUES (?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(id) DO UPDATE SET name = excluded.name, email = excluded.email, password = excluded.password, "
+        "is_admin = excluded.is_admin, password_changed = excluded.password_changed",
+        [
+            (u.id, u.name, u.email, u.password, int(u.is_admin), int(u.password_changed))
+            for u in users
+        ],
+    )
+
+
+class SQLiteDataManager:
+    """Datenbank-Manager für SQLite (gleiche Schnittstelle wie MongoDataManager)"""
+
+    @staticmethod
+    def load_users() -> Dict[str, 'User']:
+        """Lädt alle Benutzer aus der Datenbank"""
+        conn = SQLiteDB.get_connection()
+        return {row['id']: _user_from_row(row) for row in conn.execute("SELECT * FROM users")}
+
+    @staticmethod
+    def save_users(users: Dict[str, 'User']):
+        """Speichert alle Benutzer in die Datenbank (ersetzt den Bestand)"""
+        conn = SQLiteDB.get_connection()
+        with conn:
+            conn.execute("DELETE FROM users")
+            _write_users(conn, users.values())
+
+    @staticmethod
+    def update_user(user: 'User'):
+        """Aktualisiert einen einzelnen Benutzer"""
+        conn = SQLiteDB.get_connection()
+        with conn:
+            _write_users(conn, [user])
+
+    @staticmethod
+    def get_user_by_id(user_id: str) -> Optional['User']:
+        """Holt einen Benutzer anhand der ID"""
+        row = SQLiteDB.get_connection().execute("SELECT * FROM users WHERE id = ?", (user_id,)).fetchone()
+        return _user_from_row(row) if row else None
+
+    @staticmethod
+    def get_users_by_ids(user_ids: Iterable[str]) -> Dict[str, 'User']:
+        """Lädt nur die angegebenen Benutzer (fehlende IDs werden ausgelassen)"""
+        conn = SQLiteDB.get_connection()
+        user_ids = list(dict.fromkeys(user_ids))
+        users = {}
+        # SQLite begrenzt die Anzahl der Parameter pro Statement
+        for start in range(0, len(user_ids), 500):
+            chunk = user_ids[start:start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            for row in conn.execute(f"SELECT * FROM users WHERE id IN ({placeholders})", chunk):
+                users[row['id']] = _user_from_row(row)
+        return users
+
+    @staticmethod
+    def get_user_by_email(email: str) -> Optional['User']:
+        """Sucht Benutzer nach E-Mail"""
+        row = SQLiteDB.get_connection().execute("SELECT * FROM users WHERE email = ?", (email,)).fetchone()
+        return _user_from_row(row) if row else None
+
+    @staticmethod
+    def authenticate(email: str, password: str) -> Optional['User']:
+        """Authentifiziert einen Benutzer"""
+        user = SQLiteDataManager.get_user_by_email(email)
+        if user and user.password == password:
+            return user
+        return None
+
+    @staticmethod
+    def load_events() -> Dict[str, 'Event']:
+        """Lädt alle Events aus der Datenbank"""
+        return {event.id: event for event in _fetch_events()}
+
+    @staticmethod
+    def save_events(events: Dict[str, 'Event']):
+        """Speichert alle Events in die Datenbank (ersetzt den Bestand)"""
+        conn = SQLiteDB.get_connection()
+        with conn:
+            conn.execute("DELETE FROM events")
+            for event in events.values():
+                _write_event(conn, event)
+
+    @staticmethod
+    def create_event(title: str, creator_id: str, participant_ids: List[str], gift_value: str = "") -> 'Event':
+        """Erstellt ein neues Event"""
+        from models import Event
+
+        event = Event(
+            id=str(uuid.uuid4()),
+            title=title,
+            created_by=creator_id,
+            created_at=datetime.now().isoformat(),
+            participant_ids=participant_ids,
+            assignments=[],
+            gift_value=gift_value
+        )
+        SQLiteDataManager.update_event(event)
+        return event
+
+    @staticmethod
+    def update_event(event: 'Event'):
+        """Aktualisiert ein Event (eine Transaktion)"""
+        conn = SQLiteDB.get_connection()
+        with conn:
+            _write_event(conn, event)
+
+    @staticmethod
+    def update_events(events: Iterable['Event']):
+        """Aktualisiert mehrere Events in einer einzigen Transaktion"""
+        conn = SQLiteDB.get_connection()
+        with conn:
+            for event in events:
+                _write_event(conn, event)
+
+    @staticmethod
+    def get_event_by_id(event_id: str) -> Optional['Event']:
+        """Holt ein Event anhand der ID"""
+        events = _fetch_events("WHERE id = ?", (event_id,))
+        return events[0] if events else None
+
+    @staticmethod
+    def get_recent_started_events(created_by: str, limit: int) -> List['Event']:
+        """Die letzten limit gestarteten Events eines Organisators (neueste zuerst, über idx_events_creator)"""
+        return _fetch_events(
+            "WHERE id IN (SELECT id FROM events WHERE created_by = ? AND is_started = 1 "
+            "ORDER BY created_at DESC, id DESC LIMIT ?)",
+            (created_by, max(0, limit)),
+            "ORDER BY created_at DESC, id DESC",
+        )
+
+    @staticmethod
+    def delete_event(event_id: str):
+        """Löscht ein Event (Teilnehmer, Zuweisungen und Links per CASCADE)"""
+        conn = SQLiteDB.get_connection()
+        with conn:
+            conn.execute("DELETE FROM events WHERE id = ?", (event_id,))
+
+    @staticmethod
+    def get_events_by_participant(user_id: str) -> List['Event']:
+        """Findet alle Events, an denen ein Benutzer teilnimmt (neueste zuerst)"""
+        return _fetch_events(
+            "WHERE created_by = ? OR id IN (SELECT event_id FROM event_participants WHERE user_id = ?)",
+            (user_id, user_id),
+            "ORDER BY created_at DESC",
+        )
+
+    @staticmethod
+    def get_event_summaries(user_id: str) -> List['EventSummary']:
+        """Zusammenfassungen aller Events eines Benutzers (ohne Zuweisungen/Links, neueste zuerst)"""
+        return _fetch_summaries(user_id)
+
+    @staticmethod
+    def get_event_summaries_page(
+        user_id: str, limit: int, cursor: Optional['PageCursor'] = None
+    ) -> Tuple[List['EventSummary'], Optional['PageCursor']]:
+        """Eine Seite der Event-Zusammenfassungen (Keyset-Pagination auf created_at/id)"""
+        summaries = _fetch_summaries(user_id, cursor, limit + 1)
+        page = summaries[:limit]
+        next_cursor = (page[-1].created_at, page[-1].id) if len(summaries) > limit else None
+        return page, next_cursor
+
+    @staticmethod
+    def find_event_by_token(token: str) -> Optional['Event']:
+        """Findet das Event zu einem aktiven Link-Token"""
+        row = SQLiteDB.get_connection().execute(
+            "SELECT event_id FROM access_links WHERE token = ? AND disabled = 0", (token,)
+        ).fetchone()
+        return SQLiteDataManager.get_event_by_id(row['event_id']) if row else None
+
+    @staticmethod
+    def set_assignment_revealed(event_id: str, giver_id: str):
+        """Markiert die Zuweisung eines Schenkenden als aufgedeckt"""
+        conn = SQLiteDB.get_connection()
+        with conn:
+            conn.execute(
+                "UPDATE assignments SET revealed = 1 WHERE event_id = ? AND giver_id = ?",
+                (event_id, giver_id),
+            )
+
+    @staticmethod
+    def add_access_links(event_id: str, links: List['AccessLink']):
+        """Hängt Einladungs-Links an ein Event an (bereits vorhandene Tokens werden übersprungen)"""
+        conn = SQLiteDB.get_connection()
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO access_links (token, event_id, position, user_id, created_at, disabled) "
+                "VALUES (?, ?, (SELECT COALESCE(MAX(position), -1) + 1 FROM access_links WHERE event_id = ?), ?, ?, ?)",
+                [
+                    (link.token, event_id, event_id, link.user_id, link.created_at, int(link.disabled))
+                    for link in links
+                ],
+            )
+
+    @staticmethod
+    def disable_access_links(event_id: str, user_id: str):
+        """Deaktiviert alle aktiven Links eines Teilnehmers"""
+        conn = SQLiteDB.get_connection()
+        with conn:
+            conn.execute(
+                "UPDATE access_links SET disabled = 1 WHERE event_id = ? AND user_id = ? AND disabled = 0",
+                (event_id, user_id),
+            )
+
+    @staticmethod
+    def storage_fingerprint() -> Tuple:
+        """Änderungsstand der Datenbankdateien (WAL eingeschlossen) für die Cache-Validierung"""
+        fingerprint = []
+        for path in (SQLiteConfig.DATABASE_PATH, f"{SQLiteConfig.DATABASE_PATH}-wal"):
+            try:
+                stat = os.stat(path)
+                fingerprint.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                fingerprint.append(None)
+        return tuple(fingerprint)
+
+    # Outbox: nicht gecacht, die Namen passen daher bewusst nicht zu den WRITE_PREFIXES
+
+    @staticmethod
+    def enqueue_outbox_mails(mails: Iterable['OutboxMail']):
+        """Legt neue Mails in der Outbox ab"""
+        conn = SQLiteDB.get_connection()
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO outbox (id, event_id, kind, to_email, subject, body_html, created_at, "
+                "status, attempts, last_error, next_attempt_at, lease_until, sent_at, finished_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        mail.id, mail.event_id, mail.kind, mail.to_email, mail.subject, mail.body_html, mail.created_at,
+                        mail.status, mail.attempts, mail.last_error, mail.next_attempt_at, mail.lease_until,
+                        mail.sent_at, mail.finished_at,
+                    )
+                    for mail in mails
+                ],
+            )
+
+    @staticmethod
+    def claim_outbox_mails(limit: int, lease_seconds: float) -> List['OutboxMail']:
+        """
+        Least bis zu limit fällige Mails für lease_seconds; jede Zeile wird nur
+        übernommen, wenn sie beim UPDATE noch frei ist (mehrere Worker möglich)
+        """
+        from models import OutboxMail, OUTBOX_SENDING
+
+        now = time.time()
+        conn = SQLiteDB.get_connection()
+        with conn:
+            candidates = [
+                row['id'] for row in conn.execute(
+                    f"SELECT id FROM outbox WHERE {_OUTBOX_CLAIMABLE} ORDER BY next_attempt_at, created_at LIMIT ?",
+                    (now, now, limit),
+                )
+            ]
+            claimed = [
+                mail_id for mail_id in candidates
+                if conn.execute(
+                    f"UPDATE outbox SET status = ?, lease_until = ? WHERE id = ? AND {_OUTBOX_CLAIMABLE}",
+                    (OUTBOX_SENDING, now + lease_seconds, mail_id, now, now),
+                ).rowcount
+            ]
+        if not claimed:
+            return []
+        placeholders = ", ".join("?" * len(claimed))
+        rows = conn.execute(
+            f"SELECT * FROM outbox WHERE id IN ({placeholders}) ORDER BY next_attempt_at, created_at", claimed
+        ).fetchall()
+        return [OutboxMail.from_dict(dict(row)) for row in rows]
+
+    @staticmethod
+    def finish_outbox_mails(mails: Iterable['OutboxMail']):
+        """Schreibt Status, Versuche und Fehler bearbeiteter Mails zurück"""
+        conn = SQLiteDB.get_connection()
+        with conn:
+            conn.executemany(
+                "UPDATE outbox SET status = ?, attempts = ?, last_error = ?, next_attempt_at = ?, lease_until = ?, "
+                "sent_at = ?, finished_at = ?, body_html = ? WHERE id = ?",
+                [
+                    (mail.status, mail.attempts, mail.last_error, mail.next_attempt_at, mail.lease_until,
+                     mail.sent_at, mail.finished_at, mail.body_html, mail.id)
+                    for mail in mails
+                ],
+            )
+
+    @staticmethod
+    def get_outbox_progress(event_id: str) -> Dict[str, int]:
+        """Anzahl Mails eines Events pro Status"""
+        rows = SQLiteDB.get_connection().execute(
+            "SELECT status, COUNT(*) AS count FROM outbox WHERE event_id = ? GROUP BY status", (event_id,)
+        )
+        return {row['status']: row['count'] for row in rows}
+
+    @staticmethod
+    def count_outbox_sent_since(since: float) -> int:
+        """Anzahl seit since (Epoch-Sekunden) versendeter Mails"""
+        from models import OUTBOX_SENT
+
+        row = SQLiteDB.get_connection().execute(
+            "SELECT COUNT(*) AS count FROM outbox WHERE status = ? AND sent_at >= ?", (OUTBOX_SENT, since)
+        ).fetchone()
+        return row['count']
+
+    @staticmethod
+    def prune_outbox_mails(before: float) -> int:
+        """Entfernt vor before (Epoch-Sekunden) abgeschlossene Mails und gibt ihre Anzahl zurück"""
+        from models import OUTBOX_SENT, OUTBOX_FAILED
+
+        conn = SQLiteDB.get_connection()
+        with conn:
+            return conn.execute(
+                "DELETE FROM outbox WHERE status IN (?, ?) AND MAX(finished_at, sent_at) < ?",
+                (OUTBOX_SENT, OUTBOX_FAILED, before),
+            ).rowcount
+
+
+# Hilfsfunktion für Migration von JSON zu SQLite
+def migrate_json_to_sqlite():
+    """
+    Migriert Daten von JSON-Files zu SQLite
+    Einmalig ausführen beim Umstieg
+    """
+    from models import JSONDataManager
+
+    print("🔄 Starte Migration von JSON zu SQLite...")
+
+    users = JSONDataManager.load_users()
+    SQLiteDataManager.save_users(users)
+    print(f"✅ {len(users)} Benutzer migriert")
+
+    events = JSONDataManager.load_events()
+    SQLiteDataManager.save_events(events)
+    print(f"✅ {len(events)} Events migriert")
+
+    print("✨ Migration abgeschlossen!")
+
+
+if __name__ == "__main__":
+    print(f"🧪 Teste SQLite-Datenbank ({SQLiteConfig.DATABASE_PATH})...")
+    try:
+        users = SQLiteDataManager.load_users()
+        events = SQLiteDataManager.load_events()
+        print(f"\n📊 Aktuelle Datenbank:")
+        print(f"   👥 Benutzer: {len(users)}")
+        print(f"   🎄 Events: {len(events)}")
+    finally:
+        SQLiteDB.close()
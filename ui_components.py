@@ -4,9 +4,12 @@ UI components for the Secret Santa app.
 import streamlit as st
 from typing import List
 
-from models import User, Event, DataManager
+from config import EVENT_LIST_PAGE_SIZE
+from models import User, Event, EventSummary, DataManager
 from wichtel_logic import WichtelLogic
-from email_service import send_event_started_emails
+from assignment_engine import InfeasibleAssignmentError
+from email_service import MAIL_EVENT_STARTED
+from outbox import enqueue_event_emails, event_progress
 from link_service import LinkAuthService, build_invite_url
 from language import LANGUAGES, set_language
 
@@ -202,69 +205,85 @@ def show_password_change_form(_):
 def show_event_list(user: User, _):
     """List of events for the admin dashboard."""
     st.subheader(_("hello", name=user.name))
-    events = WichtelLogic.get_user_events(user.id)
+    pages_to_show = st.session_state.get("event_list_pages", 1)
 
-    if not events:
-        st.info(_("no_events_yet"))
-        return
+    cursor = None
+    for page_number in range(pages_to_show):
+        events, cursor = WichtelLogic.get_user_event_summaries_page(user.id, EVENT_LIST_PAGE_SIZE, cursor)
+        if page_number == 0 and not events:
+            st.info(_("no_events_yet"))
+            return
+        for event in events:
+            _show_event_list_item(event, user, _)
+        if cursor is None:
+            break
+
+    if cursor is not None:
+        if st.button(_("load_more_events"), key="load_more_events", use_container_width=True):
+            st.session_state.event_list_pages = pages_to_show + 1
+            st.rerun()
+
+
+def _show_event_list_item(event: EventSummary, user: User, _):
+    """A single entry of the event list."""
+    with st.container():
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.markdown(f"### {event.title}")
+            caption = _("participants", count=event.participant_count)
+            if event.gift_value:
+                caption += f"  ·  {_('gift_value', value=event.gift_value)}"
+            if event.gifts_per_person > 1:
+                caption += f"  ·  {_('gifts_per_person_count', count=event.gifts_per_person)}"
+            st.caption(caption)
+        with col2:
+            if event.is_started:
+                st.success(_("started"))
+            else:
+                st.warning(_("waiting"))
+
+        button_cols = st.columns([3, 1] if user.is_admin else [1])
+        with button_cols[0]:
+            if st.button(
+                _("open_event"),
+                key=f"open_{event.id}",
+                use_container_width=True,
+                type="primary",
+            ):
+                st.session_state.current_event = event.id
+                st.rerun()
+
+        if user.is_admin and len(button_cols) > 1:
+            with button_cols[1]:
+                if st.button(_("delete_button"), key=f"delete_{event.id}"):
+                    st.session_state.delete_confirm = event.id
+                    st.rerun()
 
-    for event in events:
-        with st.container():
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.markdown(f"### {event.title}")
-                caption = _("participants", count=len(event.participant_ids))
-                if event.gift_value:
-                    caption += f"  ·  {_('gift_value', value=event.gift_value)}"
-                st.caption(caption)
-            with col2:
-                if event.is_started:
-                    st.success(_("started"))
-                else:
-                    st.warning(_("waiting"))
-
-            button_cols = st.columns([3, 1] if user.is_admin else [1])
-            with button_cols[0]:
+        if (
+            hasattr(st.session_state, "delete_confirm")
+            and st.session_state.delete_confirm == event.id
+        ):
+            st.warning(_("confirm_delete_event", title=event.title))
+            col_yes, col_no = st.columns(2)
+            with col_yes:
                 if st.button(
-                    _("open_event"),
-                    key=f"open_{event.id}",
+                    _("yes_delete"),
+                    key=f"confirm_delete_{event.id}",
                     use_container_width=True,
-                    type="primary",
                 ):
-                    st.session_state.current_event = event.id
+                    DataManager.delete_event(event.id)
+                    del st.session_state.delete_confirm
+                    st.success(_("event_deleted"))
                     st.rerun()
-
-            if user.is_admin and len(button_cols) > 1:
-                with button_cols[1]:
-                    if st.button(_("delete_button"), key=f"delete_{event.id}"):
-                        st.session_state.delete_confirm = event.id
-                        st.rerun()
-
-            if (
-                hasattr(st.session_state, "delete_confirm")
-                and st.session_state.delete_confirm == event.id
-            ):
-                st.warning(_("confirm_delete_event", title=event.title))
-                col_yes, col_no = st.columns(2)
-                with col_yes:
-                    if st.button(
-                        _("yes_delete"),
-                        key=f"confirm_delete_{event.id}",
-                        use_container_width=True,
-                    ):
-                        DataManager.delete_event(event.id)
-                        del st.session_state.delete_confirm
-                        st.success(_("event_deleted"))
-                        st.rerun()
-                with col_no:
-                    if st.button(
-                        _("cancel"),
-                        key=f"cancel_delete_{event.id}",
-                        use_container_width=True,
-                    ):
-                        del st.session_state.delete_confirm
-                        st.rerun()
-        st.divider()
+            with col_no:
+                if st.button(
+                    _("cancel"),
+                    key=f"cancel_delete_{event.id}",
+                    use_container_width=True,
+                ):
+                    del st.session_state.delete_confirm
+                    st.rerun()
+    st.divider()
 
 
 def show_create_event_form(user: User, _):
@@ -320,20 +339,29 @@ def show_event_details(event: Event, user: User, _, admin_view: bool = False):
     if not event.is_started:
         st.warning(_("event_not_started"))
         if admin_view and user.is_admin:
+            _show_exclusion_groups(event, _)
+            _show_gifts_per_person(event, _)
             if st.button(
                 _("start_assignments"),
                 type="primary",
                 use_container_width=True,
             ):
-                WichtelLogic.assign_wichtel_random(event)
-                send_event_started_emails(event)
+                try:
+                    WichtelLogic.assign_wichtel_with_history(event)
+                except InfeasibleAssignmentError as e:
+                    st.error(_("assignment_infeasible", reason=e))
+                    return
+                # Mails landen in der Outbox, der Worker versendet sie; der Rerun wartet nicht
+                enqueue_event_emails(event, MAIL_EVENT_STARTED)
                 st.success(_("assignments_sent"))
                 st.balloons()
                 st.rerun()
     else:
-        assignment = WichtelLogic.get_assignment_for_user(event, user.id)
-        if assignment:
-            if not assignment.revealed:
+        if admin_view and user.is_admin:
+            _show_mail_progress(event.id, _)
+        assignments = WichtelLogic.get_assignments_for_user(event, user.id)
+        if assignments:
+            if not all(assignment.revealed for assignment in assignments):
                 if st.button(
                     _("show_my_wichtel"),
                     type="primary",
@@ -342,7 +370,7 @@ def show_event_details(event: Event, user: User, _, admin_view: bool = False):
                     WichtelLogic.reveal_assignment(event, user.id)
                     st.rerun()
             else:
-                receiver_name = WichtelLogic.get_receiver_name(assignment)
+                receiver_name = "<br>".join(WichtelLogic.get_receiver_names(assignments))
                 gift_value_html = f"<p style='font-size: 16px; margin-top: 15px; opacity: 0.9;'>{_('gift_value_display', value=event.gift_value)}</p>" if event.gift_value else ""
                 st.markdown(
                     f"""
@@ -357,7 +385,7 @@ def show_event_details(event: Event, user: User, _, admin_view: bool = False):
                 )
 
     st.divider()
-    users = DataManager.load_users()
+    users = DataManager.get_users_by_ids([event.created_by, *event.participant_ids])
 
     with st.expander(_("event_information"), expanded=False):
         col1, col2 = st.columns(2)
@@ -401,6 +429,74 @@ def show_event_details(event: Event, user: User, _, admin_view: bool = False):
                 st.write("")
 
 
+def _show_exclusion_groups(event: Event, _):
+    """Manage exclusion groups of an event that has not started yet (admins only)."""
+    with st.expander(_("exclusion_groups"), expanded=bool(event.exclusion_groups)):
+        st.caption(_("exclusion_groups_info"))
+        users = DataManager.get_users_by_ids(event.participant_ids)
+
+        def name_of(uid: str) -> str:
+            return users[uid].name if uid in users else uid
+
+        for index, group in enumerate(event.exclusion_groups):
+            col_names, col_remove = st.columns([4, 1])
+            with col_names:
+                st.write(", ".join(name_of(uid) for uid in group))
+            with col_remove:
+                if st.button(_("remove_exclusion_group"), key=f"remove_group_{event.id}_{index}"):
+                    groups = event.exclusion_groups[:index] + event.exclusion_groups[index + 1:]
+                    WichtelLogic.set_exclusion_groups(event, groups)
+                    st.rerun()
+
+        members = st.multiselect(
+            _("new_exclusion_group"),
+            options=event.participant_ids,
+            format_func=name_of,
+            key=f"new_group_{event.id}",
+        )
+        if st.button(_("add_exclusion_group"), key=f"add_group_{event.id}"):
+            if len(members) < 2:
+                st.warning(_("exclusion_group_too_small"))
+            else:
+                WichtelLogic.set_exclusion_groups(event, event.exclusion_groups + [members])
+                st.rerun()
+
+
+def _show_mail_progress(event_id: str, _):
+    """Delivery progress of the event's notifications from the outbox (refreshes itself)."""
+    progress = event_progress(event_id)
+    if not progress.total:
+        return
+    st.progress(
+        (progress.sent + progress.failed) / progress.total,
+        text=_("mail_progress", sent=progress.sent, total=progress.total),
+    )
+    if progress.failed:
+        st.warning(_("mail_progress_failed", count=progress.failed))
+
+
+# Live-Fortschritt ohne Rerun der ganzen Seite, wo st.fragment verfügbar ist (Streamlit >= 1.37)
+if hasattr(st, "fragment"):
+    _show_mail_progress = st.fragment(run_every=2)(_show_mail_progress)
+
+
+def _show_gifts_per_person(event: Event, _):
+    """Number of receivers per person for an event that has not started yet (admins only)."""
+    limit = max(1, len(event.participant_ids) - 1)
+    gifts = st.number_input(
+        _("gifts_per_person"),
+        min_value=1,
+        max_value=limit,
+        value=min(event.gifts_per_person, limit),
+        step=1,
+        help=_("gifts_per_person_info"),
+        key=f"gifts_per_person_{event.id}",
+    )
+    if gifts != event.gifts_per_person:
+        WichtelLogic.set_gifts_per_person(event, int(gifts))
+        st.rerun()
+
+
 def show_logout_button(_):
     """Sidebar logout button."""
     st.sidebar.divider()
@@ -1,76 +1,161 @@
 """
 Geschäftslogik für die Wichtel-App
 """
-import random
-from typing import List, Optional
-from models import Event, Assignment, DataManager, User
+from typing import Iterable, List, Optional, Tuple
+from assignment_engine import engine_for
+from config import ASSIGNMENT_MODE, PAIRING_HISTORY_WINDOW
+from models import Event, EventSummary, Assignment, DataManager, User, PageCursor, paginate_summaries
+from pairing_history import group_key, load_history, pairings_avoiding_history
 
 
 class WichtelLogic:
     """Logik für Wichtel-Zuweisungen und Event-Management"""
     
     @staticmethod
-    def assign_wichtel_random(event: Event) -> Event:
+    def assign_wichtel_random(event: Event, seed: Optional[int] = None, mode: str = ASSIGNMENT_MODE) -> Event:
         """
         Weist jedem Teilnehmer zufällig einen anderen Teilnehmer zu
-        Niemand kann sich selbst zugewiesen bekommen
+        Niemand kann sich selbst zugewiesen bekommen (Derangement aus assignment_engine,
+        mit seed reproduzierbar). Bei gifts_per_person > 1 bekommt jeder so viele
+        verschiedene Beschenkte (disjunkte Derangements)
         """
-        participants = event.participant_ids.copy()
-        receivers = participants.copy()
+        engine = WichtelLogic._engine(len(event.participant_ids), seed)
+        if event.gifts_per_person > 1:
+            pairs = engine.multi_pairings(event.participant_ids, event.gifts_per_person)
+        else:
+            pairs = engine.pairings(event.participant_ids, mode)
         
-        # Mische die Empfänger
-        random.shuffle(receivers)
+        # Erstelle Zuweisungen
+        event.assignments = [
+            Assignment(giver_id=giver, receiver_id=receiver)
+            for giver, receiver in pairs
+        ]
+        event.is_started = True
         
-        # Stelle sicher, dass niemand sich selbst bekommt
-        for i, giver in enumerate(participants):
-            if giver == receivers[i]:
-                # Tausche mit dem nächsten
-                next_idx = (i + 1) % len(receivers)
-                receivers[i], receivers[next_idx] = receivers[next_idx], receivers[i]
+        WichtelLogic._persist_event(event)
+        
+        return event
+    
+    @staticmethod
+    def assign_wichtel_constrained(
+        event: Event,
+        excluded_pairs: Iterable[Tuple[str, str]] = (),
+        seed: Optional[int] = None,
+    ) -> Event:
+        """
+        Wie assign_wichtel_random, berücksichtigt aber Ausschlussregeln:
+        event.exclusion_groups (innerhalb einer Gruppe wird nicht beschenkt) und
+        excluded_pairs (gerichtete Paare Schenkender -> Beschenkter)
+        Löst InfeasibleAssignmentError aus, wenn keine gültige Zuweisung existiert
+        """
+        engine = WichtelLogic._engine(len(event.participant_ids), seed)
+        if event.gifts_per_person > 1:
+            pairs = engine.multi_pairings(
+                event.participant_ids, event.gifts_per_person, event.exclusion_groups, excluded_pairs
+            )
+        else:
+            pairs = engine.constrained_pairings(event.participant_ids, event.exclusion_groups, excluded_pairs)
         
-        # Erstelle Zuweisungen
         event.assignments = [
             Assignment(giver_id=giver, receiver_id=receiver)
-            for giver, receiver in zip(participants, receivers)
+            for giver, receiver in pairs
         ]
         event.is_started = True
         
-        # Speichere Event (funktioniert mit JSON und MongoDB)
-        try:
-            # MongoDB hat update_event
-            DataManager.update_event(event)
-        except AttributeError:
-            # JSON-Fallback
-            events = DataManager.load_events()
-            events[event.id] = event
-            DataManager.save_events(events)
+        WichtelLogic._persist_event(event)
         
         return event
     
+    @staticmethod
+    def assign_wichtel_with_history(
+        event: Event,
+        seed: Optional[int] = None,
+        window: int = PAIRING_HISTORY_WINDOW,
+    ) -> Event:
+        """
+        Startet ein Event und vermeidet dabei Paare aus den letzten window Events
+        derselben Gruppe (siehe pairing_history); ist das nicht lösbar, wird der
+        Rückblick verkürzt. Ausschlussgruppen gelten immer
+        """
+        recent_pairs = load_history([group_key(event)], window).recent_pairs(event)
+        if not event.exclusion_groups and not any(recent_pairs):
+            return WichtelLogic.assign_wichtel_random(event, seed)
+        
+        pairs, _ = pairings_avoiding_history(
+            WichtelLogic._engine(len(event.participant_ids), seed),
+            event.participant_ids, event.exclusion_groups, recent_pairs, event.gifts_per_person,
+        )
+        
+        event.assignments = [
+            Assignment(giver_id=giver, receiver_id=receiver)
+            for giver, receiver in pairs
+        ]
+        event.is_started = True
+        
+        WichtelLogic._persist_event(event)
+        
+        return event
+    
+    @staticmethod
+    def _engine(participant_count: int, seed: Optional[int] = None):
+        """Engine passend zur Eventgröße (siehe assignment_engine.engine_for)"""
+        return engine_for(participant_count, seed)
+    
+    @staticmethod
+    def set_exclusion_groups(event: Event, groups: List[List[str]]) -> Event:
+        """Setzt die Ausschlussgruppen eines noch nicht gestarteten Events"""
+        event.exclusion_groups = [list(group) for group in groups if len(group) >= 2]
+        WichtelLogic._persist_event(event)
+        return event
+    
+    @staticmethod
+    def set_gifts_per_person(event: Event, gifts: int) -> Event:
+        """Setzt die Anzahl Beschenkter pro Person eines noch nicht gestarteten Events"""
+        limit = max(1, len(event.participant_ids) - 1)
+        if not 1 <= gifts <= limit:
+            raise ValueError(f"Geschenke pro Person müssen zwischen 1 und {limit} liegen")
+        event.gifts_per_person = gifts
+        WichtelLogic._persist_event(event)
+        return event
+    
     @staticmethod
     def get_assignment_for_user(event: Event, user_id: str) -> Optional[Assignment]:
-        """Findet die Zuweisung für einen bestimmten Benutzer"""
-        for assignment in event.assignments:
-            if assignment.giver_id == user_id:
-                return assignment
-        return None
+        """Findet die (erste) Zuweisung für einen bestimmten Benutzer"""
+        return event.assignment_for(user_id)
+    
+    @staticmethod
+    def get_assignments_for_user(event: Event, user_id: str) -> List[Assignment]:
+        """Alle Zuweisungen eines Benutzers (gifts_per_person Stück)"""
+        return event.assignments_for(user_id)
     
     @staticmethod
     def get_receiver_name(assignment: Assignment) -> str:
         """Gibt den Namen des Empfängers zurück"""
-        users = DataManager.load_users()
+        users = DataManager.get_users_by_ids([assignment.receiver_id])
         receiver = users.get(assignment.receiver_id)
         return receiver.name if receiver else "Unbekannt"
     
+    @staticmethod
+    def get_receiver_names(assignments: List[Assignment]) -> List[str]:
+        """Namen der Empfänger mehrerer Zuweisungen (eine Abfrage)"""
+        users = DataManager.get_users_by_ids([a.receiver_id for a in assignments])
+        return [users[a.receiver_id].name if a.receiver_id in users else "Unbekannt" for a in assignments]
+    
     @staticmethod
     def reveal_assignment(event: Event, user_id: str):
-        """Markiert eine Zuweisung als aufgedeckt"""
-        for assignment in event.assignments:
-            if assignment.giver_id == user_id:
-                assignment.revealed = True
-                break
+        """Markiert alle Zuweisungen eines Benutzers als aufgedeckt"""
+        for assignment in event.assignments_for(user_id):
+            assignment.revealed = True
         
-        # Speichere Event (funktioniert mit JSON und MongoDB)
+        try:
+            # Gezieltes Update nur des revealed-Flags (MongoDB, SQLite, Journal)
+            DataManager.set_assignment_revealed(event.id, user_id)
+        except AttributeError:
+            WichtelLogic._persist_event(event)
+    
+    @staticmethod
+    def _persist_event(event: Event):
+        """Speichert ein Event (funktioniert mit JSON und MongoDB)"""
         try:
             # MongoDB hat update_event
             DataManager.update_event(event)
@@ -83,7 +168,8 @@ class WichtelLogic:
     @staticmethod
     def get_all_assignments_with_names(event: Event) -> List[dict]:
         """Gibt alle Zuweisungen mit Namen zurück"""
-        users = DataManager.load_users()
+        user_ids = [a.giver_id for a in event.assignments] + [a.receiver_id for a in event.assignments]
+        users = DataManager.get_users_by_ids(user_ids)
         result = []
         
         for assignment in event.assignments:
@@ -117,4 +203,22 @@ class WichtelLogic:
                 if WichtelLogic.can_user_access_event(event, user_id):
                     user_events.append(event)
             
-            return sorted(user_events, key=lambda e: e.created_at, reverse=True)
\ No newline at end of file
+            return sorted(user_events, key=lambda e: e.created_at, reverse=True)
+    
+    @staticmethod
+    def get_user_event_summaries(user_id: str) -> List[EventSummary]:
+        """Gibt Zusammenfassungen aller Events eines Benutzers zurück (für Listen)"""
+        try:
+            return DataManager.get_event_summaries(user_id)
+        except AttributeError:
+            return [EventSummary.from_event(event) for event in WichtelLogic.get_user_events(user_id)]
+    
+    @staticmethod
+    def get_user_event_summaries_page(
+        user_id: str, limit: int, cursor: Optional[PageCursor] = None
+    ) -> Tuple[List[EventSummary], Optional[PageCursor]]:
+        """Gibt eine Seite der Event-Zusammenfassungen und den Cursor für die nächste Seite zurück"""
+        try:
+            return DataManager.get_event_summaries_page(user_id, limit, cursor)
+        except AttributeError:
+            return paginate_summaries(WichtelLogic.get_user_event_summaries(user_id), limit, cursor)